@@ -1,311 +1,946 @@
 """
 COMPLETE Seed Data Generator - All 15 Tables with ~86 Records
 Extends the basic generator with shifts, bookings, timesheets, invoices, etc.
+
+Usage:
+    python complete_seed_generator.py              # 15 shifts, 10 bookings, 8 timesheets, ...
+    python complete_seed_generator.py --scale 250  # 3750 shifts, 2500 bookings, 2000 timesheets, ...
+    python complete_seed_generator.py --output supabase/seed_data.sql.gz
+    python complete_seed_generator.py --batch-size 500 # multi-row INSERTs
+    python complete_seed_generator.py --format copy   # must match the format the first stage used
+    python complete_seed_generator.py --scale 100000 --workers 32
+    python complete_seed_generator.py --scale 5000 --backend numpy  # whole-column draws (needs numpy)
+    python complete_seed_generator.py --scale 250 --seed 42  # --seed/--as-of default to the first stage's
+    python complete_seed_generator.py --scale 5000 --workload production --horizon 90:30
+    python complete_seed_generator.py --scale 5000 --progress --instrument --profile prof/  # where the time goes
+
+With --scale N the records are generated in N units. Each unit draws its
+agencies, staff and clients from the manifest (2 agencies, 10 staff and
+6 clients per unit, wrapping round if the first stage was run at a smaller
+scale) and only keeps its own shift/booking/timesheet IDs, so memory stays
+flat however many units are written. The default binary manifest is
+memory-mapped (seedgen.manifest), so start-up doesn't depend on how many
+IDs the first stage wrote either. Every table is a generator function
+yielding one row at a time into the chosen output format. In copy format
+the units' rows are spooled to temporary files and written as one COPY
+block per table at the end. The units are split into contiguous shards of
+--shard-units units; with --workers N the shards are generated in parallel
+processes, each into its own file, and appended to the output in order once
+all have finished. Every row is seeded from its table and global index
+(seedgen.rng), so a seeded run gives the same bytes with any --workers.
+
+--workload picks how shifts, bookings and timesheets spread over clients,
+staff and time (seedgen.workload): 'uniform' (the default) cycles through
+each unit's own clients and staff; 'production' Zipf-ranks the clients and
+staff of each shard, with day/night patterns, weekend peaks and urgent
+marketplace bursts, so benchmark queries see production-like selectivity.
+--horizon BACK:AHEAD sets the days shift dates span (default 14:7).
+
+Timesheets are clocked in and out around the client sites the first stage
+placed (its --geography is read back from the manifest): the GPS and
+geofence columns are filled in by seedgen.geo.locate_timesheets (on --backend
+numpy, seedgen.vectorized.locate_timesheets).
+
+generate_seed_data.py runs both stages in one pass (and can regenerate
+single tables with --only); this script remains for the two-step workflow.
 """
 
-import json
-from datetime import datetime, timedelta
-from uuid import uuid4
+import argparse
 import random
+import sys
+from datetime import datetime, timedelta
+from itertools import chain
+
+from seedgen import geo, instrument, rng, schema, vectorized
+
+from seedgen.common import (
+    UuidArray, dumps, gen_date_ago, gen_date_future, gen_ts_ago, gen_ts_future, gen_uuid,
+)
+from seedgen.encoders import Block, Json, Repeat, Same, constant
+from seedgen.formats import FORMATS, default_output, open_output
+from seedgen.manifest import open_manifest
+from seedgen.parallel import DEFAULT_SHARD_UNITS, merge_shards, run_shards, shard_path, unit_shards
+from seedgen.rng import now, seed_entity
+from seedgen.tables import COLUMNS, expected_rows
+from seedgen.vectorized import BACKENDS, BLOCK_UNITS, Columns, json_arrays, json_objects, rounded, unit_picks
+from seedgen.workload import (
+    BOOKING_STATUSES, DEFAULT_HORIZON, SHIFT_DRAWS, WORKLOADS, Workload, format_horizon, parse_horizon,
+    timesheet_status,
+)
+from seedgen.writer import COMPRESSIONS
+
+DEFAULT_MANIFEST = 'SEED_DATA_MANIFEST.ids'
+
+shift_statuses = ['open', 'assigned', 'confirmed', 'completed', 'completed', 'completed', 'in_progress', 'open', 'assigned', 'confirmed', 'completed', 'completed', 'cancelled', 'open', 'assigned']
+shift_roles = ['nurse', 'healthcare_assistant', 'senior_care_worker', 'nurse', 'healthcare_assistant']
+doc_types = ['dbs_check', 'right_to_work', 'professional_registration', 'training_certificate', 'vaccination_record', 'reference']
+workflow_types = ['unfilled_urgent_shift', 'expired_compliance_document', 'timesheet_discrepancy']
+change_types = ['shift_cancelled', 'shift_reassigned', 'bank_details_changed', 'pay_rate_override', 'staff_suspended']
+services = ['Twilio SMS', 'Resend Email', 'Supabase Hosting']
+categories = ['communication', 'communication', 'platform_hosting']
 
-# Load existing IDs
-with open('SEED_DATA_MANIFEST.json', 'r') as f:
-    ids = json.load(f)
+# jsonb values every row shares, serialized once (seedgen.encoders.constant)
+SHIFT_REQUIREMENTS = constant(['Medication trained', 'DBS checked'])
+PAYSLIP_BANK_DETAILS = constant({'account_name': 'Staff Member', 'sort_code': '20-00-00', 'account_number': '12345678'})
+AMENDMENT_CHANGES = constant([{'field': 'hours', 'old': '50', 'new': '47.5'}])
 
-print(f"Loaded IDs: {len(ids['agencies'])} agencies, {len(ids['staff'])} staff, {len(ids['clients'])} clients")
+# Tables whose IDs are handed on to later tables / the manifest
+UNIT_ID_TABLES = ['shifts', 'bookings', 'timesheets', 'invoices', 'payslips', 'compliance', 'groups', 'admin_workflows']
+# The first stage's IDs each scale unit takes from the manifest
+UNIT_SOURCES = [('agencies', 2), ('staff', 10), ('clients', 6)]
 
-def gen_uuid(): return str(uuid4())
-def gen_ts_ago(days): return (datetime.now() - timedelta(days=random.randint(0, days), hours=random.randint(0, 23))).isoformat()
-def gen_ts_future(days): return (datetime.now() + timedelta(days=random.randint(1, days))).isoformat()
-def gen_date_ago(days): return (datetime.now() - timedelta(days=random.randint(0, days))).strftime('%Y-%m-%d')
-def gen_date_future(days): return (datetime.now() + timedelta(days=random.randint(1, days))).strftime('%Y-%m-%d')
 
-def sql_val(v):
-    if v is None: return 'NULL'
-    if isinstance(v, bool): return 'true' if v else 'false'
-    if isinstance(v, (dict, list)): return f"'{json.dumps(v)}'::jsonb"
-    if isinstance(v, str): return f"'{v.replace(chr(39), chr(39)+chr(39))}'"
-    return str(v)
+def payslip_deductions(tax, ni):
+    """A payslip's deductions jsonb, {tax, national_insurance, pension, other}; total_deductions is their sum."""
+    return {'tax': tax, 'national_insurance': ni, 'pension': 0, 'other': 0}
 
-sql = []
-sql.append("\n-- ============================================================================")
-sql.append("-- ADDITIONAL SEED DATA: Shifts, Bookings, Timesheets, Invoices, etc.")
-sql.append("-- ============================================================================\n")
 
-# 5. SHIFTS (15 shifts with various statuses)
-sql.append("-- 5. SHIFTS (15 records)")
-shift_statuses = ['open', 'assigned', 'confirmed', 'completed', 'completed', 'completed', 'in_progress', 'open', 'assigned', 'confirmed', 'completed', 'completed', 'cancelled', 'open', 'assigned']
-shift_roles = ['nurse', 'healthcare_assistant', 'senior_care_worker', 'nurse', 'healthcare_assistant']
+def unit_ids(ids, table, per_unit, unit, units=1):
+    """IDs from the manifest belonging to `units` scale units from `unit`, end to end (wraps round if the
+    manifest is smaller).
 
-for i in range(15):
-    shift_id = gen_uuid()
-    ids['shifts'].append(shift_id)
-    agency_id = ids['agencies'][i % 2]
-    client_id = ids['clients'][i % len(ids['clients'])]
-    staff_id = ids['staff'][i % len(ids['staff'])] if shift_statuses[i] in ['assigned', 'confirmed', 'completed', 'in_progress'] else None
-    status = shift_statuses[i]
-    role = shift_roles[i % len(shift_roles)]
-    days_offset = random.randint(-14, 7)
-    shift_date = (datetime.now() + timedelta(days=days_offset)).strftime('%Y-%m-%d')
-    start_time = (datetime.now() + timedelta(days=days_offset, hours=8)).isoformat()
-    end_time = (datetime.now() + timedelta(days=days_offset, hours=20)).isoformat()
-    
+    `unit` counts from the start of `ids`, which for a shard's own IDs is the shard's first unit.
+    """
+    pool = ids[table]
+    first, last = unit * per_unit, (unit + units) * per_unit
+    if last <= len(pool):
+        return pool[first:last]
+    return [pool[j % len(pool)] for j in range(first, last)]
+
+
+def new_units(ids, start, stop, first_unit=0, horizon=DEFAULT_HORIZON, region=None):
+    """Working state for scale units [start, stop): each one's upstream IDs plus the downstream IDs it creates.
+
+    `first_unit` is the unit that `ids` starts at (0 for the whole manifest).
+    With a `region` (seedgen.workload, production profile) shifts are planned
+    over the whole shard; the plans are kept for the unit's bookings and
+    timesheets.
+    """
+    pools = {table: unit_ids(ids, table, per_unit, start - first_unit, stop - start) for table, per_unit in UNIT_SOURCES}
+    units = []
+    for k, index in enumerate(range(start, stop)):
+        u = {'index': index, 'horizon': horizon, 'region': region, 'shift_plans': []}
+        for table, per_unit in UNIT_SOURCES:
+            u[table] = pools[table][k * per_unit:(k + 1) * per_unit]
+        for table in UNIT_ID_TABLES:
+            u[table] = []
+        units.append(u)
+    return units
+
+
+def shard_region(ids, start, stop, first_unit, workload):
+    """The workload's Region over the agencies, staff and clients of units [start, stop), or None."""
+    if not workload.skewed:
+        return None
+    pools = {table: unit_ids(ids, table, per_unit, start - first_unit, stop - start) for table, per_unit in UNIT_SOURCES}
+    return workload.region(pools['agencies'], pools['staff'], pools['clients'])
+
+
+# 5. SHIFTS (15 shifts with various statuses)
+def gen_shifts(u):
+    if u['region'] is not None:
+        yield from gen_planned_shifts(u)
+        return
+    for i in range(15):
+        seed_entity('shifts', u['index'] * 15 + i)
+        shift_id = gen_uuid()
+        u['shifts'].append(shift_id)
+        agency_id = u['agencies'][i % 2]
+        client_id = u['clients'][i % len(u['clients'])]
+        staff_id = u['staff'][i % len(u['staff'])] if shift_statuses[i] in ['assigned', 'confirmed', 'completed', 'in_progress'] else None
+        status = shift_statuses[i]
+        role = shift_roles[i % len(shift_roles)]
+        days_offset = random.randint(-u['horizon'][0], u['horizon'][1])
+        shift_date = (now() + timedelta(days=days_offset)).strftime('%Y-%m-%d')
+        start_time = (now() + timedelta(days=days_offset, hours=8)).isoformat()
+        end_time = (now() + timedelta(days=days_offset, hours=20)).isoformat()
+
+        journey_log = [
+            {'status': 'open', 'timestamp': gen_ts_ago(20), 'user': 'system'},
+            {'status': status, 'timestamp': gen_ts_ago(10), 'user': 'admin'}
+        ] if status != 'open' else []
+
+        yield (shift_id, agency_id, client_id, staff_id,
+               shift_date, start_time, end_time, 12,
+               role, random.randint(15, 22), random.randint(22, 32), 30, status,
+               'urgent' if i % 5 == 0 else 'normal', f'Shift for {role}', 'admin@agency.com',
+               f'Room {random.randint(1, 20)}', journey_log,
+               status == 'completed', False, SHIFT_REQUIREMENTS,
+               None, status == 'completed', False, status != 'open',
+               gen_ts_ago(30), gen_ts_ago(1))
+
+
+def planned_shift(shift_id, plan, role, start_time, end_time, room, logged, changed, created, updated):
+    """A shifts row from a seedgen.workload plan; its date is the day it starts."""
+    status = plan.status
     journey_log = [
-        {'status': 'open', 'timestamp': gen_ts_ago(20), 'user': 'system'},
-        {'status': status, 'timestamp': gen_ts_ago(10), 'user': 'admin'}
+        {'status': 'open', 'timestamp': logged, 'user': 'system'},
+        {'status': status, 'timestamp': changed, 'user': 'admin'}
     ] if status != 'open' else []
-    
-    sql.append(f"""INSERT INTO shifts (id, agency_id, client_id, assigned_staff_id, date, start_time, end_time, duration_hours, 
-role_required, pay_rate, charge_rate, break_duration_minutes, status, urgency, notes, created_by, 
-work_location_within_site, shift_journey_log, financial_locked, recurring, requirements, 
-booking_id, timesheet_received, marketplace_visible, admin_closure_required, created_date, updated_date)
-VALUES ({sql_val(shift_id)}, {sql_val(agency_id)}, {sql_val(client_id)}, {sql_val(staff_id)}, 
-{sql_val(shift_date)}, {sql_val(start_time)}, {sql_val(end_time)}, 12,
-{sql_val(role)}, {random.randint(15, 22)}, {random.randint(22, 32)}, 30, {sql_val(status)}, 
-{sql_val('urgent' if i % 5 == 0 else 'normal')}, 'Shift for {role}', 'admin@agency.com',
-{sql_val(f'Room {random.randint(1, 20)}')}, {sql_val(journey_log)}, 
-{sql_val(status == 'completed')}, false, {sql_val(['Medication trained', 'DBS checked'])},
-NULL, {sql_val(status == 'completed')}, false, {sql_val(status != 'open')},
-{sql_val(gen_ts_ago(30))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
+    return (shift_id, plan.agency_id, plan.client_id, plan.staff_id,
+            start_time[:10], start_time, end_time, plan.hours,
+            role, plan.pay_rate, plan.charge_rate, 30, status,
+            plan.urgency, f'{plan.pattern.title()} shift for {role}', 'admin@agency.com',
+            f'Room {room}', journey_log,
+            status == 'completed', False, SHIFT_REQUIREMENTS,
+            None, status == 'completed', plan.marketplace, status != 'open',
+            created, updated)
+
+
+def gen_planned_shifts(u):
+    """gen_shifts for the production workload: client, staff, times and status come from the shard's region."""
+    for i in range(15):
+        seed_entity('shifts', u['index'] * 15 + i)
+        shift_id = gen_uuid()
+        u['shifts'].append(shift_id)
+        plan = u['region'].plan([random.random() for _ in range(SHIFT_DRAWS)])
+        plan = plan._replace(pay_rate=random.randint(15, 22), charge_rate=random.randint(22, 32))
+        u['shift_plans'].append(plan)
+        start = now() + timedelta(days=plan.day, hours=plan.start_hour)
+        yield planned_shift(shift_id, plan, shift_roles[i % len(shift_roles)], start.isoformat(), (start + timedelta(hours=plan.hours)).isoformat(), random.randint(1, 20),
+                            gen_ts_ago(20), gen_ts_ago(10), (now() + timedelta(hours=plan.created_hours)).isoformat(),
+                            gen_ts_ago(1))
+
 
 # 6. BOOKINGS (10 bookings)
-sql.append("-- 6. BOOKINGS (10 records)")
-for i in range(10):
-    if i >= len(ids['shifts']): break
-    booking_id = gen_uuid()
-    ids['bookings'].append(booking_id)
-    shift_id = ids['shifts'][i]
-    staff_id = ids['staff'][i % len(ids['staff'])]
-    client_id = ids['clients'][i % len(ids['clients'])]
-    agency_id = ids['agencies'][i % 2]
-    
-    sql.append(f"""INSERT INTO bookings (id, agency_id, shift_id, staff_id, client_id, status, booking_date, 
-shift_date, confirmation_method, confirmed_by_staff_at, notes, created_date, updated_date)
-VALUES ({sql_val(booking_id)}, {sql_val(agency_id)}, {sql_val(shift_id)}, {sql_val(staff_id)}, {sql_val(client_id)},
-'confirmed', {sql_val(gen_ts_ago(10))}, {sql_val(gen_date_ago(10))}, 'phone', {sql_val(gen_ts_ago(9))},
-'Booking confirmed by staff', {sql_val(gen_ts_ago(15))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
+def gen_bookings(u):
+    if u['region'] is not None:
+        yield from gen_planned_bookings(u)
+        return
+    for i in range(10):
+        if i >= len(u['shifts']): break
+        seed_entity('bookings', u['index'] * 10 + i)
+        booking_id = gen_uuid()
+        u['bookings'].append(booking_id)
+        shift_id = u['shifts'][i]
+        staff_id = u['staff'][i % len(u['staff'])]
+        client_id = u['clients'][i % len(u['clients'])]
+        agency_id = u['agencies'][i % 2]
+
+        yield (booking_id, agency_id, shift_id, staff_id, client_id,
+               'confirmed', gen_ts_ago(10), gen_date_ago(10), 'phone', gen_ts_ago(9),
+               'Booking confirmed by staff', gen_ts_ago(15), gen_ts_ago(1))
+
+
+def gen_planned_bookings(u):
+    """gen_bookings for the production workload: each booking follows its shift."""
+    for i in range(min(10, len(u['shifts']))):
+        seed_entity('bookings', u['index'] * 10 + i)
+        booking_id = gen_uuid()
+        u['bookings'].append(booking_id)
+        plan = u['shift_plans'][i]
+        staff_id = u['region'].staff_for(plan, random.random())
+        u['shift_plans'][i] = plan._replace(staff_id=staff_id)  # an open shift's booking names who it's offered to
+        start = now() + timedelta(days=plan.day, hours=plan.start_hour)
+
+        yield (booking_id, plan.agency_id, u['shifts'][i], staff_id, plan.client_id,
+               BOOKING_STATUSES.get(plan.status, 'confirmed'), gen_ts_ago(10), start.strftime('%Y-%m-%d'), 'phone',
+               gen_ts_ago(9), 'Booking confirmed by staff', gen_ts_ago(15), gen_ts_ago(1))
+
 
 # 7. TIMESHEETS (8 timesheets)
-sql.append("-- 7. TIMESHEETS (8 records)")
-for i in range(8):
-    if i >= len(ids['bookings']): break
-    timesheet_id = gen_uuid()
-    ids['timesheets'].append(timesheet_id)
-    booking_id = ids['bookings'][i]
-    staff_id = ids['staff'][i % len(ids['staff'])]
-    client_id = ids['clients'][i % len(ids['clients'])]
-    agency_id = ids['agencies'][i % 2]
-    
-    sql.append(f"""INSERT INTO timesheets (id, agency_id, booking_id, staff_id, client_id, shift_date, 
-work_location_within_site, clock_in_time, clock_out_time, total_hours, break_duration_minutes, status,
-pay_rate, charge_rate, staff_pay_amount, client_charge_amount, geofence_validated, location_verified,
-staff_signature, created_date, updated_date)
-VALUES ({sql_val(timesheet_id)}, {sql_val(agency_id)}, {sql_val(booking_id)}, {sql_val(staff_id)}, {sql_val(client_id)},
-{sql_val(gen_date_ago(7))}, {sql_val(f'Room {random.randint(1, 10)}')}, {sql_val(gen_ts_ago(7))}, {sql_val(gen_ts_ago(7))},
-{random.uniform(10, 12):.1f}, 30, 'approved', {random.randint(15, 22)}, {random.randint(22, 32)}, 
-{random.uniform(150, 250):.2f}, {random.uniform(250, 350):.2f}, true, true,
-'SignatureDataBase64...', {sql_val(gen_ts_ago(10))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
+def gen_timesheets(u):
+    if u['region'] is not None:
+        yield from gen_planned_timesheets(u)
+        return
+    for i in range(8):
+        if i >= len(u['bookings']): break
+        seed_entity('timesheets', u['index'] * 8 + i)
+        timesheet_id = gen_uuid()
+        u['timesheets'].append(timesheet_id)
+        booking_id = u['bookings'][i]
+        staff_id = u['staff'][i % len(u['staff'])]
+        client_id = u['clients'][i % len(u['clients'])]
+        agency_id = u['agencies'][i % 2]
+
+        yield (timesheet_id, agency_id, booking_id, staff_id, client_id,
+               gen_date_ago(7), f'Room {random.randint(1, 10)}', gen_ts_ago(7), gen_ts_ago(7),
+               round(random.uniform(10, 12), 1), 30, 'approved', random.randint(15, 22), random.randint(22, 32),
+               round(random.uniform(150, 250), 2), round(random.uniform(250, 350), 2), True, True,
+               'SignatureDataBase64...', gen_ts_ago(10), gen_ts_ago(1))
+
+
+def planned_timesheet(timesheet_id, plan, booking_id, shift_date, room, late_minutes, over_minutes, clock_in, clock_out,
+                      created, updated):
+    """A timesheets row for a planned shift, clocked in `late_minutes` late and out `over_minutes` over."""
+    hours = round(plan.hours + (over_minutes - late_minutes) / 60 - 0.5, 1)  # less the 30 minute break
+    status = timesheet_status(plan)
+    return (timesheet_id, plan.agency_id, booking_id, plan.staff_id, plan.client_id,
+            shift_date, f'Room {room}', clock_in, clock_out,
+            hours, 30, status, plan.pay_rate, plan.charge_rate,
+            round(hours * plan.pay_rate, 2), round(hours * plan.charge_rate, 2), status != 'draft', status != 'draft',
+            'SignatureDataBase64...', created, updated)
+
+
+def gen_planned_timesheets(u):
+    """gen_timesheets for the production workload: clocked against the booked shift's times and rates."""
+    for i in range(min(8, len(u['bookings']))):
+        seed_entity('timesheets', u['index'] * 8 + i)
+        timesheet_id = gen_uuid()
+        u['timesheets'].append(timesheet_id)
+        plan = u['shift_plans'][i]
+        start = now() + timedelta(days=plan.day, hours=plan.start_hour)
+        late, over = random.randint(-10, 15), random.randint(-5, 30)
+        clock_in = (start + timedelta(minutes=late)).isoformat()
+        clock_out = (start + timedelta(hours=plan.hours, minutes=over)).isoformat()
+        yield planned_timesheet(timesheet_id, plan, u['bookings'][i], start.strftime('%Y-%m-%d'), random.randint(1, 10),
+                                late, over, clock_in, clock_out, gen_ts_ago(10), gen_ts_ago(1))
+
 
 # 8. INVOICES (3 invoices)
-sql.append("-- 8. INVOICES (3 records)")
-for i in range(3):
-    invoice_id = gen_uuid()
-    ids['invoices'].append(invoice_id)
-    client_id = ids['clients'][i % len(ids['clients'])]
-    agency_id = ids['agencies'][i % 2]
-    subtotal = random.uniform(800, 2500)
-    vat = subtotal * 0.2
-    total = subtotal + vat
-    
-    sql.append(f"""INSERT INTO invoices (id, agency_id, client_id, invoice_number, invoice_date, due_date, 
-period_start, period_end, subtotal, vat_rate, vat_amount, total, balance_due, status, created_by,
-line_items, notes, reminder_sent_count, created_date, updated_date)
-VALUES ({sql_val(invoice_id)}, {sql_val(agency_id)}, {sql_val(client_id)}, {sql_val(f'INV-{datetime.now().year}-{1000+i}')},
-{sql_val(gen_date_ago(10))}, {sql_val(gen_date_future(20))}, {sql_val(gen_date_ago(20))}, {sql_val(gen_date_ago(5))},
-{subtotal:.2f}, 0.20, {vat:.2f}, {total:.2f}, {total:.2f}, 'sent', 'admin@agency.com',
-{sql_val([{'description': 'Healthcare services', 'quantity': random.randint(5, 15), 'rate': random.uniform(18, 30), 'amount': random.uniform(200, 500)}])},
-'Monthly invoice for healthcare services', 0, {sql_val(gen_ts_ago(15))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
+def gen_invoices(u):
+    for i in range(3):
+        seed_entity('invoices', u['index'] * 3 + i)
+        invoice_id = gen_uuid()
+        invoice_number = 1000 + u['index'] * 3 + i
+        u['invoices'].append(invoice_id)
+        client_id = u['clients'][i % len(u['clients'])]
+        agency_id = u['agencies'][i % 2]
+        subtotal = random.uniform(800, 2500)
+        vat = subtotal * 0.2
+        total = subtotal + vat
+
+        yield (invoice_id, agency_id, client_id, f'INV-{now().year}-{invoice_number}',
+               gen_date_ago(10), gen_date_future(20), gen_date_ago(20), gen_date_ago(5),
+               round(subtotal, 2), 0.20, round(vat, 2), round(total, 2), round(total, 2), 'sent', 'admin@agency.com',
+               [{'description': 'Healthcare services', 'quantity': random.randint(5, 15), 'rate': random.uniform(18, 30), 'amount': random.uniform(200, 500)}],
+               'Monthly invoice for healthcare services', 0, gen_ts_ago(15), gen_ts_ago(1))
+
 
 # 9. PAYSLIPS (2 payslips)
-sql.append("-- 9. PAYSLIPS (2 records)")
-for i in range(2):
-    payslip_id = gen_uuid()
-    ids['payslips'].append(payslip_id)
-    staff_id = ids['staff'][i]
-    agency_id = ids['agencies'][i % 2]
-    gross = random.uniform(800, 1500)
-    tax = gross * 0.2
-    ni = gross * 0.12
-    deductions = tax + ni
-    net = gross - deductions
-    
-    sql.append(f"""INSERT INTO payslips (id, agency_id, staff_id, payslip_number, period_start, period_end, payment_date,
-gross_pay, tax, ni, deductions, net_pay, total_hours, status, created_by, pdf_url, bank_details, 
-timesheets, created_date, updated_date)
-VALUES ({sql_val(payslip_id)}, {sql_val(agency_id)}, {sql_val(staff_id)}, {sql_val(f'PAY-{datetime.now().year}-{5000+i}')},
-{sql_val(gen_date_ago(30))}, {sql_val(gen_date_ago(7))}, {sql_val(gen_date_ago(3))},
-{gross:.2f}, {tax:.2f}, {ni:.2f}, {deductions:.2f}, {net:.2f}, {random.uniform(60, 100):.1f}, 'paid', 'admin@agency.com',
-'https://example.com/payslips/{payslip_id}.pdf', {sql_val({'account_name': 'Staff Member', 'sort_code': '20-00-00', 'account_number': '12345678'})},
-{sql_val([ids['timesheets'][0] if ids['timesheets'] else None])}, {sql_val(gen_ts_ago(15))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
+def gen_payslips(u):
+    for i in range(2):
+        seed_entity('payslips', u['index'] * 2 + i)
+        payslip_id = gen_uuid()
+        payslip_number = 5000 + u['index'] * 2 + i
+        u['payslips'].append(payslip_id)
+        staff_id = u['staff'][i]
+        agency_id = u['agencies'][i % 2]
+        gross = random.uniform(800, 1500)
+        tax = gross * 0.2
+        ni = gross * 0.12
+        deductions = tax + ni
+        net = gross - deductions
+
+        yield (payslip_id, agency_id, staff_id, f'PAY-{now().year}-{payslip_number}',
+               gen_date_ago(30), gen_date_ago(7), gen_date_ago(3),
+               round(gross, 2), payslip_deductions(round(tax, 2), round(ni, 2)), round(deductions, 2), round(net, 2), 'paid', 'admin@agency.com',
+               f'https://example.com/payslips/{payslip_id}.pdf', PAYSLIP_BANK_DETAILS,
+               [u['timesheets'][0] if u['timesheets'] else None], gen_ts_ago(15), gen_ts_ago(1))
+
 
 # 10. COMPLIANCE (12 compliance documents)
-sql.append("-- 10. COMPLIANCE (12 records)")
-doc_types = ['dbs_check', 'right_to_work', 'professional_registration', 'training_certificate', 'vaccination_record', 'reference']
-for i in range(12):
-    comp_id = gen_uuid()
-    ids['compliance'].append(comp_id)
-    staff_id = ids['staff'][i % len(ids['staff'])]
-    agency_id = ids['agencies'][i % 2]
-    doc_type = doc_types[i % len(doc_types)]
-    
-    sql.append(f"""INSERT INTO compliance (id, staff_id, agency_id, document_type, document_name, document_url, 
-issue_date, expiry_date, status, created_by, issuing_authority, reference_number, 
-reminder_30d_sent, reminder_14d_sent, created_date, updated_date)
-VALUES ({sql_val(comp_id)}, {sql_val(staff_id)}, {sql_val(agency_id)}, {sql_val(doc_type)}, 
-'{doc_type.replace("_", " ").title()} - Staff {i+1}', 'https://example.com/docs/{comp_id}.pdf',
-{sql_val(gen_date_ago(365))}, {sql_val(gen_date_future(random.choice([30, 90, 365])))}, 'verified', 'admin@agency.com',
-'Issuing Authority {i+1}', 'REF-{random.randint(100000, 999999)}', false, false,
-{sql_val(gen_ts_ago(365))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
+def gen_compliance(u):
+    for i in range(12):
+        seed_entity('compliance', u['index'] * 12 + i)
+        comp_id = gen_uuid()
+        u['compliance'].append(comp_id)
+        staff_id = u['staff'][i % len(u['staff'])]
+        agency_id = u['agencies'][i % 2]
+        doc_type = doc_types[i % len(doc_types)]
+
+        yield (comp_id, staff_id, agency_id, doc_type,
+               f'{doc_type.replace("_", " ").title()} - Staff {i+1}', f'https://example.com/docs/{comp_id}.pdf',
+               gen_date_ago(365), gen_date_future(random.choice([30, 90, 365])), 'verified', 'admin@agency.com',
+               f'Issuing Authority {i+1}', f'REF-{random.randint(100000, 999999)}', False, False,
+               gen_ts_ago(365), gen_ts_ago(1))
+
 
 # 11. GROUPS (2 groups)
-sql.append("-- 11. GROUPS (2 records)")
-for i in range(2):
-    group_id = gen_uuid()
-    ids['groups'].append(group_id)
-    agency_id = ids['agencies'][i]
-    staff_members = [ids['staff'][j] for j in range(i*5, min((i+1)*5, len(ids['staff'])))]
-    
-    sql.append(f"""INSERT INTO groups (id, agency_id, name, description, staff_members, created_date, updated_date)
-VALUES ({sql_val(group_id)}, {sql_val(agency_id)}, 'Team {chr(65+i)}', 'Primary healthcare team {chr(65+i)}',
-ARRAY[{', '.join([sql_val(s) for s in staff_members])}]::uuid[], {sql_val(gen_ts_ago(60))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
+def gen_groups(u):
+    for i in range(2):
+        seed_entity('groups', u['index'] * 2 + i)
+        group_id = gen_uuid()
+        team_suffix = f" {u['index'] + 1}" if u['index'] else ''
+        u['groups'].append(group_id)
+        agency_id = u['agencies'][i]
+        staff_members = [u['staff'][j] for j in range(i*5, min((i+1)*5, len(u['staff'])))]
+
+        yield (group_id, agency_id, f'Team {chr(65+i)}{team_suffix}', f'Primary healthcare team {chr(65+i)}{team_suffix}',
+               UuidArray(staff_members), gen_ts_ago(60), gen_ts_ago(1))
+
 
 # 12. ADMIN_WORKFLOWS (3 workflows)
-sql.append("-- 12. ADMIN_WORKFLOWS (3 records)")
-workflow_types = ['unfilled_urgent_shift', 'expired_compliance_document', 'timesheet_discrepancy']
-for i in range(3):
-    workflow_id = gen_uuid()
-    ids['admin_workflows'].append(workflow_id)
-    agency_id = ids['agencies'][i % 2]
-    
-    sql.append(f"""INSERT INTO admin_workflows (id, agency_id, type, priority, title, status, created_by,
-related_entity, deadline, auto_created, escalation_count, created_date, updated_date)
-VALUES ({sql_val(workflow_id)}, {sql_val(agency_id)}, {sql_val(workflow_types[i])}, 
-{sql_val(['high', 'medium', 'critical'][i])}, 'Workflow: {workflow_types[i].replace("_", " ").title()}', 
-'pending', 'system', {sql_val({'entity_type': 'shift', 'entity_id': ids['shifts'][0] if ids['shifts'] else None})},
-{sql_val(gen_ts_future(7))}, true, 0, {sql_val(gen_ts_ago(5))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
+def gen_admin_workflows(u):
+    for i in range(3):
+        seed_entity('admin_workflows', u['index'] * 3 + i)
+        workflow_id = gen_uuid()
+        u['admin_workflows'].append(workflow_id)
+        agency_id = u['agencies'][i % 2]
+
+        yield (workflow_id, agency_id, workflow_types[i],
+               ['high', 'medium', 'critical'][i], f'Workflow: {workflow_types[i].replace("_", " ").title()}',
+               'pending', 'system', {'entity_type': 'shift', 'entity_id': u['shifts'][0] if u['shifts'] else None},
+               gen_ts_future(7), True, 0, gen_ts_ago(5), gen_ts_ago(1))
+
 
 # 13. CHANGE_LOGS (5 change logs)
-sql.append("-- 13. CHANGE_LOGS (5 records)")
-change_types = ['shift_cancelled', 'shift_reassigned', 'bank_details_changed', 'pay_rate_override', 'staff_suspended']
-for i in range(5):
-    log_id = gen_uuid()
-    agency_id = ids['agencies'][i % 2]
-    
-    sql.append(f"""INSERT INTO change_logs (id, agency_id, change_type, affected_entity_type, affected_entity_id,
-old_value, new_value, reason, changed_by_email, changed_at, risk_level, reviewed, created_date, updated_date)
-VALUES ({sql_val(log_id)}, {sql_val(agency_id)}, {sql_val(change_types[i])}, 'shift', 
-{sql_val(ids['shifts'][0] if ids['shifts'] else gen_uuid())}, 'Old Value', 'New Value',
-'Administrative change', 'admin@agency.com', {sql_val(gen_ts_ago(3))}, 'low', false,
-{sql_val(gen_ts_ago(3))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
+def gen_change_logs(u):
+    for i in range(5):
+        seed_entity('change_logs', u['index'] * 5 + i)
+        log_id = gen_uuid()
+        agency_id = u['agencies'][i % 2]
 
-# 14. OPERATIONAL_COSTS (3 costs)
-sql.append("-- 14. OPERATIONAL_COSTS (3 records)")
-services = ['Twilio SMS', 'Resend Email', 'Supabase Hosting']
-categories = ['communication', 'communication', 'platform_hosting']
-for i in range(3):
-    cost_id = gen_uuid()
-    agency_id = ids['agencies'][i % 2]
-    
-    sql.append(f"""INSERT INTO operational_costs (id, agency_id, cost_type, service_name, service_category,
-amount, cost_date, currency, status, created_by, billing_period, roi_impact, created_date, updated_date)
-VALUES ({sql_val(cost_id)}, {sql_val(agency_id)}, 'monthly_subscription', {sql_val(services[i])}, 
-{sql_val(categories[i])}, {random.uniform(20, 150):.2f}, {sql_val(gen_date_ago(5))}, 'GBP', 'paid',
-'admin@agency.com', {sql_val(gen_date_ago(30))}, {sql_val(random.choice(['high', 'medium', 'critical']))},
-{sql_val(gen_ts_ago(30))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
+        yield (log_id, agency_id, change_types[i], 'shift',
+               u['shifts'][0] if u['shifts'] else gen_uuid(), 'Old Value', 'New Value',
+               'Administrative change', 'admin@agency.com', gen_ts_ago(3), 'low', False,
+               gen_ts_ago(3), gen_ts_ago(1))
 
-# 15. INVOICE_AMENDMENTS (1 amendment)
-sql.append("-- 15. INVOICE_AMENDMENTS (1 record)")
-if ids['invoices']:
-    amend_id = gen_uuid()
-    invoice_id = ids['invoices'][0]
-    agency_id = ids['agencies'][0]
-    
-    sql.append(f"""INSERT INTO invoice_amendments (id, agency_id, invoice_id, amendment_type, amendment_reason,
-original_invoice_id, amendment_version, original_total, amended_total, total_difference, status, created_by,
-changes_made, risk_level, created_date, updated_date)
-VALUES ({sql_val(amend_id)}, {sql_val(agency_id)}, {sql_val(invoice_id)}, 'hours_adjustment',
-'Client requested adjustment for actual hours worked', {sql_val(invoice_id)}, 1, 1000.00, 950.00, -50.00,
-'approved', 'admin@agency.com', {sql_val([{'field': 'hours', 'old': '50', 'new': '47.5'}])}, 'low',
-{sql_val(gen_ts_ago(5))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
 
-# 16. NOTIFICATION_QUEUE (2 notifications)
-sql.append("-- 16. NOTIFICATION_QUEUE (2 records)")
-for i in range(2):
-    notif_id = gen_uuid()
-    agency_id = ids['agencies'][i % 2]
-    
-    sql.append(f"""INSERT INTO notification_queue (id, agency_id, notification_type, recipient_type, recipient_email,
-recipient_first_name, status, created_by, pending_items, item_count, created_date, updated_date)
-VALUES ({sql_val(notif_id)}, {sql_val(agency_id)}, {sql_val(['shift_assignment', 'shift_reminder'][i])}, 
-'staff', 'staff{i+1}@example.com', 'Staff{i+1}', 'pending', 'system',
-{sql_val([{'type': 'shift', 'id': ids['shifts'][0] if ids['shifts'] else None}])}, 1,
-{sql_val(gen_ts_ago(1))}, {sql_val(gen_ts_ago(1))});""")
-
-sql.append("")
-
-# Save extended seed data
-with open('supabase/seed_data.sql', 'a', encoding='utf-8') as f:
-    f.write('\n'.join(sql))
-
-# Update manifest
-with open('SEED_DATA_MANIFEST.json', 'w', encoding='utf-8') as f:
-    json.dump(ids, f, indent=2)
-
-print(f"\n[OK] Complete seed data:")
-print(f"  - Agencies: {len(ids['agencies'])}")
-print(f"  - Profiles: {len(ids['profiles'])}")
-print(f"  - Staff: {len(ids['staff'])}")
-print(f"  - Clients: {len(ids['clients'])}")
-print(f"  - Shifts: {len(ids['shifts'])}")
-print(f"  - Bookings: {len(ids['bookings'])}")
-print(f"  - Timesheets: {len(ids['timesheets'])}")
-print(f"  - Invoices: {len(ids['invoices'])}")
-print(f"  - Payslips: {len(ids['payslips'])}")
-print(f"  - Compliance: {len(ids['compliance'])}")
-print(f"  - Groups: {len(ids['groups'])}")
-print(f"  - Admin Workflows: {len(ids['admin_workflows'])}")
-print(f"  - Change Logs: 5")
-print(f"  - Operational Costs: 3")
-print(f"  - Invoice Amendments: 1")
-print(f"  - Notification Queue: 2")
-print(f"\nTotal: ~86 records")
-print(f"\n[OK] Saved to: supabase/seed_data.sql")
-print(f"[OK] Updated: SEED_DATA_MANIFEST.json")
+# 14. OPERATIONAL_COSTS (3 costs)
+def gen_operational_costs(u):
+    for i in range(3):
+        seed_entity('operational_costs', u['index'] * 3 + i)
+        cost_id = gen_uuid()
+        agency_id = u['agencies'][i % 2]
 
+        yield (cost_id, agency_id, 'monthly_subscription', services[i],
+               categories[i], round(random.uniform(20, 150), 2), gen_date_ago(5), 'GBP', 'paid',
+               'admin@agency.com', gen_date_ago(30), random.choice(['high', 'medium', 'critical']),
+               gen_ts_ago(30), gen_ts_ago(1))
 
 
+# 15. INVOICE_AMENDMENTS (1 amendment)
+def gen_invoice_amendments(u):
+    if u['invoices']:
+        seed_entity('invoice_amendments', u['index'])
+        amend_id = gen_uuid()
+        invoice_id = u['invoices'][0]
+        agency_id = u['agencies'][0]
 
+        yield (amend_id, agency_id, 'hours_adjustment',
+               'Client requested adjustment for actual hours worked', invoice_id, 1, 1000.00, 950.00, -50.00,
+               'approved', 'admin@agency.com', AMENDMENT_CHANGES, 'low',
+               gen_ts_ago(5), gen_ts_ago(1))
 
 
+# 16. NOTIFICATION_QUEUE (2 notifications)
+def gen_notification_queue(u):
+    for i in range(2):
+        seed_entity('notification_queue', u['index'] * 2 + i)
+        notif_id = gen_uuid()
+        agency_id = u['agencies'][i % 2]
+
+        yield (notif_id, agency_id, ['shift_assignment', 'shift_reminder'][i],
+               'staff', f'staff{i+1}@example.com', f'Staff{i+1}', 'pending', 'system',
+               [{'type': 'shift', 'id': u['shifts'][0] if u['shifts'] else None}], 1,
+               gen_ts_ago(1), gen_ts_ago(1))
+
+
+# NumPy backend (--backend numpy): the generators above, one column at a time
+# for a whole block of units. Each batch_<table>(units) hands its IDs out to the
+# units, like the generators do, and returns the rows as a Block (seedgen.encoders)
+# in unit order: a unit's `per_unit` rows, then the next unit's.
+def columns(table, per_unit, units):
+    return Columns(table, units[0]['index'] * per_unit, per_unit * len(units))
+
+
+def hand_out(units, table, per_unit, ids):
+    """Hand each unit of a block its slice of `ids`, `per_unit` to a unit, and return them."""
+    for k, u in enumerate(units):
+        u[table] = ids[k * per_unit:(k + 1) * per_unit]
+    return ids
+
+
+def unit_column(units, key, picks):
+    """u[key][p] for every unit of a block and each p in `picks` (None for None): a column of len(picks) rows a unit."""
+    if not units[0][key]:
+        return [None] * (len(units) * len(picks))
+    return unit_picks(list(chain.from_iterable(u[key] for u in units)), len(units[0][key]), picks)
+
+
+def first_ids(units, key, per_unit):
+    """Every unit's first `key` ID (None if it has none) for each of its `per_unit` rows."""
+    return unit_picks([u[key][0] if u[key] else None for u in units], 1, [0] * per_unit)
+
+
+def batch_shifts(units):
+    if units[0]['region'] is not None:
+        return batch_planned_shifts(units)
+    c = columns('shifts', 15, units)
+    shift_ids = hand_out(units, 'shifts', 15, c.uuids())
+    back, ahead = units[0]['horizon']
+    days = c.integers_array(-back, ahead)
+    roles = [shift_roles[i % len(shift_roles)] for i in range(15)]
+    staffed = [i % 10 if status in ['assigned', 'confirmed', 'completed', 'in_progress'] else None
+               for i, status in enumerate(shift_statuses)]
+    shift_date, start_time, end_time = c.dates(days), c.timestamps(days * 86400 + 8 * 3600), c.timestamps(days * 86400 + 20 * 3600)
+    pay, charge, room = c.integers(15, 22), c.integers(22, 32), c.integers(1, 20)
+    logged, changed = c.timestamps_ago(20), c.timestamps_ago(10)
+    return Block('shifts', len(shift_ids), {
+        'id': shift_ids, 'agency_id': unit_column(units, 'agencies', [i % 2 for i in range(15)]),
+        'client_id': unit_column(units, 'clients', [i % 6 for i in range(15)]),
+        'assigned_staff_id': unit_column(units, 'staff', staffed),
+        'date': shift_date, 'start_time': start_time, 'end_time': end_time, 'duration_hours': Same(12),
+        'role_required': Repeat(roles), 'pay_rate': pay, 'charge_rate': charge, 'break_duration_minutes': Same(30),
+        'status': Repeat(shift_statuses), 'urgency': Repeat('urgent' if i % 5 == 0 else 'normal' for i in range(15)),
+        'notes': Repeat(f'Shift for {role}' for role in roles), 'created_by': Same('admin@agency.com'),
+        'work_location_within_site': list(map('Room {}'.format, room)),
+        'shift_journey_log': Json(journey_logs(shift_statuses * len(units), logged, changed)),
+        'financial_locked': Repeat(status == 'completed' for status in shift_statuses), 'recurring': Same(False),
+        'requirements': Same(SHIFT_REQUIREMENTS), 'booking_id': Same(None),
+        'timesheet_received': Repeat(status == 'completed' for status in shift_statuses),
+        'marketplace_visible': Same(False), 'admin_closure_required': Repeat(status != 'open' for status in shift_statuses),
+        'created_date': c.timestamps_ago(30), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def journey_logs(statuses, logged, changed):
+    """The shift_journey_log JSON text of every shift: opened when `logged`, its status since `changed`."""
+    logs = json_arrays(json_objects(status='open', timestamp=logged, user='system'),
+                       json_objects(status=statuses, timestamp=changed, user='admin'))
+    return ['[]' if status == 'open' else log for status, log in zip(statuses, logs)]
+
+
+def batch_planned_shifts(units):
+    c = columns('shifts', 15, units)
+    shift_ids = hand_out(units, 'shifts', 15, c.uuids())
+    region = units[0]['region']
+    draws = [c.uniform_array(0, 1).tolist() for _ in range(SHIFT_DRAWS)]
+    plans = [plan._replace(pay_rate=pay, charge_rate=charge)
+             for plan, pay, charge in zip(map(region.plan, zip(*draws)), c.integers(15, 22), c.integers(22, 32))]
+    for k, u in enumerate(units):
+        u['shift_plans'] = plans[k * 15:(k + 1) * 15]
+    starts = [(plan.day * 24 + plan.start_hour) * 3600 for plan in plans]
+    start_time = c.timestamps(starts)
+    end_time = c.timestamps([start + plan.hours * 3600 for start, plan in zip(starts, plans)])
+    room, logged, changed = c.integers(1, 20), c.timestamps_ago(20), c.timestamps_ago(10)
+    roles = [shift_roles[i % len(shift_roles)] for i in range(15)] * len(units)
+    statuses = [plan.status for plan in plans]
+    return Block('shifts', len(shift_ids), {
+        'id': shift_ids, 'agency_id': [plan.agency_id for plan in plans], 'client_id': [plan.client_id for plan in plans],
+        'assigned_staff_id': [plan.staff_id for plan in plans], 'date': [start[:10] for start in start_time],
+        'start_time': start_time, 'end_time': end_time, 'duration_hours': [plan.hours for plan in plans],
+        'role_required': roles, 'pay_rate': [plan.pay_rate for plan in plans],
+        'charge_rate': [plan.charge_rate for plan in plans], 'break_duration_minutes': Same(30), 'status': statuses,
+        'urgency': [plan.urgency for plan in plans],
+        'notes': [f'{plan.pattern.title()} shift for {role}' for plan, role in zip(plans, roles)],
+        'created_by': Same('admin@agency.com'), 'work_location_within_site': list(map('Room {}'.format, room)),
+        'shift_journey_log': Json(journey_logs(statuses, logged, changed)),
+        'financial_locked': [status == 'completed' for status in statuses], 'recurring': Same(False),
+        'requirements': Same(SHIFT_REQUIREMENTS), 'booking_id': Same(None),
+        'timesheet_received': [status == 'completed' for status in statuses],
+        'marketplace_visible': [plan.marketplace for plan in plans],
+        'admin_closure_required': [status != 'open' for status in statuses],
+        'created_date': c.timestamps([plan.created_hours * 3600 for plan in plans]), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_bookings(units):
+    if units[0]['region'] is not None:
+        return batch_planned_bookings(units)
+    c = columns('bookings', 10, units)
+    booking_ids = hand_out(units, 'bookings', 10, c.uuids())
+    return Block('bookings', len(booking_ids), {
+        'id': booking_ids, 'agency_id': unit_column(units, 'agencies', [i % 2 for i in range(10)]),
+        'shift_id': unit_column(units, 'shifts', range(10)), 'staff_id': unit_column(units, 'staff', range(10)),
+        'client_id': unit_column(units, 'clients', [i % 6 for i in range(10)]), 'status': Same('confirmed'),
+        'booking_date': c.timestamps_ago(10), 'shift_date': c.dates_ago(10), 'confirmation_method': Same('phone'),
+        'confirmed_by_staff_at': c.timestamps_ago(9), 'notes': Same('Booking confirmed by staff'),
+        'created_date': c.timestamps_ago(15), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def shift_plans(units, per_unit):
+    """The first `per_unit` shift plans of every unit, with their start offsets in seconds."""
+    plans = [plan for u in units for plan in u['shift_plans'][:per_unit]]
+    return plans, [(plan.day * 24 + plan.start_hour) * 3600 for plan in plans]
+
+
+def batch_planned_bookings(units):
+    c = columns('bookings', 10, units)
+    booking_ids = hand_out(units, 'bookings', 10, c.uuids())
+    region = units[0]['region']
+    plans, starts = shift_plans(units, 10)
+    start_time = c.timestamps(starts)
+    plans = [plan._replace(staff_id=region.staff_for(plan, r)) for plan, r in zip(plans, c.uniform_array(0, 1).tolist())]
+    for k, u in enumerate(units):
+        u['shift_plans'][:10] = plans[k * 10:(k + 1) * 10]  # an open shift's booking names who it's offered to
+    return Block('bookings', len(booking_ids), {
+        'id': booking_ids, 'agency_id': [plan.agency_id for plan in plans], 'shift_id': unit_column(units, 'shifts', range(10)),
+        'staff_id': [plan.staff_id for plan in plans], 'client_id': [plan.client_id for plan in plans],
+        'status': [BOOKING_STATUSES.get(plan.status, 'confirmed') for plan in plans], 'booking_date': c.timestamps_ago(10),
+        'shift_date': [start[:10] for start in start_time], 'confirmation_method': Same('phone'),
+        'confirmed_by_staff_at': c.timestamps_ago(9), 'notes': Same('Booking confirmed by staff'),
+        'created_date': c.timestamps_ago(15), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_timesheets(units):
+    if units[0]['region'] is not None:
+        return batch_planned_timesheets(units)
+    c = columns('timesheets', 8, units)
+    timesheet_ids = hand_out(units, 'timesheets', 8, c.uuids())
+    shift_date, room, clock_in, clock_out = c.dates_ago(7), c.integers(1, 10), c.timestamps_ago(7), c.timestamps_ago(7)
+    return Block('timesheets', len(timesheet_ids), {
+        'id': timesheet_ids, 'agency_id': unit_column(units, 'agencies', [i % 2 for i in range(8)]),
+        'booking_id': unit_column(units, 'bookings', range(8)), 'staff_id': unit_column(units, 'staff', range(8)),
+        'client_id': unit_column(units, 'clients', [i % 6 for i in range(8)]), 'shift_date': shift_date,
+        'work_location_within_site': list(map('Room {}'.format, room)), 'clock_in_time': clock_in,
+        'clock_out_time': clock_out, 'total_hours': c.uniform(10, 12, 1), 'break_duration_minutes': Same(30),
+        'status': Same('approved'), 'pay_rate': c.integers(15, 22), 'charge_rate': c.integers(22, 32),
+        'staff_pay_amount': c.uniform(150, 250, 2), 'client_charge_amount': c.uniform(250, 350, 2),
+        'geofence_validated': Same(True), 'location_verified': Same(True), 'staff_signature': Same('SignatureDataBase64...'),
+        'created_date': c.timestamps_ago(10), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_planned_timesheets(units):
+    c = columns('timesheets', 8, units)
+    timesheet_ids = hand_out(units, 'timesheets', 8, c.uuids())
+    plans, starts = shift_plans(units, 8)
+    late, over = c.integers(-10, 15), c.integers(-5, 30)
+    clock_in = c.timestamps([start + minutes * 60 for start, minutes in zip(starts, late)])
+    clock_out = c.timestamps([start + plan.hours * 3600 + minutes * 60 for start, plan, minutes in zip(starts, plans, over)])
+    rows = [planned_timesheet(timesheet_id, plan, booking_id, start_time[:10], room, late_minutes, over_minutes,
+                              clocked_in, clocked_out, created, updated)
+            for timesheet_id, plan, booking_id, start_time, room, late_minutes, over_minutes, clocked_in, clocked_out,
+                created, updated in zip(
+                timesheet_ids, plans, unit_column(units, 'bookings', range(8)), c.timestamps(starts), c.integers(1, 10),
+                late, over, clock_in, clock_out, c.timestamps_ago(10), c.timestamps_ago(1))]
+    return Block('timesheets', len(rows), dict(zip(COLUMNS['timesheets'], map(list, zip(*rows)))))
+
+
+def batch_invoices(units):
+    c = columns('invoices', 3, units)
+    invoice_ids = hand_out(units, 'invoices', 3, c.uuids())
+    first = 1000 + units[0]['index'] * 3
+    subtotal = c.uniform_array(800, 2500)
+    vat = subtotal * 0.2
+    total = rounded(subtotal + vat, 2)
+    dates = {'invoice_date': c.dates_ago(10), 'due_date': c.dates_future(20), 'period_start': c.dates_ago(20),
+             'period_end': c.dates_ago(5)}
+    line_items = json_arrays(json_objects(description='Healthcare services', quantity=c.integers(5, 15),
+                                          rate=c.uniform(18, 30), amount=c.uniform(200, 500)))
+    return Block('invoices', len(invoice_ids), {
+        'id': invoice_ids, 'agency_id': unit_column(units, 'agencies', [0, 1, 0]),
+        'client_id': unit_column(units, 'clients', range(3)),
+        'invoice_number': list(map(f'INV-{now().year}-{{}}'.format, range(first, first + len(invoice_ids)))), **dates,
+        'subtotal': rounded(subtotal, 2), 'vat_rate': Same(0.20), 'vat_amount': rounded(vat, 2), 'total': total,
+        'balance_due': total, 'status': Same('sent'), 'created_by': Same('admin@agency.com'), 'line_items': Json(line_items),
+        'notes': Same('Monthly invoice for healthcare services'), 'reminder_sent_count': Same(0),
+        'created_date': c.timestamps_ago(15), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_payslips(units):
+    c = columns('payslips', 2, units)
+    payslip_ids = hand_out(units, 'payslips', 2, c.uuids())
+    first = 5000 + units[0]['index'] * 2
+    gross = c.uniform_array(800, 1500)
+    tax = gross * 0.2
+    ni = gross * 0.12
+    deductions = tax + ni
+    net = gross - deductions
+    dates = {'period_start': c.dates_ago(30), 'period_end': c.dates_ago(7), 'payment_date': c.dates_ago(3)}
+    timesheets = [dumps([timesheet_id]) for timesheet_id in first_ids(units, 'timesheets', 1)]
+    return Block('payslips', len(payslip_ids), {
+        'id': payslip_ids, 'agency_id': unit_column(units, 'agencies', [0, 1]), 'staff_id': unit_column(units, 'staff', [0, 1]),
+        'payslip_number': list(map(f'PAY-{now().year}-{{}}'.format, range(first, first + len(payslip_ids)))), **dates,
+        'gross_pay': rounded(gross, 2),
+        'deductions': Json(json_objects(tax=rounded(tax, 2), national_insurance=rounded(ni, 2), pension=0, other=0)),
+        'total_deductions': rounded(deductions, 2), 'net_pay': rounded(net, 2), 'status': Same('paid'),
+        'created_by': Same('admin@agency.com'), 'pdf_url': list(map('https://example.com/payslips/{}.pdf'.format, payslip_ids)),
+        'bank_details': Same(PAYSLIP_BANK_DETAILS), 'timesheets': Json(unit_picks(timesheets, 1, [0, 0])),
+        'created_date': c.timestamps_ago(15), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_compliance(units):
+    c = columns('compliance', 12, units)
+    comp_ids = hand_out(units, 'compliance', 12, c.uuids())
+    types = [doc_types[i % len(doc_types)] for i in range(12)]
+    issued = c.dates_ago(365)
+    return Block('compliance', len(comp_ids), {
+        'id': comp_ids, 'staff_id': unit_column(units, 'staff', [i % 10 for i in range(12)]),
+        'agency_id': unit_column(units, 'agencies', [i % 2 for i in range(12)]), 'document_type': Repeat(types),
+        'document_name': Repeat(f'{doc_type.replace("_", " ").title()} - Staff {i+1}' for i, doc_type in enumerate(types)),
+        'document_url': list(map('https://example.com/docs/{}.pdf'.format, comp_ids)), 'issue_date': issued,
+        'expiry_date': c.dates_future(c.choice([30, 90, 365])), 'status': Same('verified'),
+        'created_by': Same('admin@agency.com'), 'issuing_authority': Repeat(f'Issuing Authority {i+1}' for i in range(12)),
+        'reference_number': list(map('REF-{}'.format, c.integers(100000, 999999))), 'reminder_30d_sent': Same(False),
+        'reminder_14d_sent': Same(False), 'created_date': c.timestamps_ago(365), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_groups(units):
+    c = columns('groups', 2, units)
+    group_ids = hand_out(units, 'groups', 2, c.uuids())
+    teams = [f"{chr(65+i)} {u['index'] + 1}" if u['index'] else chr(65 + i) for u in units for i in range(2)]
+    return Block('groups', len(group_ids), {
+        'id': group_ids, 'agency_id': unit_column(units, 'agencies', [0, 1]), 'name': list(map('Team {}'.format, teams)),
+        'description': list(map('Primary healthcare team {}'.format, teams)),
+        'staff_members': [UuidArray(u['staff'][i*5:(i+1)*5]) for u in units for i in range(2)],
+        'created_date': c.timestamps_ago(60), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_admin_workflows(units):
+    c = columns('admin_workflows', 3, units)
+    workflow_ids = hand_out(units, 'admin_workflows', 3, c.uuids())
+    return Block('admin_workflows', len(workflow_ids), {
+        'id': workflow_ids, 'agency_id': unit_column(units, 'agencies', [0, 1, 0]), 'type': Repeat(workflow_types),
+        'priority': Repeat(['high', 'medium', 'critical']),
+        'title': Repeat(f'Workflow: {workflow_type.replace("_", " ").title()}' for workflow_type in workflow_types),
+        'status': Same('pending'), 'created_by': Same('system'),
+        'related_entity': Json(json_objects(entity_type='shift', entity_id=first_ids(units, 'shifts', 3))),
+        'deadline': c.timestamps_future(7), 'auto_created': Same(True), 'escalation_count': Same(0),
+        'created_date': c.timestamps_ago(5), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_change_logs(units):
+    c = columns('change_logs', 5, units)
+    log_ids = c.uuids()
+    return Block('change_logs', len(log_ids), {
+        'id': log_ids, 'agency_id': unit_column(units, 'agencies', [i % 2 for i in range(5)]),
+        'change_type': Repeat(change_types), 'affected_entity_type': Same('shift'),
+        'affected_entity_id': unit_column(units, 'shifts', [0] * 5), 'old_value': Same('Old Value'),
+        'new_value': Same('New Value'), 'reason': Same('Administrative change'), 'changed_by_email': Same('admin@agency.com'),
+        'changed_at': c.timestamps_ago(3), 'risk_level': Same('low'), 'reviewed': Same(False),
+        'created_date': c.timestamps_ago(3), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_operational_costs(units):
+    c = columns('operational_costs', 3, units)
+    cost_ids = c.uuids()
+    return Block('operational_costs', len(cost_ids), {
+        'id': cost_ids, 'agency_id': unit_column(units, 'agencies', [0, 1, 0]), 'cost_type': Same('monthly_subscription'),
+        'service_name': Repeat(services), 'service_category': Repeat(categories), 'amount': c.uniform(20, 150, 2),
+        'paid_date': c.dates_ago(5), 'currency': Same('GBP'), 'status': Same('paid'), 'created_by': Same('admin@agency.com'),
+        'billing_period': c.dates_ago(30), 'roi_impact': c.choice(['high', 'medium', 'critical']),
+        'created_date': c.timestamps_ago(30), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_invoice_amendments(units):
+    c = columns('invoice_amendments', 1, units)
+    amend_ids = c.uuids()
+    return Block('invoice_amendments', len(amend_ids), {
+        'id': amend_ids, 'agency_id': unit_column(units, 'agencies', [0]), 'amendment_type': Same('hours_adjustment'),
+        'amendment_reason': Same('Client requested adjustment for actual hours worked'),
+        'original_invoice_id': unit_column(units, 'invoices', [0]), 'amendment_version': Same(1),
+        'original_total': Same(1000.00), 'amended_total': Same(950.00), 'total_difference': Same(-50.00),
+        'status': Same('approved'), 'created_by': Same('admin@agency.com'), 'changes_made': Same(AMENDMENT_CHANGES),
+        'risk_level': Same('low'), 'created_date': c.timestamps_ago(5), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+def batch_notification_queue(units):
+    c = columns('notification_queue', 2, units)
+    notif_ids = c.uuids()
+    return Block('notification_queue', len(notif_ids), {
+        'id': notif_ids, 'agency_id': unit_column(units, 'agencies', [0, 1]),
+        'notification_type': Repeat(['shift_assignment', 'shift_reminder']), 'recipient_type': Same('staff'),
+        'recipient_email': Repeat(['staff1@example.com', 'staff2@example.com']), 'recipient_first_name': Repeat(['Staff1', 'Staff2']),
+        'status': Same('pending'), 'created_by': Same('system'),
+        'pending_items': Json(json_arrays(json_objects(type='shift', id=first_ids(units, 'shifts', 2)))),
+        'item_count': Same(1), 'created_date': c.timestamps_ago(1), 'updated_date': c.timestamps_ago(1),
+    })
+
+
+# (section number, table, records per unit, generator) in foreign-key order
+SECTIONS = [
+    (5, 'shifts', 15, gen_shifts),
+    (6, 'bookings', 10, gen_bookings),
+    (7, 'timesheets', 8, gen_timesheets),
+    (8, 'invoices', 3, gen_invoices),
+    (9, 'payslips', 2, gen_payslips),
+    (10, 'compliance', 12, gen_compliance),
+    (11, 'groups', 2, gen_groups),
+    (12, 'admin_workflows', 3, gen_admin_workflows),
+    (13, 'change_logs', 5, gen_change_logs),
+    (14, 'operational_costs', 3, gen_operational_costs),
+    (15, 'invoice_amendments', 1, gen_invoice_amendments),
+    (16, 'notification_queue', 2, gen_notification_queue),
+]
+
+
+BATCHES = {
+    'shifts': batch_shifts, 'bookings': batch_bookings, 'timesheets': batch_timesheets,
+    'invoices': batch_invoices, 'payslips': batch_payslips, 'compliance': batch_compliance,
+    'groups': batch_groups, 'admin_workflows': batch_admin_workflows, 'change_logs': batch_change_logs,
+    'operational_costs': batch_operational_costs, 'invoice_amendments': batch_invoice_amendments,
+    'notification_queue': batch_notification_queue,
+}
+
+
+def new_totals(): return {table: 0 for _, table, _, _ in SECTIONS}
+
+
+def unit_blocks(ids, start, stop, backend, sections=SECTIONS, first_unit=0, workload=None):
+    """(units, {table: rows}) for units [start, stop): a unit at a time as lazy generators on the python
+    backend, a block of BLOCK_UNITS at a time as Blocks on the numpy backend. Timesheets come located
+    (seedgen.geo)."""
+    workload = workload or Workload()
+    region = shard_region(ids, start, stop, first_unit, workload)
+    tables = [table for _, table, _, _ in sections]
+    if backend == 'python':
+        for index in range(start, stop):
+            u, = new_units(ids, index, index + 1, first_unit, workload.horizon, region)
+            rows = {table: generate(u) for _, table, _, generate in sections}
+            if 'timesheets' in rows:
+                rows['timesheets'] = geo.locate_timesheets(rows['timesheets'], COLUMNS['timesheets'], workload.geography)
+            yield [u], rows
+        return
+    for block_start in range(start, stop, BLOCK_UNITS):
+        units = new_units(ids, block_start, min(block_start + BLOCK_UNITS, stop), first_unit, workload.horizon, region)
+        rows = {table: BATCHES[table](units) for table in tables}
+        if 'timesheets' in rows:
+            rows['timesheets'] = vectorized.locate_timesheets(rows['timesheets'], workload.geography, units[0]['index'] * 8)
+        yield units, rows
+
+
+def write_units(out, ids, start, stop, scale, totals, backend='python', tables=None, first_unit=0, workload=None):
+    """Write every downstream table (or just those in `tables`) for scale units [start, stop).
+
+    [start, stop) is one shard: a production `workload` spreads its shifts over the whole range.
+    """
+    sections = [section for section in SECTIONS if tables is None or section[1] in tables]
+    if not sections:
+        return  # e.g. only agency-stage tables selected; units need clients that weren't generated
+    workload = workload or Workload()
+    for units, block_rows in unit_blocks(ids, start, stop, backend, sections, first_unit, workload):
+        first, last = units[0]['index'], units[-1]['index']
+        if scale == 1:
+            tag = ""
+        elif first == last:
+            tag = f" [unit {first + 1}/{scale}]"
+        else:
+            tag = f" [units {first + 1}-{last + 1}/{scale}]"
+        for number, table, per_unit, _ in sections:
+            count = per_unit * len(units)
+            label = 'record' if count == 1 else 'records'
+            totals[table] += out.section(f"-- {number}. {table.upper()} ({count} {label}){tag}", table, block_rows[table])
+
+        # Downstream IDs are only kept for the manifest on unscaled runs
+        if scale == 1:
+            for u in units:
+                for table in UNIT_ID_TABLES:
+                    ids[table].extend(u[table])
+
+        if scale > 1 and (last + 1 - start) % 1000 == 0:
+            print(f"  ... {last + 1 - start}/{stop - start} units written (units {start + 1}-{stop})")
+
+
+def generate_shard(job):
+    """Process-pool worker: write one shard of units to its own file and return the row counts."""
+    totals = new_totals()
+    out = open_output(job['format'], job['path'], append=job['append'], compression=job['compress'], spool=True,
+                      batch_size=job['batch_size'], transactions=job['transactions'])
+    with open_manifest(job['manifest']) as ids:
+        write_units(out, ids, job['start'], job['stop'], job['scale'], totals, job['backend'], workload=job['workload'])
+    out.close()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate shifts, bookings, timesheets, invoices and the other downstream tables')
+    parser.add_argument('--scale', type=int, default=1, help='Scale factor: every table grows N times (default: 1)')
+    parser.add_argument('--format', choices=FORMATS, default='insert', help='Output format (default: insert)')
+    parser.add_argument('--output', help='SQL file to append to (.gz/.zst compress), or csv directory (default: supabase/seed_data.sql, supabase/seed_csv)')
+    parser.add_argument('--batch-size', type=int, default=1, help='insert format: rows per INSERT statement (default: 1)')
+    parser.add_argument('--transactions', action='store_true', help='insert format: wrap each INSERT batch in BEGIN/COMMIT')
+    parser.add_argument('--compress', choices=('auto',) + COMPRESSIONS, default='auto', help='Output compression (default: from extension)')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST,
+                        help=f'ID manifest: binary store directory, or a .json file (default: {DEFAULT_MANIFEST})')
+    parser.add_argument('--workers', type=int, default=1, help='Generate unit shards across N processes (default: 1)')
+    parser.add_argument('--shard-units', type=int, default=DEFAULT_SHARD_UNITS,
+                        help=f'Scale units per shard; part of the output layout, keep it fixed when comparing seeded runs (default: {DEFAULT_SHARD_UNITS})')
+    parser.add_argument('--backend', choices=BACKENDS, default='python', help='python, or numpy to draw whole columns at once (default: python)')
+    parser.add_argument('--seed', type=int, help="Make the output reproducible (default: the first stage's seed, if any)")
+    parser.add_argument('--as-of', type=datetime.fromisoformat,
+                        help="Date that relative dates count from (default: the first stage's, else now)")
+    parser.add_argument('--workload', choices=WORKLOADS, default='uniform',
+                        help='How shifts spread over clients, staff and time: uniform, or production (Zipf-skewed, '
+                             'day/night, weekend peaks, urgent bursts) (default: uniform)')
+    parser.add_argument('--horizon', default=format_horizon(DEFAULT_HORIZON),
+                        help=f'Shift dates span BACK:AHEAD days around now (default: {format_horizon(DEFAULT_HORIZON)})')
+    schema.add_arguments(parser)
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error('--scale must be >= 1')
+    if args.batch_size < 1:
+        parser.error('--batch-size must be >= 1')
+    if args.workers < 1:
+        parser.error('--workers must be >= 1')
+    if args.shard_units < 1:
+        parser.error('--shard-units must be >= 1')
+    if args.backend == 'numpy' and not vectorized.available():
+        parser.error("--backend numpy needs the 'numpy' package: pip install numpy")
+    scale = args.scale
+    args.output = args.output or default_output(args.format)
+
+    # Open existing IDs (unscaled runs append their downstream IDs to the manifest)
+    ids = open_manifest(args.manifest, 'a' if scale == 1 else 'r')
+    try:
+        workload = Workload(args.workload, parse_horizon(args.horizon), ids.meta.get('geography', 'newcastle'))
+    except ValueError as error:
+        parser.error(f'--horizon: {error}')
+
+    print(f"Loaded IDs: {len(ids['agencies'])} agencies, {len(ids['staff'])} staff, {len(ids['clients'])} clients")
+
+    seed = args.seed if args.seed is not None else ids.meta.get('seed')
+    as_of = args.as_of or (datetime.fromisoformat(ids.meta['as_of']) if ids.meta.get('as_of') else None)
+    rng.configure(seed, as_of)
+    write = [table for _, table, _, _ in SECTIONS]
+    try:
+        schema.check(args, write)
+    except schema.SchemaError as error:
+        sys.exit(f"\n[FAIL] {error}")
+    instrument.start(args, expected_rows(write, scale))
+    if seed is not None:
+        print(f"Seed: {seed} (as of {rng.settings()[1].isoformat()})")
+
+    totals = new_totals()
+    out = open_output(args.format, args.output, append=True, compression=args.compress, spool=True,
+                      batch_size=args.batch_size, transactions=args.transactions)
+    out.line("\n-- ============================================================================")
+    out.line("-- ADDITIONAL SEED DATA: Shifts, Bookings, Timesheets, Invoices, etc.")
+    out.line("-- ============================================================================\n")
+
+    shards = unit_shards(scale, args.shard_units)
+    if len(shards) == 1:
+        write_units(out, ids, 0, scale, scale, totals, args.backend, workload=workload)
+        out.close()
+    else:
+        out.close()
+        # One worker appends each shard straight to the output; a pool writes side files and merges them
+        direct = args.workers == 1
+        jobs = [{'format': args.format, 'path': args.output if direct else shard_path(args.format, args.output, n),
+                 'append': direct, 'compress': args.compress,
+                 'batch_size': args.batch_size, 'transactions': args.transactions, 'manifest': args.manifest,
+                 'backend': args.backend, 'workload': workload, 'scale': scale, 'start': start, 'stop': stop}
+                for n, (start, stop) in enumerate(shards)]
+        for shard_totals in run_shards(generate_shard, jobs, args.workers):
+            for table, count in shard_totals.items():
+                totals[table] += count
+        if not direct:
+            merge_shards(args.format, args.output, [job['path'] for job in jobs])
+            print(f"Merged {len(jobs)} shards from {args.workers} workers")
+
+    instrument.finish()
+    print(f"\n[OK] Complete seed data:")
+    print(f"  - Agencies: {len(ids['agencies'])}")
+    print(f"  - Profiles: {len(ids['profiles'])}")
+    print(f"  - Staff: {len(ids['staff'])}")
+    print(f"  - Clients: {len(ids['clients'])}")
+    for table in write:
+        print(f"  - {table.replace('_', ' ').title()}: {totals[table]}")
+    print(f"\nTotal: {len(ids['agencies']) + len(ids['profiles']) + len(ids['staff']) + len(ids['clients']) + sum(totals.values())} records")
+    print(f"\n[OK] Saved to: {args.output}")
+    # Scaled runs keep downstream IDs per unit only, so only the manifest's meta is updated: the second stage's
+    # settings, as generate_seed_data.py records them, for topup_seed_data.py to carry on from
+    ids.close()
+    with open_manifest(args.manifest, 'a') as manifest:
+        manifest.meta.update(scale=scale, shard_units=args.shard_units, backend=args.backend, workload=args.workload,
+                             horizon=format_horizon(workload.horizon))
+        if seed is not None:
+            manifest.meta.update(seed=seed, as_of=rng.settings()[1].isoformat())
+    print(f"[OK] Updated: {args.manifest}")
+
+
+if __name__ == '__main__':
+    main()
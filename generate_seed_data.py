@@ -0,0 +1,246 @@
+"""
+Seed Data Engine - all 16 tables in one pass
+Runs the agency tables (seed_data_generator.py) and the downstream tables
+(complete_seed_generator.py) together, in foreign-key order, into one output
+
+Usage:
+    python generate_seed_data.py                                  # the ~88 records of the two-script workflow
+    python generate_seed_data.py --scale 250 --seed 42            # reproducible; needed for --only later
+    python generate_seed_data.py --scale 250 --seed 42 --format csv --workers 8
+    python generate_seed_data.py --only shifts,bookings           # regenerate two tables of the last seeded run
+    python generate_seed_data.py --only staff --format csv        # replace supabase/seed_csv/staff.csv
+    python generate_seed_data.py --scale 10000 --auth-users       # plus auth.users logins for profiles and staff
+    python generate_seed_data.py --scale 10000 --workload production --horizon 90:30  # production-like skew
+    python generate_seed_data.py --scale 10000 --geography uk     # care homes and staff spread over UK cities
+    python generate_seed_data.py --scale 10000 --progress --instrument --profile prof/  # where the time goes
+
+The tables and their foreign keys are declared in seedgen.tables.DEPENDS.
+Each shard of scale units is generated top to bottom - its agencies, staff
+and clients, then its units' shifts, bookings, timesheets and the rest - and
+the IDs are handed down in memory, so there is no intermediate file to
+re-read and nothing is appended to an existing output.
+
+--only regenerates the listed tables. Whatever they depend on is generated
+again too (for the IDs they point at) but not written, and tables nothing
+selected depends on are skipped. That only lines up with the rows already
+loaded if the original run was seeded: the scale, seed, date, backend and
+workload are read back from the manifest, so regenerated rows keep their IDs.
+
+--workload production spreads each shard's shifts, bookings and timesheets
+the way production sees them (seedgen.workload): Zipf-skewed over care homes
+and staff, day/night patterns, weekend peaks and urgent marketplace bursts.
+
+--geography uk spreads the care homes and staff over UK cities with varied
+geofence radii instead of one Newcastle point. Either way timesheets are
+clocked in and out around their client's site, some of them outside the
+geofence (seedgen.geo), so the GPS and geofence screens have data.
+
+Before the first row, the tables are checked against the schema that
+supabase/migrations builds (seedgen.schema; --migrations DIR for another
+directory, --no-schema-check to skip it): a generated column a migration
+dropped, or typed differently from how it's rendered, stops the run there
+rather than partway through a load.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from complete_seed_generator import write_units
+from seed_data_generator import write_tables
+from seedgen import auth, instrument, rng, schema, vectorized
+from seedgen.common import MANIFEST_TABLES, new_manifest
+from seedgen.formats import FORMATS, FilteredOutput, default_output, open_output
+from seedgen.manifest import open_manifest
+from seedgen.parallel import DEFAULT_SHARD_UNITS, merge_shards, run_shards, shard_path, unit_shards
+from seedgen.rng import now
+from seedgen.geo import GEOGRAPHIES
+from seedgen.tables import AUTH_TABLES, TABLES, expected_rows, with_dependencies
+from seedgen.vectorized import BACKENDS
+from seedgen.workload import DEFAULT_HORIZON, WORKLOADS, Workload, format_horizon, parse_horizon
+from seedgen.writer import COMPRESSIONS
+
+DEFAULT_MANIFEST = 'SEED_DATA_MANIFEST.ids'
+UPDATE_OUTPUT = 'supabase/seed_update.sql'
+
+
+def generate_shard(job):
+    """Write one shard of units, every needed table top to bottom; return its IDs and written row counts."""
+    ids = new_manifest()
+    totals = {table: 0 for table in TABLES}
+    out = open_output(job['format'], job['path'], append=job['append'], compression=job['compress'], spool=True,
+                      batch_size=job['batch_size'], transactions=job['transactions'])
+    out = FilteredOutput(out, job['write'])
+    totals.update(write_tables(out, ids, job['start'], job['stop'], job['backend'], job['tables'], job['password_hash'],
+                               job['workload'].geography))
+    write_units(out, ids, job['start'], job['stop'], job['scale'], totals, job['backend'], job['tables'],
+                first_unit=job['start'], workload=job['workload'])
+    out.close()
+    return ids, totals
+
+
+def parse_tables(parser, text):
+    tables = [table.strip() for table in text.split(',') if table.strip()]
+    unknown = [table for table in tables if table not in TABLES]
+    if unknown:
+        parser.error(f"--only: unknown table(s) {', '.join(unknown)} (expected some of {', '.join(TABLES)})")
+    return [table for table in TABLES if table in tables]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate all 16 seed tables in foreign-key order, or regenerate some of them')
+    parser.add_argument('--scale', type=int, help='Scale factor: every table grows N times (default: 1, or the manifest\'s with --only)')
+    parser.add_argument('--format', choices=FORMATS, default='insert', help='Output format (default: insert)')
+    parser.add_argument('--output', help=f'SQL output file (.gz/.zst compress), or directory for csv (default: supabase/seed_data.sql, '
+                                         f'{UPDATE_OUTPUT} with --only, supabase/seed_csv)')
+    parser.add_argument('--batch-size', type=int, default=1, help='insert format: rows per INSERT statement (default: 1)')
+    parser.add_argument('--transactions', action='store_true', help='insert format: wrap each INSERT batch in BEGIN/COMMIT')
+    parser.add_argument('--compress', choices=('auto',) + COMPRESSIONS, default='auto', help='Output compression (default: from extension)')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST,
+                        help=f'ID manifest: binary store directory, or a .json file (default: {DEFAULT_MANIFEST})')
+    parser.add_argument('--workers', type=int, default=1, help='Generate shards across N processes (default: 1)')
+    parser.add_argument('--shard-units', type=int, help=f'Scale units per shard (default: {DEFAULT_SHARD_UNITS}, or the manifest\'s with --only)')
+    parser.add_argument('--backend', choices=BACKENDS, help='python, or numpy to draw whole columns at once (default: python, or the manifest\'s with --only)')
+    parser.add_argument('--seed', type=int, help='Make the output reproducible (default: none, or the manifest\'s with --only)')
+    parser.add_argument('--as-of', type=datetime.fromisoformat, help='Date that relative dates count from (default: now, or the manifest\'s with --only)')
+    parser.add_argument('--only', help='Comma-separated tables to regenerate, e.g. shifts,bookings (needs a seeded manifest)')
+    parser.add_argument('--auth-users', action='store_true',
+                        help='Also generate auth.users logins for the profiles and staff (default: off, or the manifest\'s with --only)')
+    parser.add_argument('--password', default=auth.DEFAULT_PASSWORD,
+                        help=f'--auth-users: the password every login gets (default: {auth.DEFAULT_PASSWORD}; others need bcrypt)')
+    parser.add_argument('--workload', choices=WORKLOADS,
+                        help='How shifts spread over clients, staff and time: uniform, or production (Zipf-skewed, '
+                             'day/night, weekend peaks, urgent bursts) (default: uniform, or the manifest\'s with --only)')
+    parser.add_argument('--horizon', help=f'Shift dates span BACK:AHEAD days around now '
+                                          f'(default: {format_horizon(DEFAULT_HORIZON)}, or the manifest\'s with --only)')
+    parser.add_argument('--geography', choices=GEOGRAPHIES,
+                        help='Where clients and staff are: newcastle (one site), or uk (spread over UK cities) '
+                             '(default: newcastle, or the manifest\'s with --only)')
+    schema.add_arguments(parser)
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+
+    only = parse_tables(parser, args.only) if args.only else None
+    if only:
+        # Regenerated rows must line up with the loaded ones, so default to the original run's settings
+        with open_manifest(args.manifest) as manifest:
+            meta = manifest.meta
+        args.scale = args.scale or meta.get('scale')
+        args.shard_units = args.shard_units or meta.get('shard_units')
+        args.backend = args.backend or meta.get('backend')
+        args.seed = args.seed if args.seed is not None else meta.get('seed')
+        args.as_of = args.as_of or (datetime.fromisoformat(meta['as_of']) if meta.get('as_of') else None)
+        args.auth_users = args.auth_users or meta.get('auth_users', False)
+        args.workload = args.workload or meta.get('workload')
+        args.horizon = args.horizon or meta.get('horizon')
+        args.geography = args.geography or meta.get('geography')
+        if args.seed is None:
+            parser.error('--only needs a seeded dataset (run with --seed first) so regenerated rows keep their IDs')
+    args.scale = args.scale or 1
+    args.shard_units = args.shard_units or DEFAULT_SHARD_UNITS
+    args.backend = args.backend or 'python'
+    args.workload = args.workload or 'uniform'
+    args.horizon = args.horizon or format_horizon(DEFAULT_HORIZON)
+    args.geography = args.geography or 'newcastle'
+    if args.scale < 1:
+        parser.error('--scale must be >= 1')
+    if args.batch_size < 1:
+        parser.error('--batch-size must be >= 1')
+    if args.workers < 1:
+        parser.error('--workers must be >= 1')
+    if args.shard_units < 1:
+        parser.error('--shard-units must be >= 1')
+    if args.backend == 'numpy' and not vectorized.available():
+        parser.error("--backend numpy needs the 'numpy' package: pip install numpy")
+    try:
+        workload = Workload(args.workload, parse_horizon(args.horizon), args.geography)
+    except ValueError as error:
+        parser.error(f'--horizon: {error}')
+    if only and not args.auth_users and any(table in AUTH_TABLES for table in only):
+        parser.error('--only auth.users/auth.identities needs --auth-users')
+    if args.auth_users and args.password != auth.DEFAULT_PASSWORD and not auth.available():
+        parser.error("--password needs the 'bcrypt' package: pip install bcrypt")
+    scale = args.scale
+    rng.configure(args.seed, args.as_of)
+    if args.output is None:
+        args.output = UPDATE_OUTPUT if only and args.format != 'csv' else default_output(args.format)
+    write = only or [table for table in TABLES if args.auth_users or table not in AUTH_TABLES]
+    tables = with_dependencies(write)
+    try:
+        schema.check(args, tables)
+    except schema.SchemaError as error:
+        sys.exit(f"\n[FAIL] {error}")
+    instrument.start(args, expected_rows(write, scale, logins=args.auth_users))
+    # Hashed once here and handed to every shard
+    password_hash = auth.password_hash(args.password) if args.auth_users else None
+
+    out = open_output(args.format, args.output, compression=args.compress)
+    if only:
+        out.line(f"-- REGENERATED SEED DATA: {', '.join(only)}")
+        out.line("-- Same IDs as the original seeded run: delete these tables' rows (or load into staging and upsert) first")
+    else:
+        out.line("-- COMPREHENSIVE SEED DATA - All 16 Tables")
+    out.line(f"-- Generated: {now().isoformat()}")
+    if scale > 1:
+        out.line(f"-- Scale factor: {scale}")
+    if args.seed is not None:
+        out.line(f"-- Seed: {args.seed}")
+    if workload.skewed:
+        out.line(f"-- Workload: {args.workload}, shift dates {format_horizon(workload.horizon)} days back:ahead")
+    if args.geography != 'newcastle':
+        out.line(f"-- Geography: {args.geography}")
+    if args.auth_users:
+        for header_line in auth.header_lines(args.password):
+            out.line(header_line)
+    out.line("-- Run this in Supabase SQL Editor\n" if args.format == 'insert' else "-- Run this with psql -f\n")
+    out.close()
+
+    # Full runs rewrite the manifest shard by shard; --only runs leave it alone (the IDs don't change)
+    manifest = None
+    if not only:
+        manifest = open_manifest(args.manifest, 'w')
+        for table in MANIFEST_TABLES:
+            manifest[table]  # every table gets an (empty) entry up front
+
+    # One worker appends each shard straight to the output; a pool writes side files and merges them.
+    # The csv table files start empty (the header pass creates none).
+    shards = unit_shards(scale, args.shard_units)
+    direct = args.workers == 1 or len(shards) == 1
+    jobs = [{'format': args.format, 'path': args.output if direct else shard_path(args.format, args.output, n),
+             'append': direct and (n > 0 or args.format != 'csv'), 'compress': args.compress,
+             'batch_size': args.batch_size, 'transactions': args.transactions, 'backend': args.backend,
+             'password_hash': password_hash, 'workload': workload, 'tables': tables, 'write': write, 'scale': scale, 'start': start, 'stop': stop}
+            for n, (start, stop) in enumerate(shards)]
+    totals = {table: 0 for table in TABLES}
+    for shard_ids, shard_totals in run_shards(generate_shard, jobs, args.workers):
+        for table, count in shard_totals.items():
+            totals[table] += count
+        if manifest is not None:
+            # (downstream IDs are only collected on unscaled runs, as in complete_seed_generator.py)
+            for table in MANIFEST_TABLES:
+                manifest[table].extend(shard_ids[table])
+    if not direct:
+        merge_shards(args.format, args.output, [job['path'] for job in jobs], truncate=True)
+        print(f"Merged {len(jobs)} shards from {args.workers} workers")
+
+    if manifest is not None:
+        manifest.meta.update(scale=scale, shard_units=args.shard_units, backend=args.backend, auth_users=args.auth_users,
+                             workload=args.workload, horizon=format_horizon(workload.horizon))
+        if args.geography != 'newcastle':
+            manifest.meta.update(geography=args.geography)
+        if args.seed is not None:
+            manifest.meta.update(seed=args.seed, as_of=rng.settings()[1].isoformat())
+        manifest.close()
+
+    instrument.finish()
+    print(f"\n[OK] {'Regenerated' if only else 'Complete'} seed data:")
+    for table in write:
+        print(f"  - {table.replace('_', ' ').title()}: {totals[table]}")
+    print(f"\nTotal: {sum(totals.values())} records")
+    print(f"\n[OK] Saved to: {args.output}")
+    if manifest is not None:
+        print(f"[OK] ID manifest saved to: {args.manifest}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,5 @@
-import os
-
-for root, _, files in os.walk("src"):
-    for filename in files:
-        if filename.endswith((".js", ".jsx", ".ts", ".tsx")):
-            path = os.path.join(root, filename)
-            try:
-                with open(path, "r", encoding="utf-8") as fh:
-                    if "billing_email" in fh.read():
-                        print(path)
-            except UnicodeDecodeError:
-                continue
-
-
-
-
-
-
+from find_refs import DEFAULT_INDEX, files_referencing
 
+# Kept for the old one-off: find_refs.py does this for any number of columns
+for path in files_referencing(["billing_email"], whole_words=False, index=DEFAULT_INDEX):
+    print(path)
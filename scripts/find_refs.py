@@ -0,0 +1,415 @@
+"""
+Codebase reference scanner - find every use of many identifiers in one pass
+Generalizes find_billing_refs.py: instead of one hard-coded substring per
+run, it takes a whole column list (e.g. everything a migration renames or
+drops) and reports where each one is used
+
+Usage:
+    python scripts/find_refs.py billing_email invoice_email                # file:line:col: identifier
+    python scripts/find_refs.py --schema "Complete Database Schema Reference.txt" --counts
+    python scripts/find_refs.py --migrations supabase/migrations --unused  # columns the code never mentions
+    python scripts/find_refs.py --from-file columns.txt --root src --root supabase/functions --files
+    python scripts/find_refs.py billing_email --substring --files          # what find_billing_refs.py printed
+    python scripts/find_refs.py --from-file dropped_columns.txt --check    # pre-commit: fail while any is still used
+
+Identifiers come from the command line, --from-file (one per line, # comments),
+--schema (the Column/Type/Description tables of the schema reference) and
+--migrations (the columns that CREATE TABLE and ALTER TABLE ... ADD COLUMN
+define in a directory of .sql files). They are matched as whole identifiers,
+so `status` doesn't hit `statusLabel`; --substring matches them anywhere,
+the way find_billing_refs.py did.
+
+All identifiers are looked for at once by an Aho-Corasick automaton: one pass
+over each file finds every occurrence of every identifier, however many there
+are. Files are memory-mapped rather than read whole, and scanned across
+--workers processes (default: one per CPU). Lines and columns are 1-based;
+columns count characters, not bytes.
+
+Scans are answered from a token index (--index, default .find_refs_index):
+for every file, where each identifier-like token in it occurs. An entry is
+reused while the file's mtime and size are unchanged, and also when they
+changed but its SHA-1 didn't (a checkout or touch), so after the first run
+only edited files are read again and a query takes milliseconds. Whole
+identifiers are looked up directly; --substring runs the automaton over the
+index's vocabulary instead of the files. Identifiers with characters other
+than letters, digits, _ and $ can't be tokens, so they scan the files.
+--no-index always scans. With --check the exit status is 1 if anything is
+found, for a pre-commit hook guarding columns a migration drops.
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import pickle
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_ROOTS = ['src']
+DEFAULT_EXTENSIONS = '.js,.jsx,.ts,.tsx'
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', 'coverage'}
+WORD_BYTES = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_$')
+DEFAULT_INDEX = '.find_refs_index'
+INDEX_VERSION = 1
+
+_TOKEN = re.compile(rb'[A-Za-z0-9_$]+')  # a maximal run of WORD_BYTES: a whole identifier
+_WORD = re.compile(r'[A-Za-z0-9_$]+')
+
+_SCHEMA_ROW = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)\t')
+_CREATE_TABLE = re.compile(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[\w."]+\s*\((.*?)\)\s*;', re.I | re.S)
+_ADD_COLUMN = re.compile(r'ADD\s+COLUMN\s+(?:IF\s+NOT\s+EXISTS\s+)?"?([A-Za-z_][A-Za-z0-9_]*)"?', re.I)
+_CONSTRAINT = {'constraint', 'primary', 'foreign', 'unique', 'check', 'exclude', 'like'}
+
+
+class Automaton:
+    """Aho-Corasick automaton over bytes: every occurrence of every pattern in one pass.
+
+    `delta` is the full transition table (state -> {byte: state}, no entry
+    meaning back to the root), so scanning takes one dict lookup per byte.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = [p.encode() for p in patterns]
+        goto, outputs = [{}], [[]]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for byte in pattern:
+                if byte not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][byte] = len(goto) - 1
+                state = goto[state][byte]
+            outputs[state].append(index)
+
+        # Breadth first, so a state's failure link (and its table) is done before the state's
+        self.delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self.delta[state] = {**self.delta[fail[state]], **goto[state]}
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for byte, child in goto[state].items():
+                fail[child] = self.delta[fail[state]].get(byte, 0)
+                queue.append(child)
+        self.outputs = [tuple(out) for out in outputs]
+
+    def find(self, data):
+        """(start, pattern index) for every occurrence in `data`, in order of where they end."""
+        delta, outputs, patterns = self.delta, self.outputs, self.patterns
+        state = 0
+        for end, byte in enumerate(data):
+            state = delta[state].get(byte, 0)
+            if outputs[state]:
+                for index in outputs[state]:
+                    yield end + 1 - len(patterns[index]), index
+
+
+def schema_identifiers(path):
+    """Column names from the schema reference's Column/Type/Description tables."""
+    names = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = _SCHEMA_ROW.match(line)
+            if match and match.group(1) != 'Column':
+                names.append(match.group(1))
+    return names
+
+
+def migration_identifiers(directory):
+    """Column names that CREATE TABLE and ALTER TABLE ... ADD COLUMN define in the .sql files under `directory`."""
+    names = []
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if not filename.endswith('.sql'):
+                continue
+            with open(os.path.join(root, filename), 'r', encoding='utf-8', errors='replace') as f:
+                sql = re.sub(r'--[^\n]*', '', f.read())
+            for body in _CREATE_TABLE.findall(sql):
+                for definition in re.split(r',(?![^(]*\))', body):
+                    words = definition.split()
+                    if words and words[0].lower() not in _CONSTRAINT:
+                        names.append(words[0].strip('"'))
+            names += _ADD_COLUMN.findall(sql)
+    return names
+
+
+def file_identifiers(path):
+    """Identifiers listed one per line in `path` (blank lines and # comments skipped)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.split('#', 1)[0].strip() for line in f if line.split('#', 1)[0].strip()]
+
+
+def source_files(roots, extensions):
+    """Every file under `roots` with one of `extensions`, skipping node_modules and build output."""
+    for root in roots:
+        if os.path.isfile(root):
+            yield root
+            continue
+        for directory, dirs, files in os.walk(root):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for filename in sorted(files):
+                if filename.endswith(extensions):
+                    yield os.path.join(directory, filename)
+
+
+_automaton = None
+_whole_words = True
+
+
+def _init_worker(patterns, whole_words):
+    global _automaton, _whole_words
+    _automaton, _whole_words = Automaton(patterns), whole_words
+
+
+def scan_file(path):
+    """(path, [(line, column, pattern index)...]) for the hits in one file."""
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return path, []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return path, _locate(data, _automaton, _whole_words)
+    except OSError as error:
+        print(f"[WARN] {path}: {error}", file=sys.stderr)
+        return path, []
+
+
+def _locate(data, automaton, whole_words):
+    hits = []
+    line, counted = 1, 0  # line number at byte offset `counted`
+    size = len(data)
+    with memoryview(data) as view:
+        for start, index in automaton.find(view):
+            end = start + len(automaton.patterns[index])
+            if whole_words and ((start and data[start - 1] in WORD_BYTES) or (end < size and data[end] in WORD_BYTES)):
+                continue
+            if start > counted:  # overlapping hits can end in order but start out of it
+                line += data[counted:start].count(b'\n')
+                counted = start
+            line_start = data.rfind(b'\n', 0, start) + 1
+            column = len(data[line_start:start].decode('utf-8', errors='replace')) + 1
+            hits.append((line, column, index))
+    hits.sort()
+    return hits
+
+
+def scan(patterns, paths, workers=1, whole_words=True):
+    """Yield (path, hits) for `paths`, in order, scanning across `workers` processes."""
+    if workers == 1:
+        _init_worker(patterns, whole_words)
+        yield from map(scan_file, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(patterns, whole_words)) as pool:
+        yield from pool.map(scan_file, paths, chunksize=8)
+
+
+def _tokens(data):
+    """{token: [line, column, line, column, ...]} for every token in `data`."""
+    tokens = {}
+    line, line_start, counted = 1, 0, 0
+    for match in _TOKEN.finditer(data):
+        start = match.start()
+        newlines = data[counted:start].count(b'\n')
+        if newlines:
+            line += newlines
+            line_start = data.rfind(b'\n', counted, start) + 1
+        counted = start
+        prefix = data[line_start:start]
+        column = (len(prefix) if prefix.isascii() else len(prefix.decode('utf-8', errors='replace'))) + 1
+        positions = tokens.setdefault(match.group().decode('ascii'), [])
+        positions += (line, column)
+    return tokens
+
+
+def index_file(job):
+    """Index worker: (path, (mtime, size), SHA-1, tokens) for one (path, known SHA-1) job.
+
+    tokens is None when the content still has the known SHA-1, and the SHA-1 is
+    None when the file can't be read.
+    """
+    path, known = job
+    try:
+        stat = os.stat(path)  # before reading, so a write during it shows up next time
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with open(path, 'rb') as f:
+            if stat.st_size == 0:
+                return path, stamp, hashlib.sha1().hexdigest(), {}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                digest = hashlib.sha1(data).hexdigest()
+                return path, stamp, digest, None if digest == known else _tokens(data)
+    except OSError as error:
+        print(f"[WARN] {path}: {error}", file=sys.stderr)
+        return path, None, None, None
+
+
+class Index:
+    """The on-disk token index: path -> ((mtime, size), SHA-1, {token: [line, column, ...]})."""
+
+    def __init__(self, path):
+        self.path = path
+        self.files = {}
+        self.changed = False
+        try:
+            with open(path, 'rb') as f:
+                stored = pickle.load(f)
+            if stored.get('version') == INDEX_VERSION:
+                self.files = stored['files']
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            pass  # no index yet (or an unreadable one): start afresh
+
+    def refresh(self, paths, workers=1):
+        """Bring the entries for `paths` up to date, reading only files whose mtime or size changed; return how many."""
+        stale = []
+        for path in paths:
+            entry = self.files.get(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stat = None
+            if entry is None or stat is None or entry[0] != (stat.st_mtime_ns, stat.st_size):
+                stale.append((path, entry[1] if entry else None))
+        workers = min(workers, len(stale))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                indexed = list(pool.map(index_file, stale, chunksize=8))
+        else:
+            indexed = map(index_file, stale)
+        for path, stamp, digest, tokens in indexed:
+            if digest is None:
+                self.files.pop(path, None)
+            else:
+                self.files[path] = (stamp, digest, self.files[path][2] if tokens is None else tokens)
+        gone = [path for path in self.files if not os.path.exists(path)]
+        for path in gone:
+            del self.files[path]
+        self.changed = self.changed or bool(stale or gone)
+        return len(stale)
+
+    def save(self):
+        if not self.changed:
+            return
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'files': self.files}, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self.changed = False
+
+    def lookup(self, patterns, paths, whole_words=True):
+        """Yield (path, hits) for `paths` like scan(), from the index (refresh() them first)."""
+        wanted = {}  # token -> [(offset of the pattern in it, pattern index)...]
+        if whole_words:
+            for index, pattern in enumerate(patterns):
+                wanted.setdefault(pattern, []).append((0, index))
+        else:
+            automaton = Automaton(patterns)
+            vocabulary = set()
+            for path in paths:
+                vocabulary.update(self.files[path][2] if path in self.files else ())
+            for token in vocabulary:
+                found = list(automaton.find(token.encode()))
+                if found:
+                    wanted[token] = found
+        for path in paths:
+            tokens = self.files[path][2] if path in self.files else {}
+            hits = []
+            fewer, more = (wanted, tokens) if len(wanted) < len(tokens) else (tokens, wanted)
+            for token in [token for token in fewer if token in more]:
+                positions = tokens[token]
+                for offset, index in wanted[token]:
+                    hits += [(positions[k], positions[k + 1] + offset, index) for k in range(0, len(positions), 2)]
+            hits.sort()
+            yield path, hits
+
+
+def indexable(patterns):
+    """Whether the index can answer for `patterns`: they must be made of token characters."""
+    return all(_WORD.fullmatch(pattern) for pattern in patterns)
+
+
+def references(patterns, paths, workers=1, whole_words=True, index=None):
+    """Yield (path, hits) for `paths`: from the token index at `index` if given (and usable), else by scanning."""
+    if index is None or not indexable(patterns):
+        yield from scan(patterns, paths, workers, whole_words)
+        return
+    cache = Index(index)
+    cache.refresh(paths, workers)
+    cache.save()
+    yield from cache.lookup(patterns, paths, whole_words)
+
+
+def files_referencing(identifiers, roots=DEFAULT_ROOTS, extensions=DEFAULT_EXTENSIONS, whole_words=True, index=None):
+    """Paths of the files under `roots` that mention any of `identifiers` (answered from the token index at `index`, if given)."""
+    paths = list(source_files(roots, tuple(extensions.split(','))))
+    return [path for path, hits in references(list(identifiers), paths, whole_words=whole_words, index=index) if hits]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find every use of many identifiers across the codebase in one pass')
+    parser.add_argument('identifiers', nargs='*', help='Identifiers to look for')
+    parser.add_argument('--from-file', action='append', default=[], help='Also look for the identifiers listed in this file')
+    parser.add_argument('--schema', help='Also look for every column in this schema reference (Column<TAB>Type<TAB>Description tables)')
+    parser.add_argument('--migrations', help='Also look for every column the .sql migrations in this directory define')
+    parser.add_argument('--root', action='append', help=f"Directory (or file) to scan; repeatable (default: {', '.join(DEFAULT_ROOTS)})")
+    parser.add_argument('--ext', default=DEFAULT_EXTENSIONS, help=f'Comma-separated file extensions to scan (default: {DEFAULT_EXTENSIONS})')
+    parser.add_argument('--substring', action='store_true', help='Match inside longer identifiers too')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Scan across N processes (default: one per CPU)')
+    parser.add_argument('--index', default=DEFAULT_INDEX, help=f'Token index file, kept up to date as files change (default: {DEFAULT_INDEX})')
+    parser.add_argument('--no-index', action='store_true', help='Scan the files instead of using (and updating) the index')
+    parser.add_argument('--check', action='store_true', help='Exit with status 1 if anything is found (for a pre-commit hook)')
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--files', action='store_true', help='Print only the paths of files with a hit')
+    output.add_argument('--counts', action='store_true', help='Print hits and files per identifier, unused ones included')
+    output.add_argument('--unused', action='store_true', help='Print only the identifiers with no hits')
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error('--workers must be >= 1')
+
+    identifiers = list(args.identifiers)
+    for path in args.from_file:
+        identifiers += file_identifiers(path)
+    if args.schema:
+        identifiers += schema_identifiers(args.schema)
+    if args.migrations:
+        identifiers += migration_identifiers(args.migrations)
+    identifiers = list(dict.fromkeys(name for name in identifiers if name))
+    if not identifiers:
+        parser.error('nothing to look for: give identifiers, --from-file, --schema or --migrations')
+
+    paths = list(source_files(args.root or DEFAULT_ROOTS, tuple(args.ext.split(','))))
+    workers = min(args.workers, max(1, len(paths)))
+    hits_per, files_per = [0] * len(identifiers), [0] * len(identifiers)
+    total, matched = 0, 0
+    index = None if args.no_index else args.index
+    for path, hits in references(identifiers, paths, workers, not args.substring, index):
+        if not hits:
+            continue
+        matched += 1
+        total += len(hits)
+        for pattern in {pattern for _, _, pattern in hits}:
+            files_per[pattern] += 1
+        for line, column, pattern in hits:
+            hits_per[pattern] += 1
+            if not (args.files or args.counts or args.unused):
+                print(f"{path}:{line}:{column}: {identifiers[pattern]}")
+        if args.files:
+            print(path)
+
+    if args.counts:
+        width = max(len(name) for name in identifiers)
+        for name, hits, files in sorted(zip(identifiers, hits_per, files_per), key=lambda item: (-item[1], item[0])):
+            print(f"{name:<{width}}  {hits:>6} hits  {files:>4} files")
+    if args.unused:
+        for name, hits in zip(identifiers, hits_per):
+            if not hits:
+                print(name)
+    print(f"\n[OK] {len(identifiers)} identifiers, {total} hits in {matched}/{len(paths)} files", file=sys.stderr)
+    if args.check and total:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,169 +1,501 @@
 """
 Comprehensive Seed Data Generator for All 15 Tables
 Generates ~86 records with realistic UK healthcare data
+
+Usage:
+    python seed_data_generator.py                                    # 2 agencies, 10 staff, 6 clients
+    python seed_data_generator.py --scale 250                        # 500 agencies, 2500 staff, 1500 clients
+    python seed_data_generator.py --output supabase/seed_data.sql.gz # gzip (.zst for zstd) output
+    python seed_data_generator.py --batch-size 500 --transactions    # multi-row INSERTs, BEGIN/COMMIT per batch
+    python seed_data_generator.py --format copy                      # COPY FROM stdin blocks for psql
+    python seed_data_generator.py --format csv                       # supabase/seed_csv/*.csv + load.sql
+    python seed_data_generator.py --scale 5000 --workers 32          # shard agencies across 32 processes
+    python seed_data_generator.py --scale 5000 --backend numpy       # whole-column draws (needs numpy)
+    python seed_data_generator.py --scale 250 --seed 42              # reproducible, byte-identical output
+    python seed_data_generator.py --scale 10000 --auth-users         # plus auth.users logins for profiles and staff
+    python seed_data_generator.py --scale 1000 --geography uk        # care homes and staff spread over UK cities
+    python seed_data_generator.py --scale 5000 --progress --instrument  # live progress, per-stage timings
+
+Each table is produced by a generator function that yields one row at a
+time (a tuple in seedgen.tables.COLUMNS order) into the chosen output
+format, so memory stays flat and the first sections reach disk while later
+ones are still being generated.
+
+With --seed every row draws its values and UUIDs from its own stream
+(seedgen.rng), and "now" is pinned to --as-of, so the same seed and scale
+reproduce the same bytes whatever --workers is set to.
+
+--auth-users adds an auth.users (and auth.identities) login for every
+admin/manager profile and staff member, and a profile for each staff
+member, so the profiles no longer need skipping and authenticated paths can
+be load-tested. All logins share one password (seedgen.auth), hashed once.
+
+generate_seed_data.py runs both stages in one pass (and can regenerate
+single tables with --only); this script remains for the two-step workflow.
 """
 
-import json
+import argparse
 import random
-from datetime import datetime, timedelta
-from uuid import uuid4
-
-# UK Healthcare Data
-UK_FIRST_NAMES_MALE = ['James', 'John', 'Robert', 'Michael', 'William', 'David', 'Thomas', 'Daniel', 'Matthew', 'Andrew']
-UK_FIRST_NAMES_FEMALE = ['Mary', 'Sarah', 'Emma', 'Jennifer', 'Linda', 'Elizabeth', 'Jessica', 'Karen', 'Rachel', 'Sophie']
-UK_LAST_NAMES = ['Smith', 'Jones', 'Williams', 'Taylor', 'Brown', 'Davies', 'Evans', 'Wilson', 'Thomas', 'Roberts']
-
-UK_CITIES = ['London', 'Manchester', 'Sunderland', 'Newcastle', 'Leeds', 'Birmingham']
-UK_STREETS = ['High Street', 'Station Road', 'Church Lane', 'Main Street', 'Park Road']
-
-CARE_HOME_NAMES = ['Divine Care Center', 'Instay Sunderland', 'Harbor View Lodge', 'Willow Manor', 'Oakwood Residence', 'Sunset Gardens']
-
-# Generated IDs storage
-ids = {
-    'agencies': [], 'profiles': [], 'staff': [], 'clients': [],
-    'shifts': [], 'bookings': [], 'timesheets': [], 'invoices': [],
-    'compliance': [], 'groups': [], 'admin_workflows': [], 'payslips': []
-}
-
-def gen_uuid(): return str(uuid4())
-def gen_email(fn, ln, domain='gmail.com'): return f"{fn.lower()}.{ln.lower()}@{domain}"
-def gen_phone(): return f"+44{random.randint(7000000000, 7999999999)}"
-def gen_postcode(): return f"{random.choice(['TS', 'SR', 'NE'])}{random.randint(1,9)} {random.randint(1,9)}{random.choice('ABDEFGHJLNPQRSTUWXYZ')}{random.choice('ABDEFGHJLNPQRSTUWXYZ')}"
-def gen_date_ago(days): return (datetime.now() - timedelta(days=random.randint(0, days))).strftime('%Y-%m-%d')
-def gen_ts_ago(days): return (datetime.now() - timedelta(days=random.randint(0, days), hours=random.randint(0, 23))).isoformat()
-def gen_ts_future(days): return (datetime.now() + timedelta(days=random.randint(1, days))).isoformat()
-def gen_date_future(days): return (datetime.now() + timedelta(days=random.randint(1, days))).strftime('%Y-%m-%d')
-
-def sql_val(v):
-    if v is None: return 'NULL'
-    if isinstance(v, bool): return 'true' if v else 'false'
-    if isinstance(v, (dict, list)): return f"'{json.dumps(v)}'::jsonb"
-    if isinstance(v, str): return f"'{v.replace(chr(39), chr(39)+chr(39))}'"
-    return str(v)
-
-def gen_address():
-    return {'line1': f"{random.randint(1,999)} {random.choice(UK_STREETS)}", 'city': random.choice(UK_CITIES), 'postcode': gen_postcode(), 'country': 'UK'}
-
-# SQL Builder
-sql = []
-sql.append("-- COMPREHENSIVE SEED DATA - All 15 Tables")
-sql.append(f"-- Generated: {datetime.now().isoformat()}")
-sql.append("-- Run this in Supabase SQL Editor\n")
-
-# 1. AGENCIES
-sql.append("-- 1. AGENCIES (2 records)")
-agencies_data = [
-    {'id': gen_uuid(), 'name': 'Dominion Healthcare Services Ltd', 'created_by': 'g.basera@yahoo.com', 'registration_number': 'GB12345678',
+import sys
+from datetime import datetime
+
+from seedgen import auth, geo, instrument, rng, schema, vectorized
+from seedgen.common import (
+    CARE_HOME_NAMES, MANIFEST_TABLES, UK_FIRST_NAMES_FEMALE, UK_FIRST_NAMES_MALE, UK_LAST_NAMES,
+    gen_address, gen_date_ago, gen_date_future, gen_email, gen_phone, gen_ts_ago, gen_uuid,
+    new_manifest,
+)
+from seedgen.encoders import Block, Json, Repeat, Same, constant
+from seedgen.formats import FORMATS, default_output, open_output
+from seedgen.manifest import open_manifest
+from seedgen.parallel import DEFAULT_SHARD_UNITS, merge_shards, run_shards, shard_path, unit_shards
+from seedgen.rng import now, seed_entity
+from seedgen.vectorized import BACKENDS, Columns, json_arrays, json_objects
+from seedgen.tables import AUTH_TABLES, COLUMNS, expected_rows
+from seedgen.writer import COMPRESSIONS
+
+DEFAULT_MANIFEST = 'SEED_DATA_MANIFEST.ids'
+
+AGENCY_TEMPLATES = [
+    {'name': 'Dominion Healthcare Services Ltd', 'created_by': 'g.basera@yahoo.com', 'registration_number': 'GB12345678',
      'contact_email': 'info@dominionhealth.co.uk', 'contact_phone': '+441912345678', 'subscription_tier': 'professional',
-     'address': {'line1': '123 Business Park', 'city': 'Newcastle', 'postcode': 'NE1 4ST'}, 'status': 'active',
-     'bank_details': {'account_name': 'Dominion Healthcare', 'account_number': '12345678', 'sort_code': '20-00-00'},
+     'address': constant({'line1': '123 Business Park', 'city': 'Newcastle', 'postcode': 'NE1 4ST'}), 'status': 'active',
+     'bank_details': constant({'account_name': 'Dominion Healthcare', 'account_number': '12345678', 'sort_code': '20-00-00'}),
      'dbs_check_expiry_alerts': True, 'mandatory_training_reminders': True, 'document_expiry_warnings': True,
      'auto_approve_timesheets': False, 'sms_shift_confirmations': True, 'whatsapp_notifications': True,
      'auto_generate_invoices': True, 'send_payment_reminders': True, 'email_notifications': True,
      'sms_notifications': True, 'whatsapp_global_notifications': True, 'payment_terms_days': 30, 'invoice_frequency': 'weekly'},
-    {'id': gen_uuid(), 'name': 'CareStaff Solutions Ltd', 'created_by': 'admin@carestaff.co.uk', 'registration_number': 'GB87654321',
+    {'name': 'CareStaff Solutions Ltd', 'created_by': 'admin@carestaff.co.uk', 'registration_number': 'GB87654321',
      'contact_email': 'hello@carestaff.co.uk', 'contact_phone': '+441132345678', 'subscription_tier': 'starter',
-     'address': {'line1': '456 Care House', 'city': 'Leeds', 'postcode': 'LS1 2AB'}, 'status': 'active',
-     'bank_details': {'account_name': 'CareStaff Solutions', 'account_number': '87654321', 'sort_code': '40-00-00'},
+     'address': constant({'line1': '456 Care House', 'city': 'Leeds', 'postcode': 'LS1 2AB'}), 'status': 'active',
+     'bank_details': constant({'account_name': 'CareStaff Solutions', 'account_number': '87654321', 'sort_code': '40-00-00'}),
      'dbs_check_expiry_alerts': True, 'mandatory_training_reminders': False, 'document_expiry_warnings': False,
      'auto_approve_timesheets': True, 'sms_shift_confirmations': False, 'whatsapp_notifications': False,
      'auto_generate_invoices': False, 'send_payment_reminders': False, 'email_notifications': True,
      'sms_notifications': False, 'whatsapp_global_notifications': False, 'payment_terms_days': 14, 'invoice_frequency': 'monthly'}
 ]
-for a in agencies_data:
-    ids['agencies'].append(a['id'])
-    cols = ', '.join(a.keys())
-    vals = ', '.join([sql_val(v) for v in a.values()])
-    sql.append(f"INSERT INTO agencies ({cols}) VALUES ({vals});")
-sql.append("")
+
+STAFF_ROLES = ['nurse', 'healthcare_assistant', 'senior_care_worker', 'nurse', 'healthcare_assistant']
+
+# jsonb values every row shares, serialized once (seedgen.encoders.constant)
+ROLE_HIERARCHY = {role: constant({'can_work_as': [role]}) for role in STAFF_ROLES}
+EMPLOYMENT_HISTORY = constant([{'employer': 'Previous Care Home', 'duration': '2 years'}])
+STAFF_SKILLS = constant(['First Aid', 'Manual Handling'])
+STAFF_AVAILABILITY = constant({'monday': [{'start': '08:00', 'end': '20:00'}], 'tuesday': [{'start': '08:00', 'end': '20:00'}]})
+CLIENT_LOCATION = constant({'latitude': 54.9783, 'longitude': -1.6174})
+INTERNAL_LOCATIONS = constant(['Room 1', 'Room 2', 'Room 3', 'Wing A', 'Wing B'])
+CONTRACT_TERMS = constant({'require_location_specification': True, 'break_duration_minutes': 30, 'rates_by_role': {
+    'nurse': {'pay_rate': 20, 'charge_rate': 30}, 'healthcare_assistant': {'pay_rate': 12, 'charge_rate': 18},
+    'senior_care_worker': {'pay_rate': 16, 'charge_rate': 24}}})
+
+# The tables this stage generates, in foreign-key order (the auth ones only with logins)
+AGENCY_TABLES = ('auth.users', 'auth.identities', 'agencies', 'profiles', 'staff', 'clients')
+LOGIN_TABLES = ('auth.users', 'auth.identities', 'profiles', 'staff')
+
+_STAFF = {column: i for i, column in enumerate(COLUMNS['staff'])}
+
+
+# 1. AGENCIES (2 per scale unit)
+def gen_agencies(ids, start, stop):
+    for unit in range(start, stop):
+        for k, template in enumerate(AGENCY_TEMPLATES):
+            seed_entity('agencies', unit * len(AGENCY_TEMPLATES) + k)
+            a = {'id': gen_uuid(), **template}
+            if unit > 0:
+                a['name'] = f"{template['name']} #{unit + 1}"
+                a['registration_number'] = f"GB{random.randint(10000000, 99999999)}"
+            ids['agencies'].append(a['id'])
+            yield tuple(a[col] for col in COLUMNS['agencies'])
+
 
 # 2. PROFILES (Admin users - note: profiles.id must match auth.users.id in real system)
-sql.append("-- 2. PROFILES (4 admin/manager users)")
-sql.append("-- Note: In production, these should match auth.users.id")
-for i, agency_id in enumerate(ids['agencies']):
-    # Admin
-    admin_id = gen_uuid()
-    ids['profiles'].append(admin_id)
-    sql.append(f"""INSERT INTO profiles (id, full_name, email, phone, user_type, agency_id, created_date, role, profile_photo_url)
-VALUES ({sql_val(admin_id)}, {sql_val(f"Admin User {i+1}")}, {sql_val(f"admin{i+1}@agency{i+1}.com")}, {sql_val(gen_phone())}, 
-'agency_admin', {sql_val(agency_id)}, {sql_val(gen_ts_ago(60))}, 'admin', 'https://ui-avatars.com/api/?name=Admin');""")
-    # Manager
-    mgr_id = gen_uuid()
-    ids['profiles'].append(mgr_id)
-    sql.append(f"""INSERT INTO profiles (id, full_name, email, phone, user_type, agency_id, created_date, role, profile_photo_url)
-VALUES ({sql_val(mgr_id)}, {sql_val(f"Manager User {i+1}")}, {sql_val(f"manager{i+1}@agency{i+1}.com")}, {sql_val(gen_phone())}, 
-'manager', {sql_val(agency_id)}, {sql_val(gen_ts_ago(60))}, 'user', 'https://ui-avatars.com/api/?name=Manager');""")
-sql.append("")
-
-# 3. STAFF (10 staff - 5 per agency)
-sql.append("-- 3. STAFF (10 records - 5 per agency)")
-staff_roles = ['nurse', 'healthcare_assistant', 'senior_care_worker', 'nurse', 'healthcare_assistant']
-for agency_id in ids['agencies']:
-    for i, role in enumerate(staff_roles):
-        staff_id = gen_uuid()
-        ids['staff'].append(staff_id)
-        fn = random.choice(UK_FIRST_NAMES_FEMALE if i % 2 == 0 else UK_FIRST_NAMES_MALE)
-        ln = random.choice(UK_LAST_NAMES)
-        is_nurse = role == 'nurse'
-        sql.append(f"""INSERT INTO staff (id, agency_id, first_name, last_name, email, phone, role, employment_type, status, hourly_rate, 
-created_by, whatsapp_pin, whatsapp_number_verified, date_of_birth, profile_photo_url, 
-nmc_pin, medication_trained, medication_training_expiry, can_work_as_senior, role_hierarchy,
-employment_history, references, skills, gps_consent, last_known_location, date_joined, months_of_experience,
-address, emergency_contact, availability, rating, total_shifts_completed, gps_consent_date, created_date, updated_date)
-VALUES ({sql_val(staff_id)}, {sql_val(agency_id)}, {sql_val(fn)}, {sql_val(ln)}, {sql_val(gen_email(fn, ln))}, {sql_val(gen_phone())},
-{sql_val(role)}, 'temporary', 'active', {random.randint(12, 25)},
-{sql_val(f"admin@agency.com")}, {sql_val(str(random.randint(1000, 9999)))}, {sql_val(gen_phone())}, {sql_val(gen_date_ago(365*30))}, 
-'https://ui-avatars.com/api/?name={fn}+{ln}',
-{sql_val(f"NMC{random.randint(100000, 999999)}" if is_nurse else None)}, {sql_val(is_nurse)}, 
-{sql_val(gen_date_future(365) if is_nurse else None)}, {sql_val(role == 'senior_care_worker')},
-{sql_val({'can_work_as': [role]})},
-{sql_val([{'employer': 'Previous Care Home', 'duration': '2 years'}])}, {sql_val([{'name': 'Jane Ref', 'phone': gen_phone()}])},
-{sql_val(['First Aid', 'Manual Handling'])}, true, {sql_val({'latitude': 54.9783 + random.uniform(-0.1, 0.1), 'longitude': -1.6174 + random.uniform(-0.1, 0.1), 'timestamp': gen_ts_ago(1)})},
-{sql_val(gen_date_ago(365))}, {random.randint(6, 60)}, {sql_val(gen_address())},
-{sql_val({'name': 'Emergency Contact', 'relationship': 'Spouse', 'phone': gen_phone()})},
-{sql_val({'monday': [{'start': '08:00', 'end': '20:00'}], 'tuesday': [{'start': '08:00', 'end': '20:00'}]})},
-{random.uniform(4.0, 5.0):.1f}, {random.randint(5, 50)}, {sql_val(gen_ts_ago(100))}, {sql_val(gen_ts_ago(100))}, {sql_val(gen_ts_ago(1))});""")
-sql.append("")
-
-# 4. CLIENTS (6 care homes - 3 per agency)
-sql.append("-- 4. CLIENTS (6 care homes - 3 per agency)")
-home_names_idx = 0
-for agency_id in ids['agencies']:
-    for i in range(3):
-        client_id = gen_uuid()
-        ids['clients'].append(client_id)
-        home_name = CARE_HOME_NAMES[home_names_idx]
-        home_names_idx += 1
-        beds = random.choice([38, 45, 52, 60])
-        sql.append(f"""INSERT INTO clients (id, agency_id, name, type, status, created_by, location_coordinates, geofence_enabled,
-contact_person, billing_email, address, cqc_rating, bed_capacity, preferred_staff, notes, total_bookings,
-internal_locations, payment_terms, contract_terms, rating, geofence_radius_meters, created_date, updated_date)
-VALUES ({sql_val(client_id)}, {sql_val(agency_id)}, {sql_val(home_name)}, 'care_home', 'active', 'admin@agency.com',
-{sql_val({'latitude': 54.9783, 'longitude': -1.6174})}, true,
-{sql_val({'name': 'Care Manager', 'email': f"manager@{home_name.lower().replace(' ', '')}.com", 'phone': gen_phone(), 'role': 'Manager'})},
-{sql_val(f"billing@{home_name.lower().replace(' ', '')}.com")}, {sql_val(gen_address())},
-{sql_val(random.choice(['good', 'outstanding']))}, {beds}, {sql_val([ids['staff'][0] if ids['staff'] else None])},
-'Preferred care home with excellent facilities', {random.randint(10, 100)},
-{sql_val(['Room 1', 'Room 2', 'Room 3', 'Wing A', 'Wing B'])}, 'net_30',
-{sql_val({'require_location_specification': True, 'break_duration_minutes': 30, 'rates_by_role': {
-    'nurse': {'pay_rate': 20, 'charge_rate': 30}, 'healthcare_assistant': {'pay_rate': 12, 'charge_rate': 18}, 
-    'senior_care_worker': {'pay_rate': 16, 'charge_rate': 24}}})},
-{random.uniform(4.2, 4.9):.1f}, 100, {sql_val(gen_ts_ago(90))}, {sql_val(gen_ts_ago(1))});""")
-sql.append("")
-
-print(f"Generated agencies: {len(ids['agencies'])}")
-print(f"Generated profiles: {len(ids['profiles'])}")
-print(f"Generated staff: {len(ids['staff'])}")
-print(f"Generated clients: {len(ids['clients'])}")
-
-# Save Part 1
-with open('supabase/seed_data.sql', 'w', encoding='utf-8') as f:
-    f.write('\n'.join(sql))
-
-# Save ID manifest
-with open('SEED_DATA_MANIFEST.json', 'w', encoding='utf-8') as f:
-    json.dump(ids, f, indent=2)
-
-print(f"\n[OK] Generated seed data saved to: supabase/seed_data.sql")
-print(f"[OK] ID manifest saved to: SEED_DATA_MANIFEST.json")
-print(f"\nNext: Run the SQL file in Supabase SQL Editor or continue generating more data...")
+def gen_profiles(ids, first_agency=0):
+    for i, agency_id in enumerate(ids['agencies'], first_agency):
+        # Admin
+        seed_entity('profiles', 2 * i)
+        admin_id = gen_uuid()
+        ids['profiles'].append(admin_id)
+        yield (admin_id, f"Admin User {i+1}", f"admin{i+1}@agency{i+1}.com", gen_phone(),
+               'agency_admin', agency_id, gen_ts_ago(60), 'admin', 'https://ui-avatars.com/api/?name=Admin')
+        # Manager
+        seed_entity('profiles', 2 * i + 1)
+        mgr_id = gen_uuid()
+        ids['profiles'].append(mgr_id)
+        yield (mgr_id, f"Manager User {i+1}", f"manager{i+1}@agency{i+1}.com", gen_phone(),
+               'manager', agency_id, gen_ts_ago(60), 'user', 'https://ui-avatars.com/api/?name=Manager')
+
+
+# 3. STAFF (5 per agency)
+def gen_staff(ids, first_agency=0):
+    for a, agency_id in enumerate(ids['agencies'], first_agency):
+        for i, role in enumerate(STAFF_ROLES):
+            seed_entity('staff', a * len(STAFF_ROLES) + i)
+            staff_id = gen_uuid()
+            ids['staff'].append(staff_id)
+            yield staff_row(staff_id, agency_id, i, role)
+
+
+def staff_row(staff_id, agency_id, i, role):
+    """One staff member's row; `i` is their slot at the agency (even slots get female first names)."""
+    fn = random.choice(UK_FIRST_NAMES_FEMALE if i % 2 == 0 else UK_FIRST_NAMES_MALE)
+    ln = random.choice(UK_LAST_NAMES)
+    is_nurse = role == 'nurse'
+    return (staff_id, agency_id, fn, ln, gen_email(fn, ln), gen_phone(),
+            role, 'temporary', 'active', random.randint(12, 25),
+            "admin@agency.com", str(random.randint(1000, 9999)), gen_phone(), gen_date_ago(365*30),
+            f'https://ui-avatars.com/api/?name={fn}+{ln}',
+            f"NMC{random.randint(100000, 999999)}" if is_nurse else None, is_nurse,
+            gen_date_future(365) if is_nurse else None, role == 'senior_care_worker',
+            ROLE_HIERARCHY[role],
+            EMPLOYMENT_HISTORY, [{'name': 'Jane Ref', 'phone': gen_phone()}],
+            STAFF_SKILLS, True, {'latitude': 54.9783 + random.uniform(-0.1, 0.1), 'longitude': -1.6174 + random.uniform(-0.1, 0.1), 'timestamp': gen_ts_ago(1)},
+            gen_date_ago(365), random.randint(6, 60), gen_address(),
+            {'name': 'Emergency Contact', 'relationship': 'Spouse', 'phone': gen_phone()},
+            STAFF_AVAILABILITY,
+            round(random.uniform(4.0, 5.0), 1), random.randint(5, 50), gen_ts_ago(100), gen_ts_ago(100), gen_ts_ago(1),
+            None)
+
+
+# 4. CLIENTS (3 care homes per agency)
+def gen_clients(ids, first_client=0):
+    home_names_idx = first_client
+    for agency_id in ids['agencies']:
+        for i in range(3):
+            seed_entity('clients', home_names_idx)
+            client_id = gen_uuid()
+            ids['clients'].append(client_id)
+            home_name = CARE_HOME_NAMES[home_names_idx % len(CARE_HOME_NAMES)]
+            if home_names_idx >= len(CARE_HOME_NAMES):
+                home_name = f"{home_name} {home_names_idx // len(CARE_HOME_NAMES) + 1}"
+            home_names_idx += 1
+            beds = random.choice([38, 45, 52, 60])
+            yield (client_id, agency_id, home_name, 'care_home', 'active', 'admin@agency.com',
+                   CLIENT_LOCATION, True,
+                   {'name': 'Care Manager', 'email': f"manager@{home_name.lower().replace(' ', '')}.com", 'phone': gen_phone(), 'role': 'Manager'},
+                   f"billing@{home_name.lower().replace(' ', '')}.com", gen_address(),
+                   random.choice(['good', 'outstanding']), beds, [ids['staff'][0] if ids['staff'] else None],
+                   'Preferred care home with excellent facilities', random.randint(10, 100),
+                   INTERNAL_LOCATIONS, 'net_30', CONTRACT_TERMS,
+                   round(random.uniform(4.2, 4.9), 1), 100, gen_ts_ago(90), gen_ts_ago(1))
+
+
+# NumPy backend (--backend numpy): the generators above, one column at a
+# time for all of a shard's agencies, as Blocks (seedgen.encoders). Staff
+# and clients come placed for the `geography`.
+def batch_agencies(ids, start, stop):
+    per_unit = len(AGENCY_TEMPLATES)
+    c = Columns('agencies', start * per_unit, (stop - start) * per_unit)
+    agency_ids = c.uuids()
+    ids['agencies'].extend(agency_ids)
+    names, numbers = [template['name'] for template in AGENCY_TEMPLATES], c.integers(10000000, 99999999)
+    columns = {column: Repeat(template[column] for template in AGENCY_TEMPLATES) for column in AGENCY_TEMPLATES[0]}
+    columns.update(
+        id=agency_ids,
+        # Unit 0 keeps the templates' names and registration numbers
+        name=[f"{names[k % per_unit]} #{k // per_unit + 1}" if k >= per_unit else names[k]
+              for k in range(start * per_unit, stop * per_unit)],
+        registration_number=[f"GB{number}" if k >= per_unit else AGENCY_TEMPLATES[k]['registration_number']
+                             for k, number in enumerate(numbers, start * per_unit)],
+    )
+    return Block('agencies', len(agency_ids), columns)
+
+
+def batch_profiles(ids, first_agency=0):
+    agencies = ids['agencies']
+    c = Columns('profiles', 2 * first_agency, 2 * len(agencies))
+    profile_ids = c.uuids()
+    ids['profiles'].extend(profile_ids)
+    numbers = range(first_agency + 1, first_agency + len(agencies) + 1)
+    return Block('profiles', len(profile_ids), {
+        'id': profile_ids, 'full_name': [name for i in numbers for name in (f"Admin User {i}", f"Manager User {i}")],
+        'email': [email for i in numbers for email in (f"admin{i}@agency{i}.com", f"manager{i}@agency{i}.com")],
+        'phone': c.phones(), 'user_type': Repeat(['agency_admin', 'manager']),
+        'agency_id': [agency_id for agency_id in agencies for _ in range(2)], 'created_date': c.timestamps_ago(60),
+        'role': Repeat(['admin', 'user']),
+        'profile_photo_url': Repeat(['https://ui-avatars.com/api/?name=Admin', 'https://ui-avatars.com/api/?name=Manager']),
+    })
+
+
+def batch_staff(ids, first_agency=0, geography='newcastle'):
+    per_agency = len(STAFF_ROLES)
+    agencies = ids['agencies']
+    c = Columns('staff', first_agency * per_agency, per_agency * len(agencies))
+    staff_ids = c.uuids()
+    ids['staff'].extend(staff_ids)
+    female, male, last_names = c.choice(UK_FIRST_NAMES_FEMALE), c.choice(UK_FIRST_NAMES_MALE), c.choice(UK_LAST_NAMES)
+    first_names = [name if k % per_agency % 2 == 0 else other for k, (name, other) in enumerate(zip(female, male))]
+    nurse = [role == 'nurse' for role in STAFF_ROLES] * len(agencies)
+    phone, hourly_rate, pin, mobile, date_of_birth = c.phones(), c.integers(12, 25), c.integers(1000, 9999), c.phones(), c.dates_ago(365*30)
+    nmc, nmc_expiry, referee_phone = c.integers(100000, 999999), c.dates_future(365), c.phones()
+    latitude, longitude = (c.uniform_array(-0.1, 0.1) + 54.9783).tolist(), (c.uniform_array(-0.1, 0.1) - 1.6174).tolist()
+    if geography != 'newcastle':
+        latitude, longitude = map(list, zip(*map(geo.staff_location, staff_ids, latitude, longitude)))
+    return Block('staff', len(staff_ids), {
+        'id': staff_ids, 'agency_id': [agency_id for agency_id in agencies for _ in range(per_agency)],
+        'first_name': first_names, 'last_name': last_names,
+        'email': list(map('{}.{}@gmail.com'.format, map(str.lower, first_names), map(str.lower, last_names))),
+        'phone': phone, 'role': Repeat(STAFF_ROLES), 'employment_type': Same('temporary'), 'status': Same('active'),
+        'hourly_rate': hourly_rate, 'created_by': Same("admin@agency.com"), 'whatsapp_pin': list(map(str, pin)),
+        'whatsapp_number_verified': mobile, 'date_of_birth': date_of_birth,
+        'profile_photo_url': list(map('https://ui-avatars.com/api/?name={}+{}'.format, first_names, last_names)),
+        'nmc_pin': [f"NMC{number}" if is_nurse else None for number, is_nurse in zip(nmc, nurse)],
+        'medication_trained': nurse, 'medication_training_expiry': [day if is_nurse else None for day, is_nurse in zip(nmc_expiry, nurse)],
+        'can_work_as_senior': Repeat(role == 'senior_care_worker' for role in STAFF_ROLES),
+        'role_hierarchy': Repeat(ROLE_HIERARCHY[role] for role in STAFF_ROLES), 'employment_history': Same(EMPLOYMENT_HISTORY),
+        'references': Json(json_arrays(json_objects(name='Jane Ref', phone=referee_phone))), 'skills': Same(STAFF_SKILLS),
+        'gps_consent': Same(True),
+        'last_known_location': Json(json_objects(latitude=latitude, longitude=longitude, timestamp=c.timestamps_ago(1))),
+        'date_joined': c.dates_ago(365), 'months_of_experience': c.integers(6, 60), 'address': Json(c.addresses()),
+        'emergency_contact': Json(json_objects(name='Emergency Contact', relationship='Spouse', phone=c.phones())),
+        'availability': Same(STAFF_AVAILABILITY), 'rating': c.uniform(4.0, 5.0, 1), 'total_shifts_completed': c.integers(5, 50),
+        'gps_consent_date': c.timestamps_ago(100), 'created_date': c.timestamps_ago(100), 'updated_date': c.timestamps_ago(1),
+        'user_id': Same(None),
+    })
+
+
+def batch_clients(ids, first_client=0, geography='newcastle'):
+    n = 3 * len(ids['agencies'])
+    c = Columns('clients', first_client, n)
+    client_ids = c.uuids()
+    ids['clients'].extend(client_ids)
+    home_names = [CARE_HOME_NAMES[k % len(CARE_HOME_NAMES)] if k < len(CARE_HOME_NAMES) else
+                  f"{CARE_HOME_NAMES[k % len(CARE_HOME_NAMES)]} {k // len(CARE_HOME_NAMES) + 1}"
+                  for k in range(first_client, first_client + n)]
+    domains = [name.lower().replace(' ', '') for name in home_names]
+    if geography == 'newcastle':
+        location, radius = Same(CLIENT_LOCATION), Same(100)
+    else:
+        latitude, longitude, radius = map(list, zip(*[geo.client_site(client_id, geography) for client_id in client_ids]))
+        location = Json(json_objects(latitude=latitude, longitude=longitude))
+    contact = json_objects(name='Care Manager', email=list(map('manager@{}.com'.format, domains)), phone=c.phones(),
+                           role='Manager')
+    return Block('clients', n, {
+        'id': client_ids, 'agency_id': [agency_id for agency_id in ids['agencies'] for _ in range(3)], 'name': home_names,
+        'type': Same('care_home'), 'status': Same('active'), 'created_by': Same('admin@agency.com'),
+        'location_coordinates': location, 'geofence_enabled': Same(True), 'contact_person': Json(contact),
+        'billing_email': list(map('billing@{}.com'.format, domains)), 'address': Json(c.addresses()),
+        'cqc_rating': c.choice(['good', 'outstanding']), 'bed_capacity': c.choice([38, 45, 52, 60]),
+        'preferred_staff': Same([ids['staff'][0] if ids['staff'] else None]),
+        'notes': Same('Preferred care home with excellent facilities'), 'total_bookings': c.integers(10, 100),
+        'internal_locations': Same(INTERNAL_LOCATIONS), 'payment_terms': Same('net_30'), 'contract_terms': Same(CONTRACT_TERMS),
+        'rating': c.uniform(4.2, 4.9, 1), 'geofence_radius_meters': radius, 'created_date': c.timestamps_ago(90),
+        'updated_date': c.timestamps_ago(1),
+    })
+
+
+# Logins (--auth-users): every admin/manager profile and staff member signs in as the auth user with its own ID
+def with_logins(profile_rows, staff_rows, first_agency=0, emails=None):
+    """Return (logins, profile rows plus a profile per staff member, staff rows linked to their users).
+
+    The staff sign in with their own email, tagged with their agency and slot (auth.staff_email()) to
+    keep it unique, or with the given `emails`; the staff row and profile carry the same address.
+    """
+    logins = [(profile[0], profile[2], profile[1], profile[6]) for profile in profile_rows]
+    staff_profiles, linked_staff = [], []
+    for n, row in enumerate(staff_rows):
+        staff_id = row[_STAFF['id']]
+        email = emails[n] if emails is not None else \
+            auth.staff_email(row[_STAFF['email']], first_agency + n // len(STAFF_ROLES), n % len(STAFF_ROLES))
+        full_name = f"{row[_STAFF['first_name']]} {row[_STAFF['last_name']]}"
+        created = row[_STAFF['created_date']]
+        logins.append((staff_id, email, full_name, created))
+        staff_profiles.append((staff_id, full_name, email, row[_STAFF['phone']], 'staff_member', row[_STAFF['agency_id']],
+                               created, 'user', row[_STAFF['profile_photo_url']]))
+        linked = list(row)
+        linked[_STAFF['email']], linked[_STAFF['user_id']] = email, staff_id
+        linked_staff.append(tuple(linked))
+    return logins, profile_rows + staff_profiles, linked_staff
+
+
+def batch_logins(profiles, staff, first_agency=0):
+    """with_logins() for the profile and staff Blocks of batch_profiles() and batch_staff()."""
+    staff_ids, full_names = staff.values('id'), list(map('{} {}'.format, staff.values('first_name'), staff.values('last_name')))
+    per_agency = len(STAFF_ROLES)
+    emails = [auth.staff_email(email, first_agency + n // per_agency, n % per_agency)
+              for n, email in enumerate(staff.values('email'))]
+    created = staff.values('created_date')
+    logins = list(zip(profiles.values('id'), profiles.values('email'), profiles.values('full_name'),
+                      profiles.values('created_date')))
+    logins += zip(staff_ids, emails, full_names, created)
+    staff_profiles = Block('profiles', len(staff), {
+        'id': staff_ids, 'full_name': full_names, 'email': emails, 'phone': staff.columns['phone'],
+        'user_type': Same('staff_member'), 'agency_id': staff.columns['agency_id'], 'created_date': created,
+        'role': Same('user'), 'profile_photo_url': staff.columns['profile_photo_url'],
+    })
+    linked_profiles = Block('profiles', len(profiles) + len(staff), {
+        column: profiles.values(column) + staff_profiles.values(column) for column in COLUMNS['profiles']})
+    return logins, linked_profiles, staff.replace(email=emails, user_id=staff_ids)
+
+
+def write_tables(out, ids, start, stop, backend='python', tables=AGENCY_TABLES, password_hash=None, geography='newcastle'):
+    """Write agencies, profiles, staff and clients for scale units [start, stop), or just those in `tables`;
+    with a `password_hash`, logins for the profiles and staff too, and staff and clients placed by
+    `geography` (seedgen.geo). Return the rows written per table."""
+    units = stop - start
+    if backend == 'python':
+        agencies, profiles, staff, clients = gen_agencies, gen_profiles, gen_staff, gen_clients
+        logged_in = lambda profile_rows, staff_rows, first_agency: with_logins(list(profile_rows), list(staff_rows), first_agency)
+        place_staff = lambda rows: geo.place_staff(rows, COLUMNS['staff'], geography)
+        place_clients = lambda rows: geo.place_clients(rows, COLUMNS['clients'], geography)
+    else:
+        # The batch generators place staff and clients as they draw them
+        agencies, profiles, logged_in = batch_agencies, batch_profiles, batch_logins
+        staff = lambda ids, first_agency: batch_staff(ids, first_agency, geography)
+        clients = lambda ids, first_client: batch_clients(ids, first_client, geography)
+        place_staff = place_clients = lambda rows: rows
+    counts = {}
+    if 'agencies' in tables:
+        counts['agencies'] = out.section(f"-- 1. AGENCIES ({2 * units} records)", 'agencies', agencies(ids, start, stop))
+
+    sections = []
+    profile_header = [f"-- 2. PROFILES ({4 * units} admin/manager users)",
+                      "-- Note: In production, these should match auth.users.id"]
+    profile_rows, staff_rows = (lambda: profiles(ids, 2 * start)), (lambda: staff(ids, 2 * start))
+    if password_hash is not None and any(table in tables for table in LOGIN_TABLES):
+        # The users are written first but made from the profile and staff rows, so those are drawn up front
+        logins, linked_profiles, linked_staff = logged_in(profiles(ids, 2 * start), staff(ids, 2 * start), 2 * start)
+        profile_rows, staff_rows = (lambda: linked_profiles), (lambda: linked_staff)
+        profile_header = f"-- 2. PROFILES ({4 * units} admin/manager + {10 * units} staff users)"
+        sections += [
+            ('auth.users', f"-- 1b. AUTH USERS ({14 * units} logins, one per profile)", lambda: auth.user_rows(logins, password_hash)),
+            ('auth.identities', f"-- 1c. AUTH IDENTITIES ({14 * units} email logins)", lambda: auth.identity_rows(logins)),
+        ]
+    sections += [
+        ('profiles', profile_header, profile_rows),
+        ('staff', f"-- 3. STAFF ({10 * units} records - 5 per agency)", lambda: place_staff(staff_rows())),
+        ('clients', f"-- 4. CLIENTS ({6 * units} care homes - 3 per agency)", lambda: place_clients(clients(ids, 6 * start))),
+    ]
+    for table, header, rows in sections:
+        if table in tables:
+            counts[table] = out.section(header, table, rows())
+    return counts
+
+
+def save_ids(manifest, ids):
+    for table in AGENCY_TABLES:
+        if table in MANIFEST_TABLES:
+            manifest[table].extend(ids[table])
+
+
+def generate_shard(job):
+    """Process-pool worker: write one shard of units and return the IDs it created."""
+    ids = new_manifest()
+    out = open_output(job['format'], job['path'], append=job['append'], compression=job['compress'],
+                      batch_size=job['batch_size'], transactions=job['transactions'])
+    write_tables(out, ids, job['start'], job['stop'], job['backend'], password_hash=job['password_hash'],
+                 geography=job['geography'])
+    out.close()
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate agencies, profiles, staff and clients seed data')
+    parser.add_argument('--scale', type=int, default=1, help='Scale factor: every table grows N times (default: 1)')
+    parser.add_argument('--format', choices=FORMATS, default='insert', help='Output format (default: insert)')
+    parser.add_argument('--output', help='SQL output file (.gz/.zst compress), or directory for csv (default: supabase/seed_data.sql, supabase/seed_csv)')
+    parser.add_argument('--batch-size', type=int, default=1, help='insert format: rows per INSERT statement (default: 1)')
+    parser.add_argument('--transactions', action='store_true', help='insert format: wrap each INSERT batch in BEGIN/COMMIT')
+    parser.add_argument('--compress', choices=('auto',) + COMPRESSIONS, default='auto', help='Output compression (default: from extension)')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST,
+                        help=f'ID manifest: binary store directory, or a .json file (default: {DEFAULT_MANIFEST})')
+    parser.add_argument('--workers', type=int, default=1, help='Generate agency shards across N processes (default: 1)')
+    parser.add_argument('--shard-units', type=int, default=DEFAULT_SHARD_UNITS,
+                        help=f'Scale units per shard; part of the output layout, keep it fixed when comparing seeded runs (default: {DEFAULT_SHARD_UNITS})')
+    parser.add_argument('--backend', choices=BACKENDS, default='python', help='python, or numpy to draw whole columns at once (default: python)')
+    parser.add_argument('--seed', type=int, help='Make the output reproducible: same seed and scale, same bytes')
+    parser.add_argument('--as-of', type=datetime.fromisoformat,
+                        help=f'Date that relative dates count from (default: now, or {rng.DEFAULT_AS_OF.date()} with --seed)')
+    parser.add_argument('--geography', choices=geo.GEOGRAPHIES, default='newcastle',
+                        help='Where clients and staff are: newcastle (one site), or uk (care homes spread over UK cities, '
+                             'varied geofence radii) (default: newcastle)')
+    parser.add_argument('--auth-users', action='store_true', help='Also generate auth.users logins for the profiles and staff')
+    parser.add_argument('--password', default=auth.DEFAULT_PASSWORD,
+                        help=f'--auth-users: the password every login gets (default: {auth.DEFAULT_PASSWORD}; others need bcrypt)')
+    schema.add_arguments(parser)
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error('--scale must be >= 1')
+    if args.batch_size < 1:
+        parser.error('--batch-size must be >= 1')
+    if args.workers < 1:
+        parser.error('--workers must be >= 1')
+    if args.shard_units < 1:
+        parser.error('--shard-units must be >= 1')
+    if args.backend == 'numpy' and not vectorized.available():
+        parser.error("--backend numpy needs the 'numpy' package: pip install numpy")
+    if args.auth_users and args.password != auth.DEFAULT_PASSWORD and not auth.available():
+        parser.error("--password needs the 'bcrypt' package: pip install bcrypt")
+    scale = args.scale
+    rng.configure(args.seed, args.as_of)
+    write = [table for table in AGENCY_TABLES if args.auth_users or table not in AUTH_TABLES]
+    try:
+        schema.check(args, write)
+    except schema.SchemaError as error:
+        sys.exit(f"\n[FAIL] {error}")
+    instrument.start(args, expected_rows(write, scale, logins=args.auth_users))
+    args.output = args.output or default_output(args.format)
+    # Hashed once here and handed to every shard
+    password_hash = auth.password_hash(args.password) if args.auth_users else None
+
+    # IDs are saved shard by shard, so only one shard's worth is ever held in memory
+    manifest = open_manifest(args.manifest, 'w')
+    for table in MANIFEST_TABLES:
+        manifest[table]  # every table gets an (empty) entry up front
+    out = open_output(args.format, args.output, compression=args.compress,
+                      batch_size=args.batch_size, transactions=args.transactions)
+    out.line("-- COMPREHENSIVE SEED DATA - All 15 Tables")
+    out.line(f"-- Generated: {now().isoformat()}")
+    if scale > 1:
+        out.line(f"-- Scale factor: {scale}")
+    if args.seed is not None:
+        out.line(f"-- Seed: {args.seed}")
+    if args.auth_users:
+        for header_line in auth.header_lines(args.password):
+            out.line(header_line)
+    out.line("-- Run this in Supabase SQL Editor\n" if args.format == 'insert' else "-- Run this with psql -f\n")
+
+    shards = unit_shards(scale, args.shard_units)
+    if len(shards) == 1:
+        ids = new_manifest()
+        write_tables(out, ids, 0, scale, args.backend, password_hash=password_hash, geography=args.geography)
+        out.close()
+        save_ids(manifest, ids)
+    else:
+        out.close()
+        # One worker appends each shard straight to the output; a pool writes side files and merges them.
+        # Either way the bytes are the same. The csv table files start empty (the header pass creates none).
+        direct = args.workers == 1
+        jobs = [{'format': args.format, 'path': args.output if direct else shard_path(args.format, args.output, n),
+                 'append': direct and (n > 0 or args.format != 'csv'), 'compress': args.compress,
+                 'batch_size': args.batch_size, 'transactions': args.transactions, 'backend': args.backend,
+                 'password_hash': password_hash, 'geography': args.geography, 'start': start, 'stop': stop}
+                for n, (start, stop) in enumerate(shards)]
+        for shard_ids in run_shards(generate_shard, jobs, args.workers):
+            save_ids(manifest, shard_ids)
+        if not direct:
+            merge_shards(args.format, args.output, [job['path'] for job in jobs], truncate=True)
+            print(f"Merged {len(jobs)} shards from {args.workers} workers")
+
+    instrument.finish()
+    print(f"Generated agencies: {len(manifest['agencies'])}")
+    print(f"Generated profiles: {len(manifest['profiles'])}")
+    print(f"Generated staff: {len(manifest['staff'])}")
+    print(f"Generated clients: {len(manifest['clients'])}")
+
+    # The run's settings go in the manifest too, as generate_seed_data.py records them, for the second stage
+    # and topup_seed_data.py to pick up
+    manifest.meta.update(scale=scale, shard_units=args.shard_units, backend=args.backend, auth_users=args.auth_users)
+    if args.geography != 'newcastle':
+        manifest.meta.update(geography=args.geography)  # where the second stage's timesheets are clocked from
+    if args.seed is not None:
+        manifest.meta.update(seed=args.seed, as_of=rng.settings()[1].isoformat())
+    manifest.close()
+
+    print(f"\n[OK] Generated seed data saved to: {args.output}")
+    print(f"[OK] ID manifest saved to: {args.manifest}")
+    print(f"\nNext: Run the SQL file in Supabase SQL Editor or continue generating more data...")
+
+
+if __name__ == '__main__':
+    main()
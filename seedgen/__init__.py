@@ -0,0 +1,4 @@
+"""
+Shared building blocks for the seed data generators
+(seed_data_generator.py and complete_seed_generator.py).
+"""
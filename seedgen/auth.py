@@ -0,0 +1,96 @@
+"""
+Supabase logins for the seeded profiles and staff: auth.users and
+auth.identities rows that sign in with email and password.
+
+Every admin/manager profile and every staff member gets a user whose ID is
+the profile's or staff member's own ID (profiles.id must match
+auth.users.id; staff.user_id points at it too) and whose email is the
+profile's or staff member's email. Staff emails come from their names, so
+they repeat; with logins they are tagged with the agency and slot
+(staff_email()) to keep auth.users.email unique. All users share one
+password, hashed with bcrypt once per run - hashing is deliberately slow,
+so doing it per user would dominate generation at 100k users.
+
+The rows are plain inserts into auth.users, which would fire the
+on_auth_user_created signup trigger (it rewrites the profile and opens an
+admin workflow per user), so outputs with logins start with SESSION_SETUP:
+replica mode skips triggers, foreign-key checks included, for the load.
+"""
+
+import random
+
+try:
+    import bcrypt
+except ImportError:  # optional dependency
+    bcrypt = None
+
+from seedgen import rng
+from seedgen.encoders import constant
+
+DEFAULT_PASSWORD = 'SeedData123!'
+# bcrypt (cost 10, GoTrue's default) of DEFAULT_PASSWORD, so the default needs no bcrypt install
+DEFAULT_PASSWORD_HASH = '$2a$10$QmnXH8rJkRMsv21qRnUXMumMGsrvIVBydaepRTlJ//JmInFUdDVDe'
+BCRYPT_COST = 10
+
+INSTANCE_ID = '00000000-0000-0000-0000-000000000000'
+APP_META = constant({'provider': 'email', 'providers': ['email']})
+
+SESSION_SETUP = 'SET session_replication_role = replica;'
+
+_SALT_CHARS = './ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+
+
+def available():
+    return bcrypt is not None
+
+
+def header_lines(password):
+    """The lines an output with logins starts with."""
+    return [f"-- Logins: every auth user signs in with password {password}",
+            "-- Replica mode keeps the rows from firing the signup trigger (and skips FK checks) for this session",
+            SESSION_SETUP]
+
+
+def password_hash(password=DEFAULT_PASSWORD):
+    """The bcrypt hash every seeded user gets. Seeded runs derive the salt from the seed, so the
+    hash - and the output - is reproducible."""
+    if password == DEFAULT_PASSWORD:
+        return DEFAULT_PASSWORD_HASH
+    if bcrypt is None:
+        raise RuntimeError("A custom --password needs the 'bcrypt' package: pip install bcrypt")
+    seed = rng.settings()[0]
+    if seed is None:
+        salt = bcrypt.gensalt(BCRYPT_COST, b'2a')
+    else:
+        # 22 salt characters; the last carries only 2 bits, so it is one of '.Oeu'
+        draw = random.Random(f'{seed}:auth.password')
+        chars = ''.join(draw.choice(_SALT_CHARS) for _ in range(21)) + draw.choice('.Oeu')
+        salt = f'$2a${BCRYPT_COST:02d}${chars}'.encode()
+    return bcrypt.hashpw(password.encode(), salt).decode()
+
+
+def staff_email(email, agency_index, slot):
+    """A staff member's `email` tagged with their agency and slot, so their login's address is unique
+    (gen_email's name-based addresses repeat, and auth.users.email is unique)."""
+    local, domain = email.split('@', 1)
+    return f"{local}+agency{agency_index + 1}.staff{slot + 1}@{domain}"
+
+
+def topup_staff_email(email, agency_index, n):
+    """staff_email() for the `n`th staff member added by topup_seed_data.py (apart from the slots staff_email() uses)."""
+    local, domain = email.split('@', 1)
+    return f"{local}+agency{agency_index + 1}.extra{n + 1}@{domain}"
+
+
+def user_rows(logins, hashed):
+    """auth.users rows for (user_id, email, full_name, created) logins."""
+    for user_id, email, full_name, created in logins:
+        yield (INSTANCE_ID, user_id, 'authenticated', 'authenticated', email, hashed, created,
+               APP_META, {'full_name': full_name}, created, created, '', '', '', '')
+
+
+def identity_rows(logins):
+    """auth.identities rows (the email provider) for the same logins."""
+    for user_id, email, full_name, created in logins:
+        yield (user_id, user_id, {'sub': user_id, 'email': email, 'email_verified': True}, 'email',
+               created, created, created)
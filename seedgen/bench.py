@@ -0,0 +1,153 @@
+"""
+Measurements and history for benchmark_seed_data.py.
+
+A benchmark run is a list of cases - one scale factor in one output format -
+each generated in a fresh process so its peak RSS is its own. A case
+records:
+
+    generate    rows, seconds, rows/sec, and per table the rows and the
+                seconds spent in that table's sections (on the python
+                backend that includes drawing the rows; numpy draws a block
+                of units ahead, outside any one section)
+    peak_rss_mb the case process's peak resident set size (None where the
+                platform has no `resource` module, i.e. Windows)
+    bytes       output size, and bytes_per_row
+    filter      rows/sec through insert_seed_data.py's statement filter
+    load        rows/sec loading into Postgres, when a database was given
+
+Runs are appended to a JSON history file. Each run is compared against the
+baseline run (the history's "baseline", else its first run): a case
+regresses when a rate drops, or memory or size grows, by more than the
+threshold.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_HISTORY = 'SEED_BENCHMARKS.json'
+DEFAULT_THRESHOLD = 0.10
+
+# metric path in a case result -> True if higher is better
+METRICS = {
+    ('generate', 'rows_per_sec'): True,
+    ('filter', 'rows_per_sec'): True,
+    ('load', 'rows_per_sec'): True,
+    ('peak_rss_mb',): False,
+    ('bytes_per_row',): False,
+}
+
+
+def peak_rss_mb():
+    """This process's peak RSS in MB, or None if the platform can't tell."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)
+
+
+def rate(rows, seconds):
+    return round(rows / seconds, 1) if seconds else 0.0
+
+
+def output_bytes(path):
+    """Size of an output file, or of every file in a csv output directory."""
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+class TimedOutput:
+    """Pass everything through to `out`, timing and counting each table's sections."""
+
+    def __init__(self, out):
+        self.out = out
+        self.tables = {}  # table -> [rows, seconds]
+
+    def line(self, text=''):
+        self.out.line(text)
+
+    def section(self, header, table, rows):
+        started = time.perf_counter()
+        count = self.out.section(header, table, rows)
+        stats = self.tables.setdefault(table, [0, 0.0])
+        stats[0] += count
+        stats[1] += time.perf_counter() - started
+        return count
+
+    def close(self):
+        self.out.close()
+
+    def table_stats(self):
+        return {table: {'rows': rows, 'seconds': round(seconds, 4), 'rows_per_sec': rate(rows, seconds)}
+                for table, (rows, seconds) in self.tables.items()}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def new_run(settings, label=None):
+    return {'id': datetime.now().strftime('%Y%m%dT%H%M%S'), 'label': label, 'commit': git_commit(),
+            'python': sys.version.split()[0], 'platform': sys.platform, 'settings': settings, 'cases': {}}
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return {'baseline': None, 'runs': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_history(path, history):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp, path)
+
+
+def baseline_run(history, run_id=None):
+    """The run to compare against: `run_id`, else the history's baseline, else its first run."""
+    run_id = run_id or history.get('baseline')
+    for run in history['runs']:
+        if run_id is None or run['id'] == run_id or run.get('label') == run_id:
+            return run
+    return None
+
+
+def _metric(case, path):
+    for key in path:
+        if not isinstance(case, dict) or case.get(key) is None:
+            return None
+        case = case[key]
+    return case
+
+
+def compare(run, baseline, threshold=DEFAULT_THRESHOLD):
+    """(case, metric, baseline value, value, change, regressed) for every metric both runs have."""
+    rows = []
+    for name, case in run['cases'].items():
+        base = baseline['cases'].get(name)
+        if base is None:
+            continue
+        for path, higher_is_better in METRICS.items():
+            old, new = _metric(base, path), _metric(case, path)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regressed = -change > threshold if higher_is_better else change > threshold
+            rows.append((name, '.'.join(path), old, new, change, regressed))
+    return rows
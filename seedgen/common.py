@@ -0,0 +1,61 @@
+"""
+Value helpers shared by the seed generators: UK healthcare reference data,
+random value generators and the SQL literal renderer.
+"""
+
+import json
+import random
+from datetime import timedelta
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+from seedgen.rng import gen_uuid, now
+
+# UK Healthcare Data
+UK_FIRST_NAMES_MALE = ['James', 'John', 'Robert', 'Michael', 'William', 'David', 'Thomas', 'Daniel', 'Matthew', 'Andrew']
+UK_FIRST_NAMES_FEMALE = ['Mary', 'Sarah', 'Emma', 'Jennifer', 'Linda', 'Elizabeth', 'Jessica', 'Karen', 'Rachel', 'Sophie']
+UK_LAST_NAMES = ['Smith', 'Jones', 'Williams', 'Taylor', 'Brown', 'Davies', 'Evans', 'Wilson', 'Thomas', 'Roberts']
+
+UK_CITIES = ['London', 'Manchester', 'Sunderland', 'Newcastle', 'Leeds', 'Birmingham']
+UK_STREETS = ['High Street', 'Station Road', 'Church Lane', 'Main Street', 'Park Road']
+
+CARE_HOME_NAMES = ['Divine Care Center', 'Instay Sunderland', 'Harbor View Lodge', 'Willow Manor', 'Oakwood Residence', 'Sunset Gardens']
+
+MANIFEST_TABLES = ['agencies', 'profiles', 'staff', 'clients', 'shifts', 'bookings', 'timesheets', 'invoices',
+                   'compliance', 'groups', 'admin_workflows', 'payslips']
+
+def new_manifest(): return {table: [] for table in MANIFEST_TABLES}
+
+def gen_email(fn, ln, domain='gmail.com'): return f"{fn.lower()}.{ln.lower()}@{domain}"
+def gen_phone(): return f"+44{random.randint(7000000000, 7999999999)}"
+def gen_postcode(): return f"{random.choice(['TS', 'SR', 'NE'])}{random.randint(1,9)} {random.randint(1,9)}{random.choice('ABDEFGHJLNPQRSTUWXYZ')}{random.choice('ABDEFGHJLNPQRSTUWXYZ')}"
+def gen_date_ago(days): return (now() - timedelta(days=random.randint(0, days))).strftime('%Y-%m-%d')
+def gen_ts_ago(days): return (now() - timedelta(days=random.randint(0, days), hours=random.randint(0, 23))).isoformat()
+def gen_ts_future(days): return (now() + timedelta(days=random.randint(1, days))).isoformat()
+def gen_date_future(days): return (now() + timedelta(days=random.randint(1, days))).strftime('%Y-%m-%d')
+
+class UuidArray(list):
+    """Value for a uuid[] column (plain lists are written as jsonb)."""
+
+
+# JSON text for jsonb values: orjson if installed, else the stdlib encoder set to write the same text
+# (no spaces after `,` and `:`, non-ASCII as is), so the output bytes don't depend on which one is installed
+if orjson is not None:
+    def dumps(v): return orjson.dumps(v).decode()
+else:
+    dumps = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+
+def sql_val(v):
+    if v is None: return 'NULL'
+    if isinstance(v, bool): return 'true' if v else 'false'
+    if isinstance(v, UuidArray): return f"ARRAY[{', '.join(sql_val(x) for x in v)}]::uuid[]"
+    if isinstance(v, (dict, list)): return f"'{dumps(v).replace(chr(39), chr(39)+chr(39))}'::jsonb"
+    if isinstance(v, str): return f"'{v.replace(chr(39), chr(39)+chr(39))}'"
+    return str(v)
+
+def gen_address():
+    return {'line1': f"{random.randint(1,999)} {random.choice(UK_STREETS)}", 'city': random.choice(UK_CITIES), 'postcode': gen_postcode(), 'country': 'UK'}
@@ -0,0 +1,377 @@
+"""
+Per-table row encoders: render a row tuple as one line of INSERT, COPY or
+CSV text.
+
+sql_val / copy_val / csv_val render any single value, working out its type
+with an isinstance chain every time. A row encoder is compiled once per
+(table, encoding) from the column kinds in seedgen.tables.COLUMN_KINDS into
+a function that unpacks the row and renders each column inline:
+
+    jsonb   dict / list values: serialized with seedgen.common.dumps and
+            wrapped for the encoding; values registered with constant() are
+            serialized once and the literal reused for every row sharing them
+    uuid[]  UuidArray values
+    scalar  everything else, rendered by a lookup on the value's exact type
+            (str, bool, int, float, None), with the *_val function as the
+            fallback for anything unusual (a numpy scalar, a Decimal, ...)
+
+A row with the wrong number of values raises ValueError.
+
+block_encoder() renders a whole list of rows to the same lines, a column
+at a time: each column is rendered with one map() over its values, by the
+renderer for the type they all share, and the lines are joined from the
+rendered columns. A column of text that has nothing to escape (checked
+once, on the column joined together) is used as it is.
+
+It also renders a Block: rows held a column at a time, as the numpy
+backend builds them, so they are never put together as tuples only to be
+taken apart again. A Block column is a list of values, or
+
+    Same(value)     one value for every row, rendered once
+    Repeat(values)  one scale unit's values, the same for every unit,
+                    rendered once and repeated
+    Json(texts)     a jsonb column already serialized (seedgen.vectorized.
+                    json_objects), only wrapped for the encoding
+
+seedgen.common.dumps is orjson when it is installed, else the stdlib
+encoder without json.dumps' per-call argument handling, set to the same
+compact separators, so the jsonb text is the same either way.
+"""
+
+import json
+import math
+
+from seedgen.common import UuidArray, dumps, sql_val
+from seedgen.tables import COLUMN_KINDS, COLUMNS
+
+ENCODINGS = ('sql', 'copy', 'csv')
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_SEPARATORS = {'sql': ', ', 'copy': '\t', 'csv': ','}
+_NULLS = {'sql': 'NULL', 'copy': '\\N', 'csv': ''}
+
+_constants = {}  # id -> registered constant (held, so the id stays its own)
+_encoders = {}  # (table, encoding) -> compiled row encoder
+_block_encoders = {}  # (table, encoding) -> block encoder
+
+
+def constant(value):
+    """Mark a dict or list that many rows share (unchanged) as a constant, and return it."""
+    _constants[id(value)] = value
+    return value
+
+
+class Same:
+    """A Block column with one value for every row."""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Repeat:
+    """A Block column whose values are the same for every scale unit: `values` is one unit's rows."""
+    __slots__ = ('values',)
+
+    def __init__(self, values):
+        self.values = list(values)
+
+
+class Json:
+    """A jsonb Block column already serialized: the JSON text, or None for NULL, of every row."""
+    __slots__ = ('texts',)
+
+    def __init__(self, texts):
+        self.texts = texts
+
+    def __len__(self):
+        return len(self.texts)
+
+
+class Block:
+    """`n` rows of `table` held a column at a time: `columns` maps each column to a list of its values, or to a
+    Same, Repeat or Json. Iterating it gives the rows as tuples, in COLUMNS order, for anything that wants them."""
+
+    def __init__(self, table, n, columns):
+        self.table = table
+        self.n = n
+        self.columns = columns
+
+    def __len__(self):
+        return self.n
+
+    def values(self, column):
+        """A column's values as a list, one per row (a Json column's parsed back)."""
+        values = self.columns[column]
+        if type(values) is Same:
+            return [values.value] * self.n
+        if type(values) is Repeat:
+            return values.values * (self.n // len(values.values))
+        if type(values) is Json:
+            return [None if text is None else json.loads(text) for text in values.texts]
+        return values
+
+    def replace(self, **columns):
+        """A Block of the same rows with `columns` replaced (or added)."""
+        return Block(self.table, self.n, {**self.columns, **columns})
+
+    def __iter__(self):
+        return zip(*[self.values(column) for column in COLUMNS[self.table]])
+
+
+def copy_val(v):
+    """Render a value for COPY text format (tab separated, \\N for NULL)."""
+    if v is None: return '\\N'
+    if isinstance(v, bool): return 't' if v else 'f'
+    if isinstance(v, UuidArray): return '{' + ','.join('NULL' if x is None else x for x in v) + '}'
+    if isinstance(v, (dict, list)): return dumps(v).translate(_COPY_ESCAPES)
+    if isinstance(v, str): return v.translate(_COPY_ESCAPES)
+    return str(v)
+
+
+def csv_val(v):
+    """Render a value for COPY CSV format: NULL is an unquoted empty field, text is always quoted."""
+    if v is None: return ''
+    if isinstance(v, bool): return 't' if v else 'f'
+    if isinstance(v, UuidArray): v = '{' + ','.join('NULL' if x is None else x for x in v) + '}'
+    elif isinstance(v, (dict, list)): v = dumps(v)
+    elif not isinstance(v, str): return str(v)
+    return '"' + v.replace('"', '""') + '"'
+
+
+def _sql_text(v):
+    return "'" + v.replace("'", "''") + "'"
+
+
+def _copy_text(v):
+    if '\\' in v or '\t' in v or '\n' in v or '\r' in v:
+        return v.translate(_COPY_ESCAPES)
+    return v
+
+
+def _csv_text(v):
+    return '"' + v.replace('"', '""') + '"'
+
+
+class _Renderers(dict):
+    """value type -> renderer, with `fallback` for the types not listed."""
+
+    def __init__(self, fallback, renderers):
+        super().__init__(renderers)
+        self.fallback = fallback
+
+    def __missing__(self, value_type):
+        return self.fallback
+
+
+SCALARS = {
+    'sql': _Renderers(sql_val, {str: _sql_text, bool: lambda v: 'true' if v else 'false', int: int.__repr__,
+                                float: float.__repr__, type(None): lambda v: 'NULL'}),
+    'copy': _Renderers(copy_val, {str: _copy_text, bool: lambda v: 't' if v else 'f', int: int.__repr__,
+                                  float: float.__repr__, type(None): lambda v: '\\N'}),
+    'csv': _Renderers(csv_val, {str: _csv_text, bool: lambda v: 't' if v else 'f', int: int.__repr__,
+                                float: float.__repr__, type(None): lambda v: ''}),
+}
+
+# JSON text -> the literal for each encoding
+_JSON_LITERALS = {
+    'sql': lambda text: "'" + text.replace("'", "''") + "'::jsonb",
+    'copy': lambda text: text.replace('\\', '\\\\'),  # JSON text has no raw tabs or newlines to escape
+    'csv': _csv_text,
+}
+
+
+def _jsonb_column(encoding):
+    literal_for, null, fallback = _JSON_LITERALS[encoding], _NULLS[encoding], SCALARS[encoding].fallback
+    literals = {}  # id of a registered constant -> its literal
+
+    def render(v):
+        if v is None:
+            return null
+        literal = literals.get(id(v))
+        if literal is None:
+            if type(v) is not dict and type(v) is not list:
+                return fallback(v)
+            literal = literal_for(dumps(v))
+            if id(v) in _constants:
+                literals[id(v)] = literal
+        return literal
+    return render
+
+
+def _uuid_array_column(encoding):
+    return SCALARS[encoding].fallback
+
+
+_COLUMN_RENDERERS = {'jsonb': _jsonb_column, 'uuid[]': _uuid_array_column}
+
+
+def _compile(table, encoding):
+    kinds = COLUMN_KINDS.get(table, {})
+    namespace = {'scalars': SCALARS[encoding]}
+    values = []
+    for k, column in enumerate(COLUMNS[table]):
+        kind = kinds.get(column, 'scalar')
+        if kind == 'scalar':
+            values.append(f'scalars[type(v{k})](v{k})')
+        else:
+            namespace[f'render{k}'] = _COLUMN_RENDERERS[kind](encoding)
+            values.append(f'render{k}(v{k})')
+    names = ''.join(f'v{k}, ' for k in range(len(values)))
+    source = (f"def encode(row):\n"
+              f"    {names}= row\n"
+              f"    return {_SEPARATORS[encoding]!r}.join(({', '.join(values)},))\n")
+    exec(compile(source, f'<{encoding} encoder for {table}>', 'exec'), namespace)
+    return namespace['encode']
+
+
+def row_encoder(table, encoding):
+    """The compiled row -> text function for `table` in `encoding` (sql values, COPY text or CSV)."""
+    key = (table, encoding)
+    if key not in _encoders:
+        _encoders[key] = _compile(table, encoding)
+    return _encoders[key]
+
+
+# A column of str values rendered at once, given the values joined together to look for anything to escape
+def _sql_texts(values, joined):
+    return list(map(_sql_text if "'" in joined else "'{}'".format, values))
+
+
+def _copy_texts(values, joined):
+    if '\\' in joined or '\t' in joined or '\n' in joined or '\r' in joined:
+        return list(map(_copy_text, values))
+    return values
+
+
+def _csv_texts(values, joined):
+    return list(map(_csv_text if '"' in joined else '"{}"'.format, values))
+
+
+_TEXTS = {'sql': _sql_texts, 'copy': _copy_texts, 'csv': _csv_texts}
+
+
+def _scalar_block(encoding):
+    scalars, texts = SCALARS[encoding], _TEXTS[encoding]
+
+    def render(values):
+        types = set(map(type, values))
+        if len(types) == 2 and type(None) in types:  # values and NULLs: render the values at once
+            present = [v for v in values if v is not None]
+            rendered, null = iter(render(present)), scalars[type(None)](None)
+            return [null if v is None else next(rendered) for v in values]
+        if len(types) != 1:
+            return [scalars[type(v)](v) for v in values]
+        value_type = types.pop()
+        if value_type is str:
+            return texts(values, ''.join(values))
+        if value_type is float:
+            # Rates, hours and ratings take few values: render each once (unless there's a zero, as 0.0 and
+            # -0.0 are one key but two texts)
+            distinct = dict.fromkeys(values)
+            if 4 * len(distinct) <= len(values) and 0.0 not in distinct:
+                return list(map(dict(zip(distinct, map(scalars[float], distinct))).__getitem__, values))
+        return list(map(scalars[value_type], values))
+    return render
+
+
+def _mapped_block(column_renderer):
+    def block(encoding):
+        render = column_renderer(encoding)
+
+        def render_all(values):
+            if len(set(map(id, values))) == 1:  # one object throughout, e.g. a constant(): render it once
+                return [render(values[0])] * len(values)
+            return list(map(render, values))
+        return render_all
+    return block
+
+
+# A Json column's texts rendered at once, given them joined together to look for anything to escape
+def _sql_json(texts, joined):
+    return list(map(_JSON_LITERALS['sql'] if "'" in joined else "'{}'::jsonb".format, texts))
+
+
+def _copy_json(texts, joined):
+    return list(map(_JSON_LITERALS['copy'], texts)) if '\\' in joined else texts
+
+
+_JSON_TEXTS = {'sql': _sql_json, 'copy': _copy_json, 'csv': _csv_texts}
+
+
+def _json_block(encoding):
+    texts, null = _JSON_TEXTS[encoding], _NULLS[encoding]
+
+    def render(values):
+        if None not in values:
+            return texts(values, ''.join(values))
+        present = [v for v in values if v is not None]
+        rendered = iter(texts(present, ''.join(present)))
+        return [null if v is None else next(rendered) for v in values]
+    return render
+
+
+_BLOCK_RENDERERS = {'scalar': _scalar_block, 'jsonb': _mapped_block(_jsonb_column),
+                    'uuid[]': _mapped_block(_uuid_array_column)}
+
+
+def _repeated(patterns, join, n):
+    """Rendered Same and Repeat columns (each a unit's texts) joined into one column of `n` rows."""
+    period = math.lcm(*map(len, patterns))
+    return list(map(join, zip(*[pattern * (period // len(pattern)) for pattern in patterns]))) * (n // period)
+
+
+def _compile_block(table, encoding):
+    kinds = COLUMN_KINDS.get(table, {})
+    renderers = [_BLOCK_RENDERERS[kinds.get(column, 'scalar')](encoding) for column in COLUMNS[table]]
+    render_json = _json_block(encoding)
+    join = _SEPARATORS[encoding].join
+
+    def encode_block(block):
+        n = len(block)
+        missing = [column for column in COLUMNS[table] if column not in block.columns]
+        if missing:
+            raise ValueError(f"{table} block has no {', '.join(missing)} column")
+        rendered, run = [], []  # a run of Same and Repeat columns is joined up front, and goes in as one
+        for column, render in zip(COLUMNS[table], renderers):
+            values = block.columns[column]
+            if type(values) is Same:
+                run.append(render([values.value]))
+                continue
+            if type(values) is Repeat:
+                if n % len(values.values):
+                    raise ValueError(f"{table}.{column} repeats every {len(values.values)} rows, not into {n}")
+                run.append(render(values.values))
+                continue
+            if run:
+                rendered.append(_repeated(run, join, n))
+                run = []
+            if len(values) != n:
+                raise ValueError(f"{table}.{column} has {len(values)} values, expected {n}")
+            if type(values) is Json:
+                rendered.append(render_json(values.texts))
+            else:
+                rendered.append(render(values))
+        if run:
+            rendered.append(_repeated(run, join, n))
+        return list(map(join, zip(*rendered)))
+
+    def encode(rows):
+        if type(rows) is Block:
+            return encode_block(rows) if len(rows) else []
+        if not rows:
+            return []
+        widths = set(map(len, rows))
+        if widths != {len(renderers)}:
+            raise ValueError(f"{table} rows have {', '.join(map(str, sorted(widths)))} values, "
+                             f"expected {len(renderers)}")
+        return list(map(join, zip(*[render(values) for render, values in zip(renderers, zip(*rows))])))
+    return encode
+
+
+def block_encoder(table, encoding):
+    """The rows -> [text] function for `table` in `encoding`: row_encoder's lines for a list of rows or a Block."""
+    key = (table, encoding)
+    if key not in _block_encoders:
+        _block_encoders[key] = _compile_block(table, encoding)
+    return _block_encoders[key]
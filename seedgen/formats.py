@@ -0,0 +1,295 @@
+"""
+Output formats for generated rows.
+
+    insert  `INSERT INTO t (cols) VALUES (...);` per row, or multi-row
+            `VALUES (...), (...), ...` batches (Supabase SQL editor)
+    copy    one `COPY t (cols) FROM stdin;` block per table (psql -f)
+    csv     one CSV file per table plus a load.sql of `\\copy` commands
+
+Every format takes rows as tuples in seedgen.tables.COLUMNS order, renders
+the column list once per table rather than once per row, and renders the
+rows with the table's compiled encoder (seedgen.encoders.row_encoder) - or,
+given a list of rows or a seedgen.encoders.Block rather than an iterator, a
+column at a time (seedgen.encoders.block_encoder), to the same text.
+"""
+
+import os
+import pickle
+import tempfile
+from itertools import chain, islice
+
+from seedgen import auth
+from seedgen.encoders import Block, block_encoder, row_encoder
+from seedgen.tables import TABLES, column_list
+from seedgen.writer import SeedWriter
+
+FORMATS = ('insert', 'copy', 'csv')
+SPOOL_MEMORY = 16 << 20  # per table: a spool is held in memory up to this size, then moved to its temporary file
+
+
+def _encoded(table, encoding, rows):
+    """`rows` rendered as lines of text: a list or Block a column at a time, anything else row by row."""
+    if isinstance(rows, (list, Block)):
+        return block_encoder(table, encoding)(rows)
+    return map(row_encoder(table, encoding), rows)
+
+
+def _write_lines(write, lines):
+    """write() each of `lines` with a newline - a list as one chunk - and return how many there were."""
+    if isinstance(lines, list):
+        if lines:
+            write('\n'.join(chain(lines, [''])))  # the last newline without copying the whole text again
+        return len(lines)
+    count = 0
+    for line in lines:
+        write(line + '\n')
+        count += 1
+    return count
+
+
+class InsertOutput:
+    """INSERT statements, the layout the Supabase SQL editor workflow expects.
+
+    With the default batch_size=1 every row is its own statement. Larger
+    batches group rows of a table into `INSERT INTO t (cols) VALUES (...),
+    (...), ...;` statements of up to `batch_size` rows, and `transactions=True`
+    wraps each statement in BEGIN/COMMIT.
+
+    With `spool=True` (and batch_size > 1) rows are rendered and parked per
+    table in temporary files and written on close, so batches can span calls
+    to section() - e.g. the second stage's scale units of 15 shifts each.
+    """
+
+    def __init__(self, path, append=False, compression='auto', spool=False, batch_size=1, transactions=False):
+        if batch_size < 1:
+            raise ValueError('batch_size must be >= 1')
+        self.out = SeedWriter(path, append=append, compression=compression)
+        self.spool_dir = os.path.dirname(os.path.abspath(path))
+        self.spool = spool and batch_size > 1
+        self.batch_size = batch_size
+        self.transactions = transactions
+        self._spools = {}
+
+    def line(self, text=''):
+        self.out.line(text)
+
+    def section(self, header, table, rows):
+        values = _encoded(table, 'sql', rows)
+        if self.spool:
+            return self._spool_values(table, values)
+        for header_line in ([header] if isinstance(header, str) else header):
+            self.out.line(header_line)
+        count = self._write_values(table, values)
+        self.out.line()
+        self.out.flush()
+        return count
+
+    def _write_values(self, table, values):
+        """Write rows already rendered as `v1, v2, ...` text."""
+        count = 0
+        if self.batch_size == 1 and not self.transactions:
+            prefix = f"INSERT INTO {table} ({column_list(table)}) VALUES ("
+            statements = [prefix + row + ');' for row in values] if isinstance(values, list) else \
+                (prefix + row + ');' for row in values)
+            count = _write_lines(self.out.write, statements)
+        else:
+            prefix = f"INSERT INTO {table} ({column_list(table)}) VALUES\n("
+            values = iter(values)
+            while batch := list(islice(values, self.batch_size)):
+                if self.transactions:
+                    self.out.line('BEGIN;')
+                self.out.line(prefix + '),\n('.join(batch) + ');')
+                if self.transactions:
+                    self.out.line('COMMIT;')
+                count += len(batch)
+        self.out.statements_written += count
+        return count
+
+    def _spool_values(self, table, values):
+        if table not in self._spools:
+            self._spools[table] = [tempfile.SpooledTemporaryFile(SPOOL_MEMORY, 'w+b', dir=self.spool_dir), 0]
+        spool = self._spools[table]
+        count = 0
+        values = iter(values)
+        while chunk := list(islice(values, self.batch_size)):
+            pickle.dump(chunk, spool[0], pickle.HIGHEST_PROTOCOL)
+            count += len(chunk)
+        spool[1] += count
+        return count
+
+    @staticmethod
+    def _unspool(fh):
+        fh.seek(0)
+        while True:
+            try:
+                yield from pickle.load(fh)
+            except EOFError:
+                return
+
+    def close(self):
+        for table, (fh, count) in self._spools.items():
+            self.out.line(f"-- {table.upper()} ({count} records)")
+            self._write_values(table, self._unspool(fh))
+            self.out.line()
+            self.out.flush()
+            fh.close()
+        self._spools = {}
+        self.out.close()
+
+
+class CopyOutput:
+    """`COPY ... FROM stdin` blocks, loadable with `psql -f`.
+
+    With `spool=True` rows are collected per table in temporary files next to
+    the output and written as a single COPY block per table on close. That lets
+    a caller interleave tables (e.g. one scale unit at a time) and still get
+    one block per table, without holding more than SPOOL_MEMORY of a table's
+    rows in memory.
+    """
+
+    def __init__(self, path, append=False, compression='auto', spool=False):
+        self.out = SeedWriter(path, append=append, compression=compression)
+        self.spool_dir = os.path.dirname(os.path.abspath(path))
+        self.spool = spool
+        self._spools = {}
+
+    def line(self, text=''):
+        self.out.line(text)
+
+    def section(self, header, table, rows):
+        if self.spool:
+            return self._spool_rows(table, rows)
+        for header_line in ([header] if isinstance(header, str) else header):
+            self.out.line(header_line)
+        self.out.line(f"COPY {table} ({column_list(table)}) FROM stdin;")
+        count = _write_lines(self.out.write, _encoded(table, 'copy', rows))
+        self.out.line('\\.')
+        self.out.line()
+        self.out.statements_written += count
+        self.out.flush()
+        return count
+
+    def _spool_rows(self, table, rows):
+        if table not in self._spools:
+            self._spools[table] = [tempfile.SpooledTemporaryFile(SPOOL_MEMORY, 'w+', encoding='utf-8', dir=self.spool_dir), 0]
+        spool = self._spools[table]
+        count = _write_lines(spool[0].write, _encoded(table, 'copy', rows))
+        spool[1] += count
+        return count
+
+    def close(self):
+        for table, (fh, count) in self._spools.items():
+            fh.seek(0)
+            self.out.line(f"-- {table.upper()} ({count} records)")
+            self.out.line(f"COPY {table} ({column_list(table)}) FROM stdin;")
+            for chunk in iter(lambda: fh.read(1 << 20), ''):
+                self.out.write(chunk)
+            self.out.line('\\.')
+            self.out.line()
+            self.out.statements_written += count
+            self.out.flush()
+            fh.close()
+        self._spools = {}
+        self.out.close()
+
+
+class CsvOutput:
+    """One `<table>.csv` per table in `directory` plus a `load.sql` for psql.
+
+    Tables can be written to in any order and any number of times; load.sql
+    always lists the files present in foreign-key order. Compressed CSVs are
+    loaded through `\\copy ... FROM PROGRAM 'gzip -dc ...'`.
+    """
+
+    def __init__(self, directory, append=False, compression='auto'):
+        if compression == 'auto':
+            compression = 'none'
+        self.directory = directory
+        self.append = append
+        self.compression = compression
+        self.extension = {'none': '.csv', 'gzip': '.csv.gz', 'zstd': '.csv.zst'}[compression]
+        self._files = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def line(self, text=''):
+        pass
+
+    def section(self, header, table, rows):
+        if table not in self._files:
+            path = os.path.join(self.directory, table + self.extension)
+            self._files[table] = SeedWriter(path, append=self.append, compression=self.compression)
+        out = self._files[table]
+        count = _write_lines(out.write, _encoded(table, 'csv', rows))
+        out.statements_written += count
+        out.flush()
+        return count
+
+    def close(self):
+        for out in self._files.values():
+            out.close()
+        self._files = {}
+        write_load_script(self.directory)
+
+
+class FilteredOutput:
+    """Pass the sections of `tables` through to `out` and drain the rest.
+
+    Drained rows are still generated - later tables need the IDs they hand
+    on - but nothing is rendered or written for them. A list or Block
+    has been generated already, so is just dropped.
+    """
+
+    def __init__(self, out, tables):
+        self.out = out
+        self.tables = set(tables)
+
+    def line(self, text=''):
+        self.out.line(text)
+
+    def section(self, header, table, rows):
+        if table in self.tables:
+            return self.out.section(header, table, rows)
+        if not isinstance(rows, (list, Block)):
+            for _ in rows:
+                pass
+        return 0
+
+    def close(self):
+        self.out.close()
+
+
+def write_load_script(directory):
+    """(Re)write `directory`/load.sql with a \\copy for every table CSV present, in foreign-key order."""
+    decompress = {'.csv': None, '.csv.gz': 'gzip -dc', '.csv.zst': 'zstd -dc'}
+    lines = ["-- Load the seed CSVs in foreign-key order. Run from this directory:",
+             "--   psql \"$DATABASE_URL\" -f load.sql",
+             "\\set ON_ERROR_STOP on",
+             "BEGIN;"]
+    if any(name.startswith('auth.users.csv') for name in os.listdir(directory)):
+        lines.append(auth.SESSION_SETUP)
+    for table in TABLES:
+        for extension, program in decompress.items():
+            filename = table + extension
+            if not os.path.exists(os.path.join(directory, filename)):
+                continue
+            source = f"PROGRAM '{program} {filename}'" if program else f"'{filename}'"
+            lines.append(f"\\copy {table} ({column_list(table)}) FROM {source} WITH (FORMAT csv)")
+            break
+    lines.append("COMMIT;")
+    with open(os.path.join(directory, 'load.sql'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def default_output(fmt):
+    return 'supabase/seed_csv' if fmt == 'csv' else 'supabase/seed_data.sql'
+
+
+def open_output(fmt, path, append=False, compression='auto', spool=False, batch_size=1, transactions=False):
+    if fmt == 'insert':
+        return InsertOutput(path, append=append, compression=compression, spool=spool,
+                            batch_size=batch_size, transactions=transactions)
+    if fmt == 'copy':
+        return CopyOutput(path, append=append, compression=compression, spool=spool)
+    if fmt == 'csv':
+        return CsvOutput(path, append=append, compression=compression)
+    raise ValueError(f"Unknown output format '{fmt}' (expected one of {', '.join(FORMATS)})")
@@ -0,0 +1,188 @@
+"""
+Where care homes and staff are, and where staff clock in and out from.
+
+    newcastle   the original layout: every client at one point in Newcastle
+                with a 100m geofence, staff last seen within 0.1 degrees of it
+    uk          clients spread over UK_CITIES, weighted by population, up to
+                CITY_RADIUS_KM from the city centre, with geofences from
+                GEOFENCE_RADII; staff last seen within 0.1 degrees of a city
+
+Placement is a function of the row's ID (a blake2b hash), not a random
+draw, so --geography uk moves the same clients and staff the same way on
+either backend and the rest of every row is unchanged.
+
+locate_timesheets() fills in the GPS columns the clock-in screen and the
+geofence-validator function write (GPS_COLUMNS): where the staff member
+clocked in and out, around the client's site, and how far from it that
+was. Most staff are inside the geofence; STRAY_SHARE of timesheets are
+near its edge, either side, and OFF_SITE_SHARE clock from well outside it,
+so the geofence views, auto-approval and the GPS indicators see both
+outcomes. Each timesheet's positions come from a random.Random seeded
+with its ID, so they are reproducible whenever the timesheet IDs are and
+no other column's draws change.
+"""
+
+import math
+import random
+from bisect import bisect_right
+from hashlib import blake2b
+from itertools import accumulate
+
+GEOGRAPHIES = ('newcastle', 'uk')
+
+NEWCASTLE = (54.9783, -1.6174)
+NEWCASTLE_RADIUS = 100
+
+# city, region, latitude, longitude, population weight (metro area, millions)
+UK_CITIES = [
+    ('London', 'London', 51.5074, -0.1278, 9.0),
+    ('Birmingham', 'West Midlands', 52.4862, -1.8904, 2.9),
+    ('Manchester', 'North West', 53.4808, -2.2426, 2.8),
+    ('Leeds', 'Yorkshire and the Humber', 53.8008, -1.5491, 1.9),
+    ('Glasgow', 'Scotland', 55.8642, -4.2518, 1.7),
+    ('Liverpool', 'North West', 53.4084, -2.9916, 1.4),
+    ('Newcastle', 'North East', 54.9783, -1.6174, 1.1),
+    ('Sheffield', 'Yorkshire and the Humber', 53.3811, -1.4701, 1.0),
+    ('Bristol', 'South West', 51.4545, -2.5879, 0.9),
+    ('Nottingham', 'East Midlands', 52.9548, -1.1581, 0.8),
+    ('Leicester', 'East Midlands', 52.6369, -1.1398, 0.6),
+    ('Edinburgh', 'Scotland', 55.9533, -3.1883, 0.6),
+    ('Cardiff', 'Wales', 51.4816, -3.1791, 0.5),
+    ('Belfast', 'Northern Ireland', 54.5973, -5.9301, 0.5),
+    ('Southampton', 'South East', 50.9097, -1.4044, 0.5),
+    ('Durham', 'North East', 54.7753, -1.5849, 0.1),
+]
+CITY_RADIUS_KM = 15
+GEOFENCE_RADII = (50, 75, 100, 100, 150, 200, 300)
+
+STRAY_SHARE = 0.10
+OFF_SITE_SHARE = 0.05
+MAX_ACCURACY = 50  # metres: the clock-in screen turns away a worse fix
+METRES_PER_DEGREE = 111_320
+EARTH_RADIUS = 6_371_000  # metres, as the geofence-validator function has it
+
+# The timesheets columns locate_timesheets() appends to each row
+GPS_COLUMNS = ('clock_in_location', 'clock_out_location', 'geofence_distance_meters', 'geofence_violation_reason',
+               'clock_out_geofence_validated', 'clock_out_geofence_distance_meters')
+
+_CITY_CDF = list(accumulate(weight for *_, weight in UK_CITIES))
+
+
+def _draws(key, salt, n):
+    """`n` uniform numbers in [0, 1) from the hash of `key`."""
+    digest = blake2b(f'{salt}:{key}'.encode(), digest_size=8 * n).digest()
+    return [int.from_bytes(digest[8 * k:8 * k + 8], 'big') / 2 ** 64 for k in range(n)]
+
+
+def _city(r):
+    return UK_CITIES[min(bisect_right(_CITY_CDF, r * _CITY_CDF[-1]), len(UK_CITIES) - 1)]
+
+
+def offset(latitude, longitude, metres, bearing):
+    """The point `metres` from (latitude, longitude) towards `bearing` (radians from north)."""
+    return (latitude + metres * math.cos(bearing) / METRES_PER_DEGREE,
+            longitude + metres * math.sin(bearing) / (METRES_PER_DEGREE * math.cos(math.radians(latitude))))
+
+
+def distance(a_latitude, a_longitude, b_latitude, b_longitude):
+    """Great-circle distance in metres (haversine), the geofence-validator function's formula."""
+    a_latitude, b_latitude = math.radians(a_latitude), math.radians(b_latitude)
+    h = (math.sin((b_latitude - a_latitude) / 2) ** 2 +
+         math.cos(a_latitude) * math.cos(b_latitude) * math.sin(math.radians(b_longitude - a_longitude) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.atan2(math.sqrt(h), math.sqrt(1 - h))
+
+
+def client_site(client_id, geography='newcastle'):
+    """(latitude, longitude, geofence radius in metres) of a client."""
+    if geography == 'newcastle':
+        return NEWCASTLE + (NEWCASTLE_RADIUS,)
+    pick, spread, bearing, fence = _draws(client_id, 'site', 4)
+    _, _, latitude, longitude, _ = _city(pick)
+    latitude, longitude = offset(latitude, longitude, CITY_RADIUS_KM * 1000 * math.sqrt(spread), 2 * math.pi * bearing)
+    return round(latitude, 6), round(longitude, 6), GEOFENCE_RADII[int(fence * len(GEOFENCE_RADII))]
+
+
+def staff_city(staff_id):
+    """(latitude, longitude) of the city a staff member lives in, for --geography uk."""
+    _, _, latitude, longitude, _ = _city(_draws(staff_id, 'home', 1)[0])
+    return latitude, longitude
+
+
+def staff_location(staff_id, latitude, longitude):
+    """A staff member's Newcastle (latitude, longitude) moved to their city, keeping its jitter."""
+    city_latitude, city_longitude = staff_city(staff_id)
+    return (round(city_latitude + latitude - NEWCASTLE[0], 6),
+            round(city_longitude + longitude - NEWCASTLE[1], 6))
+
+
+def place_staff(rows, columns, geography='newcastle'):
+    """Staff `rows` (in `columns` order) with last_known_location moved to their city, keeping its jitter."""
+    if geography == 'newcastle':
+        return rows
+    ids, located = columns.index('id'), columns.index('last_known_location')
+
+    def placed(row):
+        location = row[located]
+        latitude, longitude = staff_location(row[ids], location['latitude'], location['longitude'])
+        location = {**location, 'latitude': latitude, 'longitude': longitude}
+        return row[:located] + (location,) + row[located + 1:]
+    return map(placed, rows)
+
+
+def place_clients(rows, columns, geography='newcastle'):
+    """Client `rows` (in `columns` order) with location_coordinates and geofence_radius_meters from client_site()."""
+    if geography == 'newcastle':
+        return rows
+    ids, located, fenced = (columns.index(column) for column in ('id', 'location_coordinates', 'geofence_radius_meters'))
+
+    def placed(row):
+        latitude, longitude, radius = client_site(row[ids], geography)
+        row = list(row)
+        row[located], row[fenced] = {'latitude': latitude, 'longitude': longitude}, radius
+        return tuple(row)
+    return map(placed, rows)
+
+
+def _track(rnd, radius):
+    """A draw of how far from the site each of a timesheet's fixes is."""
+    behaviour = rnd.random()
+    if behaviour < OFF_SITE_SHARE:
+        far = rnd.uniform(1.5, 20) * radius
+        return lambda: far * rnd.uniform(0.9, 1.1)
+    if behaviour < OFF_SITE_SHARE + STRAY_SHARE:
+        return lambda: radius * rnd.uniform(0.8, 1.4)
+    return lambda: radius * 0.8 * math.sqrt(rnd.random())
+
+
+def _fix(rnd, latitude, longitude, metres, timestamp):
+    """A clock-in or clock-out location (as the clock-in screen saves it) `metres` from the site."""
+    point_latitude, point_longitude = offset(latitude, longitude, metres, 2 * math.pi * rnd.random())
+    accuracy = rnd.uniform(3, 25) if rnd.random() < 0.9 else rnd.uniform(25, MAX_ACCURACY)
+    return {'latitude': round(point_latitude, 6), 'longitude': round(point_longitude, 6),
+            'accuracy': round(accuracy, 1), 'timestamp': timestamp}
+
+
+def locate_timesheets(rows, columns, geography='newcastle'):
+    """Timesheet `rows` (in `columns` order, without the GPS_COLUMNS) with GPS_COLUMNS appended, and
+    geofence_validated and location_verified set from the clock-in fix, the way the geofence-validator
+    function records them: distances in whole metres, inside when within the client's radius."""
+    at = {column: columns.index(column) for column in
+          ('id', 'client_id', 'clock_in_time', 'clock_out_time', 'geofence_validated', 'location_verified')}
+
+    def located(row):
+        clocked_in, clocked_out = row[at['clock_in_time']], row[at['clock_out_time']]
+        if clocked_in is None:
+            return row + (None,) * len(GPS_COLUMNS)
+        rnd = random.Random(row[at['id']])
+        latitude, longitude, radius = client_site(row[at['client_id']], geography)
+        metres = _track(rnd, radius)
+        fixes = [_fix(rnd, latitude, longitude, metres(), timestamp) for timestamp in (clocked_in, clocked_out)
+                 if timestamp is not None]
+        away = [round(distance(latitude, longitude, fix['latitude'], fix['longitude'])) for fix in fixes]
+        inside = away[0] <= radius
+        row = list(row)
+        row[at['geofence_validated']] = row[at['location_verified']] = inside
+        out = (fixes[1], away[1] <= radius, away[1]) if clocked_out is not None else (None, None, None)
+        return tuple(row) + (fixes[0], out[0], away[0],
+                             None if inside else f"Staff was {away[0]}m away (limit: {radius}m)", out[1], out[2])
+    return map(located, rows)
@@ -0,0 +1,386 @@
+"""
+Opt-in instrumentation for the seed generators: where a slow run's time goes.
+
+    --instrument    per-table and per-helper timers and counters, reported on
+                    stderr at the end:
+                    rows and seconds per table, calls and seconds per helper
+                    (the sql / copy / csv row encoders, JSON serialization,
+                    gen_uuid, seed_entity, the date helpers, numpy column
+                    rendering, file writes), values rendered by type, bytes
+                    written
+    --progress      a live rows / rows-per-sec / ETA line on stderr
+    --profile DIR   a cProfile dump per stage: DIR/<table>.prof covers that
+                    table's sections (generating, rendering and writing its
+                    rows) and DIR/write.prof the spooled output written on
+                    close; read them with `python -m pstats DIR/shifts.prof`
+
+Nothing is wrapped until enable(): it swaps the helpers, wherever the seed
+modules imported them, for timing wrappers, and disable() puts the
+originals back. With instrumentation off the generators call the plain
+functions, so the only cost left is one flag check per shard.
+
+Timers are inclusive wall time, so nested helpers overlap: a row encoder
+includes the JSON serialization it calls, a table's time includes
+everything its rows cost.
+Sections drained by --only (generated for their IDs but not written) are
+not counted. Shards generated in a process pool are instrumented in their
+workers and merged back as each shard finishes.
+"""
+
+import cProfile
+import glob
+import os
+import pstats
+import sys
+from time import perf_counter
+
+enabled = False
+
+PROGRESS_INTERVAL = 0.5  # seconds between progress line updates
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PACKAGE = os.path.dirname(os.path.abspath(__file__))
+
+_settings = {'report': False, 'profile_dir': None}
+_patched = []  # (owner, name, original) to restore
+_helpers = {}  # helper -> [calls, seconds]
+_types = {}  # (row encoder, value type) -> values rendered
+_tables = {}  # table -> [rows, seconds]
+_written = [0]  # characters handed to the writers (the data is ASCII, so bytes before compression)
+_profiles = {}  # stage -> cProfile.Profile
+_snapshots = [0]  # pool worker: shards snapshotted so far (numbers its profile parts)
+_progress = None
+
+
+def _ours(module):
+    """Whether `module` is part of the seed generators (seedgen or the scripts beside it)."""
+    path = getattr(module, '__file__', None)
+    return path is not None and os.path.dirname(os.path.abspath(path)) in (_ROOT, _PACKAGE)
+
+
+def _replace(original, replacement, owners=()):
+    """Bind `replacement` wherever the seed modules (and `owners`) bind `original`."""
+    modules = [module for module in list(sys.modules.values()) if _ours(module)] + list(owners)
+    for module in modules:
+        for name, value in list(vars(module).items()):
+            if value is original:
+                setattr(module, name, replacement)
+                _patched.append((module, name, original))
+
+
+def _patch_method(cls, name, wrap):
+    original = cls.__dict__[name]
+    setattr(cls, name, wrap(original))
+    _patched.append((cls, name, original))
+
+
+def _timer(name):
+    return _helpers.setdefault(name, [0, 0.0])
+
+
+def _timed(name, fn):
+    timer = _timer(name)
+
+    def timed(*args, **kwargs):
+        started = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timer[0] += 1
+            timer[1] += perf_counter() - started
+    return timed
+
+
+def _counted(name, encode):
+    """A row encoder, timed per row, with the values it renders counted by type."""
+    timer = _timer(name)
+
+    def counted(row):
+        for v in row:
+            key = (name, type(v).__name__)
+            _types[key] = _types.get(key, 0) + 1
+        started = perf_counter()
+        try:
+            return encode(row)
+        finally:
+            timer[0] += 1
+            timer[1] += perf_counter() - started
+    return counted
+
+
+def _row_encoder(original):
+    def row_encoder(table, encoding):
+        return _counted(f'{encoding} row encoder', original(table, encoding))
+    return row_encoder
+
+
+def _profiler(stage):
+    if _settings['profile_dir'] is None:
+        return None
+    if stage not in _profiles:
+        _profiles[stage] = cProfile.Profile()
+    return _profiles[stage]
+
+
+def _section(original):
+    def section(self, header, table, rows):
+        stats = _tables.setdefault(table, [0, 0.0])
+        profiler = _profiler(table)
+        started = perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            count = original(self, header, table, rows)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            stats[1] += perf_counter() - started
+        stats[0] += count
+        if _progress is not None:
+            _progress.advance(count)
+        return count
+    return section
+
+
+def _close(original):
+    timer = _timer('close (spooled output)')
+
+    def close(self):
+        profiler = _profiler('write')
+        started = perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            return original(self)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            timer[0] += 1
+            timer[1] += perf_counter() - started
+    return close
+
+
+def _drain(original):
+    timer = _timer('SeedWriter._drain (write)')
+
+    def drain(self):
+        before = self.chars_written
+        started = perf_counter()
+        try:
+            return original(self)
+        finally:
+            timer[0] += 1
+            timer[1] += perf_counter() - started
+            _written[0] += self.chars_written - before
+    return drain
+
+
+def enable(report=True, profile_dir=None):
+    """Start instrumenting: wrap the helpers and output classes (once)."""
+    global enabled
+    _settings.update(report=report, profile_dir=profile_dir)
+    if profile_dir is not None:
+        os.makedirs(profile_dir, exist_ok=True)
+    if enabled:
+        return
+    from seedgen import common, encoders, formats, rng, vectorized
+    from seedgen.writer import SeedWriter
+
+    _replace(encoders.row_encoder, _row_encoder(encoders.row_encoder))
+    _replace(common.dumps, _timed('dumps (JSON)', common.dumps))
+    for name in ('gen_uuid', 'seed_entity'):
+        original = getattr(rng, name)
+        _replace(original, _timed(name, original))
+    for name in ('gen_date_ago', 'gen_ts_ago', 'gen_date_future', 'gen_ts_future'):
+        original = getattr(common, name)
+        _replace(original, _timed(name, original))
+    if vectorized.available():
+        for name in ('uuids', 'dates', 'timestamps'):
+            _patch_method(vectorized.Columns, name, lambda original, name=name: _timed(f'Columns.{name}', original))
+    _patch_method(SeedWriter, '_drain', _drain)
+    for cls in (formats.InsertOutput, formats.CopyOutput, formats.CsvOutput):
+        _patch_method(cls, 'section', _section)
+        _patch_method(cls, 'close', _close)
+    enabled = True
+
+
+def disable():
+    """Put every wrapped helper back."""
+    global enabled, _progress
+    while _patched:
+        owner, name, original = _patched.pop()
+        setattr(owner, name, original)
+    _progress = None
+    enabled = False
+
+
+def reset():
+    """Zero the counters (in place: the wrappers hold on to their timers)."""
+    for timer in _helpers.values():
+        timer[0], timer[1] = 0, 0.0
+    _types.clear()
+    _tables.clear()
+    _written[0] = 0
+    _profiles.clear()
+
+
+# Progress
+
+class Progress:
+    """A `rows done / total, rows/sec, ETA` line, rewritten in place at most every PROGRESS_INTERVAL."""
+
+    def __init__(self, total, stream=None):
+        self.total = total
+        self.done = 0
+        self.stream = stream or sys.stderr
+        self.started = self.shown = perf_counter()
+
+    def advance(self, rows):
+        self.done += rows
+        now = perf_counter()
+        if now - self.shown >= PROGRESS_INTERVAL:
+            self.show(now)
+
+    def show(self, now=None):
+        now = now or perf_counter()
+        self.shown = now
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        percent = 100 * self.done / self.total if self.total else 100
+        eta = _duration((self.total - self.done) / rate) if rate and self.done < self.total else '-'
+        self.stream.write(f"\r  {self.done:,}/{self.total:,} rows ({percent:.0f}%), {rate:,.0f} rows/sec, "
+                          f"ETA {eta}, {_duration(elapsed)} elapsed ")
+        self.stream.flush()
+
+    def finish(self):
+        self.show()
+        self.stream.write('\n')
+
+
+def _duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02d}:{seconds:02d}'
+
+
+def start_progress(total):
+    global _progress
+    if enabled:
+        _progress = Progress(total)
+
+
+# Process pools
+
+def worker_settings():
+    """What a pool worker needs to instrument its shards like this process does."""
+    return dict(_settings)
+
+
+def run_instrumented(settings, worker, job):
+    """Pool worker: run `worker(job)` instrumented; return (result, snapshot) for merge()."""
+    global _progress
+    enable(**settings)
+    reset()  # forked workers start with a copy of the parent's counters
+    _progress = None
+    result = worker(job)
+    return result, snapshot()
+
+
+def snapshot():
+    """This process's counters (and profile dumps) for merging into the parent."""
+    parts = {}
+    _snapshots[0] += 1
+    for stage, profiler in _profiles.items():
+        parts[stage] = os.path.join(_settings['profile_dir'], f'{stage}.part{os.getpid()}-{_snapshots[0]}.prof')
+        profiler.dump_stats(parts[stage])
+    return {'helpers': {name: list(timer) for name, timer in _helpers.items()}, 'types': dict(_types),
+            'tables': {table: list(stats) for table, stats in _tables.items()}, 'written': _written[0],
+            'profiles': parts}
+
+
+def merge(stats):
+    """Add a worker's snapshot() to this process's counters (and progress)."""
+    for name, (calls, seconds) in stats['helpers'].items():
+        timer = _timer(name)
+        timer[0] += calls
+        timer[1] += seconds
+    for key, calls in stats['types'].items():
+        _types[key] = _types.get(key, 0) + calls
+    rows = 0
+    for table, (count, seconds) in stats['tables'].items():
+        table_stats = _tables.setdefault(table, [0, 0.0])
+        table_stats[0] += count
+        table_stats[1] += seconds
+        rows += count
+    _written[0] += stats['written']
+    if _progress is not None:
+        _progress.advance(rows)
+
+
+# Reporting
+
+def dump_profiles():
+    """Write DIR/<stage>.prof for every stage, folding in the pool workers' parts; return the paths."""
+    directory = _settings['profile_dir']
+    stages = set(_profiles)
+    stages.update(os.path.basename(path).split('.part')[0] for path in glob.glob(os.path.join(directory, '*.part*.prof')))
+    paths = []
+    for stage in sorted(stages):
+        parts = sorted(glob.glob(os.path.join(directory, f'{glob.escape(stage)}.part*.prof')))
+        sources = ([_profiles[stage]] if stage in _profiles else []) + parts
+        path = os.path.join(directory, f'{stage}.prof')
+        pstats.Stats(*sources).dump_stats(path)
+        for part in parts:
+            os.remove(part)
+        paths.append(path)
+    return paths
+
+
+def report(stream=None):
+    stream = stream or sys.stderr
+    write = lambda text='': stream.write(text + '\n')
+    write("\nInstrumentation (inclusive wall time; nested helpers overlap):")
+    write(f"  {'table':<34}{'rows':>12}{'seconds':>10}{'rows/sec':>12}")
+    for table, (rows, seconds) in _tables.items():
+        write(f"  {table:<34}{rows:>12,}{seconds:>10.3f}{rows / seconds if seconds else 0:>12,.0f}")
+    write(f"  {'helper':<34}{'calls':>12}{'seconds':>10}{'us/call':>12}")
+    for name, (calls, seconds) in sorted(_helpers.items(), key=lambda item: -item[1][1]):
+        if calls:
+            write(f"  {name:<34}{calls:>12,}{seconds:>10.3f}{1e6 * seconds / calls:>12.2f}")
+    if _types:
+        write("  values rendered, by type:")
+        for (name, type_name), calls in sorted(_types.items(), key=lambda item: -item[1]):
+            write(f"    {f'{name}: {type_name}':<32}{calls:>12,}")
+    rows = sum(count for count, _ in _tables.values())
+    write(f"  {rows:,} rows emitted, {_written[0] / 1e6:,.1f} MB written (before compression)")
+
+
+def add_arguments(parser):
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--instrument', action='store_true',
+                       help='Time and count tables and helpers (row encoders, JSON, gen_uuid, ...) and print a report')
+    group.add_argument('--progress', action='store_true', help='Show a live rows/sec and ETA line on stderr')
+    group.add_argument('--profile', metavar='DIR', help='Write a cProfile dump per stage (DIR/<table>.prof)')
+
+
+def start(args, total_rows):
+    """Turn instrumentation on if any of add_arguments()'s options were given."""
+    if args.instrument or args.progress or args.profile:
+        enable(report=args.instrument, profile_dir=args.profile)
+        if args.progress:
+            start_progress(total_rows)
+
+
+def finish(stream=None):
+    """End the progress line, report and write the profiles, as requested, on stderr; then switch off."""
+    if not enabled:
+        return
+    stream = stream or sys.stderr
+    if _progress is not None:
+        _progress.finish()
+    if _settings['report']:
+        report(stream)
+    if _settings['profile_dir'] is not None:
+        paths = dump_profiles()
+        stream.write(f"\n[OK] Profiles: {', '.join(paths)} (python -m pstats <file>)\n")
+    disable()
@@ -0,0 +1,278 @@
+"""
+Load seed SQL straight into Postgres, tables in parallel in foreign-key order.
+
+    load_sql(statements, url, workers=4)
+
+The statements (from seedgen.sqlsplit) are first spooled to one temporary
+file per table, so a sharded file that visits every table many times is
+read once and in constant memory. Tables are then loaded over a pool of
+`workers` connections: a table starts as soon as every table it depends on
+(seedgen.tables.DEPENDS) has finished, so independent tables - compliance,
+invoices, groups, operational_costs, ... - run side by side.
+
+Each table is loaded in batches, each its own transaction: `batch_size`
+INSERT/UPDATE/DELETE statements, run one at a time so each reports its own
+row count, or `batch_size` rows of a COPY block sent as one COPY. A batch
+that fails with a transient error (dropped connection, deadlock,
+serialization failure) before its COMMIT is sent is rolled back and retried
+on a fresh connection up to `retries` times; batches already committed stay
+loaded, so nothing is reloaded. A connection lost during the COMMIT itself
+is not retried - the batch may have landed, and sending it again would load
+it twice - so the load stops there. Data errors fail at once.
+
+Needs the optional 'psycopg' (3) package: pip install "psycopg[binary]".
+"""
+
+import os
+import queue
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+try:
+    import psycopg
+except ImportError:  # optional dependency
+    psycopg = None
+
+from seedgen.sqlsplit import split_statements
+from seedgen.tables import DEPENDS
+
+DEFAULT_WORKERS = 4
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_RETRIES = 3
+RETRY_DELAY = 0.5  # seconds, doubled on every retry
+
+# Transaction control in the file is replaced by the loader's own per-batch transactions
+_TRANSACTION_KINDS = {'BEGIN', 'START', 'COMMIT', 'END', 'ROLLBACK'}
+
+
+def available():
+    return psycopg is not None
+
+
+class LoadError(Exception):
+    """The load failed for good; for a failed batch `table` and `batch` say which."""
+
+    def __init__(self, message, table=None, batch=None):
+        super().__init__(message)
+        self.table = table
+        self.batch = batch
+
+
+class ConnectionPool:
+    """A fixed set of autocommit connections, opened on first use and replaced when they break."""
+
+    def __init__(self, url, size, setup=()):
+        if psycopg is None:
+            raise RuntimeError("Loading into Postgres needs the 'psycopg' package: pip install \"psycopg[binary]\"")
+        self.url = url
+        self.setup = list(setup)  # SET statements every connection runs when opened
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(None)
+
+    def get(self):
+        conn = self._idle.get()
+        if conn is None or conn.closed:
+            try:
+                conn = psycopg.connect(self.url, autocommit=True)
+                for sql in self.setup:
+                    conn.execute(sql)
+            except BaseException:
+                self._idle.put(None)
+                raise
+        return conn
+
+    def put(self, conn):
+        self._idle.put(None if conn.closed or conn.broken else conn)
+
+    def discard(self, conn):
+        conn.close()
+        self._idle.put(None)
+
+    def execute(self, sql):
+        """Run `sql` on a pooled connection."""
+        conn = self.get()
+        try:
+            conn.execute(sql)
+        finally:
+            self.put(conn)
+
+    def close(self):
+        while not self._idle.empty():
+            conn = self._idle.get_nowait()
+            if conn is not None:
+                conn.close()
+
+
+class TableStats:
+    __slots__ = ('table', 'rows', 'batches', 'retries', 'seconds')
+
+    def __init__(self, table):
+        self.table = table
+        self.rows = self.batches = self.retries = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def spool_tables(statements, directory):
+    """Write each table's statements (with COPY data) to `directory`/<table>.sql; return (tables in
+    first-seen order, SET statements, other statements that write to no table)."""
+    files, settings, other = {}, [], []
+    try:
+        for statement in statements:
+            if statement.table is None:
+                if statement.kind == 'SET':
+                    settings.append(statement.text)
+                elif statement.kind and statement.kind not in _TRANSACTION_KINDS:
+                    other.append(statement.text)
+                continue
+            f = files.get(statement.table)
+            if f is None:
+                f = files[statement.table] = open(os.path.join(directory, statement.table + '.sql'), 'w', encoding='utf-8')
+            f.write(statement.text)
+            if not statement.text.endswith('\n'):
+                f.write('\n')
+            for data_line in statement.data:
+                f.write(data_line)
+    finally:
+        for f in files.values():
+            f.close()
+    return list(files), settings, other
+
+
+def _batches(path, batch_size):
+    """(kind, sql, copy rows) batches for one spooled table file: ('sql', [statement, ...], None) or
+    ('copy', copy statement, [data line, ...])."""
+    pending = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for statement in split_statements(f):
+            if statement.kind is None:
+                continue
+            if not statement.data:
+                pending.append(statement.text)
+                if len(pending) >= batch_size:
+                    yield 'sql', pending, None
+                    pending = []
+                continue
+            if pending:
+                yield 'sql', pending, None
+                pending = []
+            copy_sql = statement.text.strip().rstrip(';')
+            rows = []
+            for data_line in statement.data:
+                if data_line.rstrip('\r\n') == '\\.':
+                    break
+                rows.append(data_line)
+                if len(rows) >= batch_size:
+                    yield 'copy', copy_sql, rows
+                    rows = []
+            if rows:
+                yield 'copy', copy_sql, rows
+    if pending:
+        yield 'sql', pending, None
+
+
+def _run_batch(conn, kind, sql, rows):
+    """Run one batch in a transaction it opens and leaves open for the caller to commit; return the rows
+    it wrote."""
+    with conn.cursor() as cur:
+        cur.execute('BEGIN')
+        if kind == 'copy':
+            with cur.copy(sql) as copy:
+                for row in rows:
+                    copy.write(row)
+            return len(rows)
+        count = 0
+        for statement in sql:
+            cur.execute(statement)
+            count += max(cur.rowcount, 0)
+        return count
+
+
+def load_table(pool, table, path, batch_size=DEFAULT_BATCH_SIZE, retries=DEFAULT_RETRIES):
+    """Load one spooled table file batch by batch, retrying transient failures; return its TableStats."""
+    stats = TableStats(table)
+    started = time.perf_counter()
+    for number, (kind, sql, rows) in enumerate(_batches(path, batch_size), 1):
+        attempt = 0
+        while True:
+            conn, committing = None, False
+            try:
+                conn = pool.get()
+                written = _run_batch(conn, kind, sql, rows)
+                committing = True
+                conn.execute('COMMIT')
+                stats.rows += written
+            except psycopg.OperationalError as error:
+                if conn is not None:
+                    pool.discard(conn)  # the server rolls back an open transaction when its connection goes
+                if committing:
+                    raise LoadError(f'{table}: batch {number} lost its connection while committing, so it may or may not '
+                                    f'be loaded; not retried: {error}', table, number) from error
+                if attempt >= retries:
+                    raise LoadError(f'{table}: batch {number} failed after {retries} retries: {error}', table, number) from error
+                attempt += 1
+                stats.retries += 1
+                time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+                continue
+            except psycopg.Error as error:
+                pool.discard(conn)  # rolls back the failed transaction; the load stops anyway
+                raise LoadError(f'{table}: batch {number} failed: {error}', table, number) from error
+            pool.put(conn)
+            break
+        stats.batches += 1
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def load_sql(statements, url, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE, retries=DEFAULT_RETRIES,
+             truncate=False, truncate_auth=False, on_table=None):
+    """Load `statements` into the database at `url`; return {table: TableStats} in completion order.
+
+    `truncate=True` empties the loaded tables first, in one TRUNCATE ...
+    CASCADE: foreign keys between them don't matter, and tables that
+    reference them but aren't loaded (e.g. skipped profiles) are emptied too.
+    The auth.* tables hold every login in the database, not just the seeded
+    ones, so they are left alone unless `truncate_auth=True`. `on_table(stats)`
+    is called as each table finishes. SET statements in the file (e.g. the
+    replica mode of a file with logins) are applied to every connection.
+    """
+    directory = tempfile.mkdtemp(prefix='seed_load_')
+    pool = ConnectionPool(url, workers)
+    try:
+        tables, pool.setup, other = spool_tables(statements, directory)
+        try:
+            emptied = [table for table in tables if truncate_auth or not table.startswith('auth.')]
+            if truncate and emptied:
+                pool.execute(f"TRUNCATE TABLE {', '.join(emptied)} CASCADE")
+            for sql in other:
+                pool.execute(sql)
+        except psycopg.Error as error:
+            raise LoadError(str(error)) from error
+
+        # A table waits for the tables it depends on that are part of this load
+        waiting = {table: {parent for parent in DEPENDS.get(table, ()) if parent in tables} for table in tables}
+        done = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            while waiting or running:
+                for table in [t for t, parents in waiting.items() if parents <= done.keys()]:
+                    del waiting[table]
+                    path = os.path.join(directory, table + '.sql')
+                    running[executor.submit(load_table, pool, table, path, batch_size, retries)] = table
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    del running[future]
+                    stats = future.result()  # a LoadError stops the load; running tables finish first
+                    done[stats.table] = stats
+                    if on_table:
+                        on_table(stats)
+        return done
+    finally:
+        pool.close()
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,181 @@
+"""
+The ID manifest handed from the first generator stage to the second.
+
+The default store is a directory with one `<table>.uuid` file per table,
+each a flat array of 16-byte binary UUIDs, plus `meta.json` for the seed
+settings. Files are memory-mapped for reading, so opening the manifest is
+instant and `ids[table][i]` reads a single record however many millions
+there are (`ids[table][i:j]` a run of them in one read); new IDs are
+appended to the end of a file without rewriting it.
+
+A path ending in `.json` keeps the original SEED_DATA_MANIFEST.json layout
+(a JSON object of ID lists), which is loaded and rewritten whole.
+
+Both are opened with open_manifest() and used the same way:
+
+    with open_manifest(path) as ids:
+        ids['staff'][i]            # str UUID, random access
+        ids['staff'][i:j]          # list of str UUIDs
+        len(ids['staff'])
+        ids['shifts'].extend(new_shift_ids)   # mode 'a' or 'w'
+        ids.meta['seed']
+"""
+
+import json
+import mmap
+import os
+
+RECORD_SIZE = 16
+META_FILE = 'meta.json'
+
+
+def _uuid_str(raw):
+    h = raw.hex()
+    return f'{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}'
+
+
+class IdColumn:
+    """One table's IDs: a file of 16-byte UUIDs, memory-mapped for reads and appended to for writes."""
+
+    def __init__(self, path, writable=False):
+        self.path = path
+        self._fh = open(path, 'a+b' if writable else 'rb')
+        self._count = os.fstat(self._fh.fileno()).st_size // RECORD_SIZE
+        self._map = None
+        self._mapped = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._slice(*index.indices(self._count))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(f'{os.path.basename(self.path)}: index {index} out of range')
+        if index >= self._mapped:
+            self._remap()
+        offset = index * RECORD_SIZE
+        return _uuid_str(self._map[offset:offset + RECORD_SIZE])
+
+    def _slice(self, start, stop, step):
+        if step != 1:
+            return [self[i] for i in range(start, stop, step)]
+        if stop > self._mapped:
+            self._remap()
+        h = self._map[start * RECORD_SIZE:max(start, stop) * RECORD_SIZE].hex()
+        return [f'{h[o:o + 8]}-{h[o + 8:o + 12]}-{h[o + 12:o + 16]}-{h[o + 16:o + 20]}-{h[o + 20:o + 32]}'
+                for o in range(0, len(h), 2 * RECORD_SIZE)]
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def _remap(self):
+        # Pick up records appended since the last mapping
+        self._fh.flush()
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped = self._count
+
+    def append(self, uuid):
+        self.extend([uuid])
+
+    def extend(self, uuids):
+        data = bytes.fromhex(''.join(uuids).replace('-', ''))
+        self._fh.write(data)
+        self._count += len(data) // RECORD_SIZE
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._fh.close()
+
+
+class IdStore:
+    """A directory of IdColumn files, one per table, plus meta.json.
+
+    mode 'r' reads, 'a' also appends, 'w' starts the store afresh.
+    """
+
+    def __init__(self, path, mode='r'):
+        if mode not in ('r', 'a', 'w'):
+            raise ValueError(f"mode must be 'r', 'a' or 'w', not {mode!r}")
+        self.path = path
+        self.mode = mode
+        self._columns = {}
+        if mode == 'r' and not os.path.isdir(path):
+            raise FileNotFoundError(f'No ID manifest at {path} - run seed_data_generator.py first')
+        os.makedirs(path, exist_ok=True)
+        if mode == 'w':
+            for name in os.listdir(path):
+                if name.endswith('.uuid') or name == META_FILE:
+                    os.remove(os.path.join(path, name))
+        meta_path = os.path.join(path, META_FILE)
+        self.meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+
+    def __getitem__(self, table):
+        if table not in self._columns:
+            column_path = os.path.join(self.path, table + '.uuid')
+            if self.mode == 'r' and not os.path.exists(column_path):
+                raise KeyError(table)
+            self._columns[table] = IdColumn(column_path, writable=self.mode != 'r')
+        return self._columns[table]
+
+    def close(self):
+        for column in self._columns.values():
+            column.close()
+        self._columns = {}
+        if self.mode != 'r':
+            with open(os.path.join(self.path, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(self.meta, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonManifest:
+    """The original JSON manifest: ID lists by table, with the seed settings as top-level scalars."""
+
+    def __init__(self, path, mode='r'):
+        self.path = path
+        self.mode = mode
+        self._ids = {}
+        if mode != 'w':
+            with open(path, 'r', encoding='utf-8') as f:
+                self._ids = json.load(f)
+        self.meta = {key: self._ids.pop(key) for key in [k for k, v in self._ids.items() if not isinstance(v, list)]}
+
+    def __getitem__(self, table):
+        if table not in self._ids:
+            if self.mode == 'r':
+                raise KeyError(table)
+            self._ids[table] = []
+        return self._ids[table]
+
+    def close(self):
+        if self.mode != 'r':
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({**self._ids, **self.meta}, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_manifest(path, mode='r'):
+    """Open the ID manifest at `path`: a JSON file if it ends in .json, otherwise a binary IdStore directory."""
+    if path.endswith('.json'):
+        return JsonManifest(path, mode)
+    return IdStore(path, mode)
@@ -0,0 +1,101 @@
+"""
+Process-pool sharding for the seed generators.
+
+Work is split into contiguous shards of at most DEFAULT_SHARD_UNITS scale
+units. The split depends only on the scale, never on the worker count, so
+(with --seed) the output is byte-identical however many workers run it. Every unit owns its
+agencies (and everything keyed by agency_id), so each shard can be generated
+independently into its own output file. merge_shards() then appends the
+shards to the real output in shard order: each shard is internally in
+foreign-key order and only references its own rows or rows from an earlier
+stage, so the merged file loads cleanly.
+"""
+
+import os
+import random
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from seedgen import instrument, rng
+from seedgen.formats import write_load_script
+
+DEFAULT_SHARD_UNITS = 1000
+
+
+def shard_ranges(total, shards):
+    """Split range(total) into `shards` contiguous (start, stop) ranges of near-equal size."""
+    shards = max(1, min(shards, total))
+    size, extra = divmod(total, shards)
+    ranges, start = [], 0
+    for i in range(shards):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def unit_shards(total, shard_units=DEFAULT_SHARD_UNITS):
+    """Split range(total) into the fewest near-equal ranges of at most `shard_units` units."""
+    return shard_ranges(total, -(-total // shard_units))
+
+
+def shard_path(fmt, output, index):
+    """Where shard `index` writes: a hidden sub-directory for csv, a sibling file otherwise."""
+    if fmt == 'csv':
+        return os.path.join(output, f'.shard{index}')
+    for extension in ('.gz', '.zst'):
+        if output.endswith(extension):
+            return f"{output[:-len(extension)]}.shard{index}{extension}"
+    return f"{output}.shard{index}"
+
+
+def _init_worker(seed, as_of):
+    # Forked workers inherit the parent's random state; give each its own stream.
+    # Seeded runs reseed per entity anyway, but spawned workers need the settings.
+    random.seed()
+    rng.configure(seed, as_of)
+
+
+def run_shards(worker, jobs, workers):
+    """Run `worker(job)` for every job across a process pool, yielding results in job order as they finish."""
+    if workers <= 1 or len(jobs) <= 1:
+        yield from map(worker, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=rng.settings()) as pool:
+        if not instrument.enabled:
+            yield from pool.map(worker, jobs)
+            return
+        # Each worker instruments its own shards and hands the counters back with the result
+        for result, stats in pool.map(partial(instrument.run_instrumented, instrument.worker_settings(), worker), jobs):
+            instrument.merge(stats)
+            yield result
+
+
+def merge_shards(fmt, output, shard_paths, truncate=False):
+    """Append shard outputs to `output` in order and remove them.
+
+    SQL shards are appended byte for byte (gzip members and zstd frames
+    concatenate cleanly). CSV shards are appended per table file; with
+    `truncate=True` existing table files are replaced rather than extended.
+    """
+    if fmt != 'csv':
+        with open(output, 'ab') as dst:
+            for path in shard_paths:
+                with open(path, 'rb') as src:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+                os.remove(path)
+        return
+
+    started = set()
+    for shard_dir in shard_paths:
+        for name in sorted(os.listdir(shard_dir)):
+            if name == 'load.sql':
+                continue
+            target = os.path.join(output, name)
+            mode = 'wb' if truncate and target not in started else 'ab'
+            started.add(target)
+            with open(os.path.join(shard_dir, name), 'rb') as src, open(target, mode) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+        shutil.rmtree(shard_dir)
+    write_load_script(output)
@@ -0,0 +1,65 @@
+"""
+Deterministic, seedable randomness for the seed generators.
+
+Unseeded (the default) everything behaves as before: values come from the
+global `random` module, IDs from uuid4() and timestamps from the wall clock.
+
+After configure(seed=...):
+
+* seed_entity(table, index) reseeds `random` from (seed, table, index) before
+  each row is generated, so every row has its own stream and its values don't
+  depend on which rows were generated before it, in which process, or
+  whether the run was restarted partway through;
+* gen_uuid() returns uuid5 IDs derived from the same (seed, table, index)
+  plus a per-row counter;
+* now() is pinned to `as_of`, so relative dates ("7 days ago") are stable.
+
+The same seed, scale and shard size therefore give byte-identical output.
+"""
+
+import random
+from datetime import datetime
+from uuid import NAMESPACE_URL, uuid4, uuid5
+
+DEFAULT_AS_OF = datetime(2025, 11, 11)
+
+_seed = None
+_namespace = None
+_as_of = None
+_entity_key = None
+_uuid_counter = 0
+
+
+def configure(seed=None, as_of=None):
+    """Turn deterministic mode on (seed given) or off (seed=None)."""
+    global _seed, _namespace, _as_of
+    _seed = seed
+    _namespace = uuid5(NAMESPACE_URL, f"acg-seed-data/{seed}") if seed is not None else None
+    _as_of = as_of if as_of is not None else (DEFAULT_AS_OF if seed is not None else None)
+
+
+def settings():
+    """(seed, as_of) for handing to worker processes."""
+    return _seed, _as_of
+
+
+def seed_entity(table, index):
+    """Start the random stream for row `index` of `table` (no-op when unseeded)."""
+    global _entity_key, _uuid_counter
+    if _seed is None:
+        return
+    _entity_key = f"{table}:{index}"
+    _uuid_counter = 0
+    random.seed(f"{_seed}:{_entity_key}")
+
+
+def gen_uuid():
+    global _uuid_counter
+    if _seed is None:
+        return str(uuid4())
+    _uuid_counter += 1
+    return str(uuid5(_namespace, f"{_entity_key}:{_uuid_counter}"))
+
+
+def now():
+    return _as_of if _as_of is not None else datetime.now()
@@ -0,0 +1,499 @@
+"""
+The schema the migrations build, and a check of the seeded tables against it.
+
+load() replays the DDL in supabase/migrations (in file name order, as the
+Supabase CLI applies it) into a model of each table's columns:
+
+    CREATE TABLE / DROP TABLE / ALTER TABLE ... RENAME TO
+    ALTER TABLE ... ADD [COLUMN] [IF NOT EXISTS], DROP [COLUMN], RENAME [COLUMN]
+    ALTER TABLE ... ALTER [COLUMN] ... [SET DATA] TYPE, SET / DROP NOT NULL,
+                    SET / DROP DEFAULT
+    ALTER TABLE ... ADD / DROP CONSTRAINT (CHECK constraints are kept)
+
+Every column records its type, NOT NULL, default, CHECK constraints and
+foreign key, and the migration that last changed it. Function bodies and DO
+blocks are skipped (seedgen.sqlsplit keeps $$ quoting whole), as is
+everything that isn't table DDL. The migrations here add to tables created
+before them, so the model only knows the columns they touch; a column
+altered without being added has a type of None.
+
+The rest of each table comes from expected_schema.json (load_expected), the
+app's data model the migrations were written from, and BUILT_IN: the
+Supabase auth tables and the two tables (profiles, groups) that neither
+describes. These give a column's type only.
+
+Parsing the migrations again for every run would be cheap, but the model is
+cached anyway (DEFAULT_CACHE, JSON) under a key made of the migration file
+names, sizes and mtimes, so a run that checks it costs a stat per file.
+
+check() fails a generator run before its first row when the seeded tables
+(seedgen.tables) disagree with the model:
+
+    - a generated table or column the migrations drop
+    - a generated table or column none of them has
+    - a column the migrations type jsonb / json or uuid[] that COLUMN_KINDS
+      doesn't render that way, or the other way round
+    - a NOT NULL column without a default that isn't generated
+    - a generated column that is a reserved word but not quoted (RESERVED)
+    - a COLUMN_KINDS entry naming a column the table doesn't have
+
+and it compiles every row encoder the run will use (seedgen.encoders), so
+those fail up front too. Without expected_schema.json, only the columns the
+migrations know are checked.
+"""
+
+import json
+import os
+import re
+
+from seedgen.encoders import ENCODINGS, row_encoder
+from seedgen.sqlsplit import split_statements
+from seedgen.tables import COLUMN_KINDS, COLUMNS, RESERVED
+
+DEFAULT_MIGRATIONS = os.path.join('supabase', 'migrations')
+DEFAULT_CACHE = '.seed_schema.json'
+DEFAULT_EXPECTED = 'expected_schema.json'
+MODEL_VERSION = 1
+
+# Reserved words (Postgres 15, "reserved" and "reserved (can be function or type)") a column name can't be bare
+POSTGRES_RESERVED = {
+    'all', 'analyse', 'analyze', 'and', 'any', 'array', 'as', 'asc', 'asymmetric', 'authorization', 'binary', 'both',
+    'case', 'cast', 'check', 'collate', 'collation', 'column', 'concurrently', 'constraint', 'create', 'cross',
+    'current_catalog', 'current_date', 'current_role', 'current_schema', 'current_time', 'current_timestamp',
+    'current_user', 'default', 'deferrable', 'desc', 'distinct', 'do', 'else', 'end', 'except', 'false', 'fetch',
+    'for', 'foreign', 'freeze', 'from', 'full', 'grant', 'group', 'having', 'ilike', 'in', 'initially', 'inner',
+    'intersect', 'into', 'is', 'isnull', 'join', 'lateral', 'leading', 'left', 'like', 'limit', 'localtime',
+    'localtimestamp', 'natural', 'not', 'notnull', 'null', 'offset', 'on', 'only', 'or', 'order', 'outer', 'overlaps',
+    'placing', 'primary', 'references', 'returning', 'right', 'select', 'session_user', 'similar', 'some', 'symmetric',
+    'table', 'tablesample', 'then', 'to', 'trailing', 'true', 'union', 'unique', 'user', 'using', 'variadic', 'verbose',
+    'when', 'where', 'window', 'with',
+}
+
+# Column types of the tables neither the migrations nor expected_schema.json describe: Supabase auth
+# (GoTrue's login columns) and the app's own two (as shared/types/supabase-generated.ts has them)
+BUILT_IN = {
+    'auth.users': {
+        'instance_id': 'uuid', 'id': 'uuid', 'aud': 'varchar(255)', 'role': 'varchar(255)', 'email': 'varchar(255)',
+        'encrypted_password': 'varchar(255)', 'email_confirmed_at': 'timestamptz', 'invited_at': 'timestamptz',
+        'confirmation_token': 'varchar(255)', 'confirmation_sent_at': 'timestamptz', 'recovery_token': 'varchar(255)',
+        'recovery_sent_at': 'timestamptz', 'email_change_token_new': 'varchar(255)', 'email_change': 'varchar(255)',
+        'email_change_sent_at': 'timestamptz', 'last_sign_in_at': 'timestamptz', 'raw_app_meta_data': 'jsonb',
+        'raw_user_meta_data': 'jsonb', 'is_super_admin': 'boolean', 'created_at': 'timestamptz',
+        'updated_at': 'timestamptz', 'phone': 'text', 'phone_confirmed_at': 'timestamptz',
+    },
+    'auth.identities': {
+        'provider_id': 'text', 'user_id': 'uuid', 'identity_data': 'jsonb', 'provider': 'text',
+        'last_sign_in_at': 'timestamptz', 'created_at': 'timestamptz', 'updated_at': 'timestamptz',
+    },
+    'profiles': {
+        'id': 'uuid', 'email': 'text', 'full_name': 'text', 'phone': 'text', 'user_type': 'text', 'role': 'text',
+        'agency_id': 'uuid', 'client_id': 'uuid', 'is_super_admin': 'boolean', 'profile_photo_url': 'text',
+        'created_at': 'timestamptz', 'created_date': 'timestamptz', 'updated_at': 'timestamptz',
+    },
+    'groups': {
+        'id': 'uuid', 'agency_id': 'uuid', 'name': 'text', 'description': 'text', 'staff_members': 'uuid[]',
+        'created_date': 'timestamptz', 'updated_date': 'timestamptz',
+    },
+}
+
+_TOKEN = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|--[^\n]*|/\*.*?\*/|::|[A-Za-z_][\w$]*|\d+(?:\.\d+)?|\S""", re.S)
+_CONSTRAINT_WORDS = {'constraint', 'default', 'not', 'null', 'check', 'references', 'primary', 'unique', 'generated',
+                     'collate'}
+_TABLE_CONSTRAINTS = {'constraint', 'check', 'primary', 'foreign', 'unique', 'exclude', 'like'}
+
+
+class SchemaError(Exception):
+    """The seeded tables don't match the migrations; `problems` lists how."""
+
+    def __init__(self, directory, problems):
+        super().__init__(f"{len(problems)} schema mismatch(es) with {directory}:\n"
+                         + '\n'.join(f"  - {problem}" for problem in problems))
+        self.problems = problems
+
+
+def _tokens(sql):
+    tokens = [token for token in _TOKEN.findall(sql) if not token.startswith(('--', '/*'))]
+    return tokens[:-1] if tokens and tokens[-1] == ';' else tokens
+
+
+def _word(token):
+    return token.lower() if token[:1] != '"' else None
+
+
+def _name(token):
+    return token[1:-1].replace('""', '"') if token.startswith('"') else token.lower()
+
+
+def _text(tokens):
+    text = ' '.join(tokens)
+    return re.sub(r'\s*(::|\[|\])\s*|(?<=\()\s+|\s+(?=[),])', lambda m: m.group(1) or '', text)
+
+
+def _type(tokens):
+    return re.sub(r'\s*([(),\[\]])\s*', r'\1', ' '.join(tokens)).lower() or None
+
+
+def _split(tokens, separator=','):
+    """`tokens` split at the `separator`s outside parentheses."""
+    parts, part, depth = [], [], 0
+    for token in tokens:
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        if token == separator and depth == 0:
+            parts.append(part)
+            part = []
+        else:
+            part.append(token)
+    parts.append(part)
+    return [part for part in parts if part]
+
+
+def _group(tokens, start):
+    """The index just past the parenthesized group opening at tokens[start]."""
+    depth = 0
+    for k in range(start, len(tokens)):
+        depth += tokens[k] == '('
+        depth -= tokens[k] == ')'
+        if depth == 0:
+            return k + 1
+    return len(tokens)
+
+
+def _table_name(tokens, k):
+    """(table, index after it) for a possibly schema-qualified name at tokens[k]; public. is dropped."""
+    name = _name(tokens[k])
+    k += 1
+    if k + 1 < len(tokens) and tokens[k] == '.':
+        name = f'{name}.{_name(tokens[k + 1])}'
+        k += 2
+    return (name[len('public.'):] if name.startswith('public.') else name), k
+
+
+def _skip(tokens, k, *words):
+    """Index past the optional `words` at tokens[k] (all of them, or none)."""
+    if [_word(token) for token in tokens[k:k + len(words)]] == list(words):
+        return k + len(words)
+    return k
+
+
+def _new_column(source):
+    return {'type': None, 'not_null': False, 'default': None, 'checks': [], 'references': None, 'generated': False,
+            'source': source}
+
+
+def _column_definition(tokens, source):
+    """(name, column) for `name type [constraints]`."""
+    column = _new_column(source)
+    k = 1
+    while k < len(tokens) and _word(tokens[k]) not in _CONSTRAINT_WORDS:
+        k = _group(tokens, k) if tokens[k] == '(' else k + 1
+    column['type'] = _type(tokens[1:k])
+    _column_constraints(column, tokens, k)
+    return _name(tokens[0]), column
+
+
+def _column_constraints(column, tokens, k):
+    while k < len(tokens):
+        word = _word(tokens[k])
+        if word == 'constraint':
+            k += 2
+        elif word == 'not' and _word(tokens[k + 1] if k + 1 < len(tokens) else '') == 'null':
+            column['not_null'] = True
+            k += 2
+        elif word == 'null':
+            column['not_null'] = False
+            k += 1
+        elif word == 'primary':
+            column['not_null'] = True
+            k += 2
+        elif word == 'check' and k + 1 < len(tokens):
+            end = _group(tokens, k + 1)
+            column['checks'].append(_text(tokens[k + 1:end]))
+            k = end
+        elif word in ('default', 'references', 'generated', 'collate'):
+            end = k + 1
+            while end < len(tokens) and (_word(tokens[end]) not in _CONSTRAINT_WORDS or tokens[end] == '('):
+                end = _group(tokens, end) if tokens[end] == '(' else end + 1
+            if word == 'default':
+                column['default'] = _text(tokens[k + 1:end])
+            elif word == 'references':
+                column['references'] = _text(tokens[k + 1:end])
+            elif word == 'generated':
+                column['generated'] = True
+            k = end
+        else:
+            k += 1
+
+
+class _Replay:
+    """The model as the migrations build it up."""
+
+    def __init__(self):
+        self.tables = {}  # table -> {'columns': {column: column}, 'checks': {constraint: text}}
+        self.dropped_tables = {}  # table -> migration that dropped it
+        self.dropped_columns = {}  # table -> {column: migration that dropped it}
+
+    def table(self, name):
+        self.dropped_tables.pop(name, None)
+        return self.tables.setdefault(name, {'columns': {}, 'checks': {}})
+
+    def column(self, table, name, source):
+        columns = self.table(table)['columns']
+        if name not in columns:
+            columns[name] = _new_column(source)
+        columns[name]['source'] = source
+        return columns[name]
+
+    def drop_column(self, table, name, source):
+        self.table(table)['columns'].pop(name, None)
+        self.dropped_columns.setdefault(table, {})[name] = source
+
+    def add_column(self, table, tokens, source):
+        name, column = _column_definition(tokens, source)
+        existing = self.table(table)['columns'].get(name)
+        if existing is not None and existing['type'] is not None:
+            return  # ADD COLUMN IF NOT EXISTS on a column already there: a no-op
+        self.table(table)['columns'][name] = column
+        self.dropped_columns.get(table, {}).pop(name, None)
+
+    def create(self, tokens, source):
+        k = _skip(tokens, 1, 'unlogged')
+        if _word(tokens[k]) != 'table':
+            return
+        k = _skip(tokens, k + 1, 'if', 'not', 'exists')
+        name, k = _table_name(tokens, k)
+        if k >= len(tokens) or tokens[k] != '(':
+            return  # CREATE TABLE ... AS / OF / PARTITION OF
+        self.tables.pop(name, None)
+        self.dropped_columns.pop(name, None)
+        table = self.table(name)
+        for definition in _split(tokens[k + 1:_group(tokens, k) - 1]):
+            word = _word(definition[0])
+            if word not in _TABLE_CONSTRAINTS:
+                self.add_column(name, definition, source)
+            elif word in ('constraint', 'check'):
+                self.add_constraint(table, definition)
+
+    def add_constraint(self, table, tokens):
+        name = _name(tokens[1]) if _word(tokens[0]) == 'constraint' else f'check{len(table["checks"]) + 1}'
+        for k, token in enumerate(tokens):
+            if _word(token) == 'check' and k + 1 < len(tokens):
+                table['checks'][name] = _text(tokens[k + 1:_group(tokens, k + 1)])
+
+    def drop(self, tokens, source):
+        if len(tokens) < 2 or _word(tokens[1]) != 'table':
+            return
+        k = _skip(tokens, 2, 'if', 'exists')
+        for part in _split(tokens[k:]):
+            name, _ = _table_name(part, 0)
+            self.tables.pop(name, None)
+            self.dropped_columns.pop(name, None)
+            self.dropped_tables[name] = source
+
+    def alter(self, tokens, source):
+        if len(tokens) < 3 or _word(tokens[1]) != 'table':
+            return
+        k = _skip(tokens, 2, 'if', 'exists')
+        k = _skip(tokens, k, 'only')
+        name, k = _table_name(tokens, k)
+        for action in _split(tokens[k:]):
+            self.alter_action(name, action, source)
+            if _word(action[0]) == 'rename' and _skip(action, 1, 'to') == 2:
+                name, _ = _table_name(action, 2)  # later actions apply to the renamed table
+
+    def alter_action(self, name, action, source):
+        word = _word(action[0])
+        table = self.table(name)
+        if word == 'add':
+            if _word(action[1]) in _TABLE_CONSTRAINTS - {'like'}:
+                if _word(action[1]) in ('constraint', 'check'):
+                    self.add_constraint(table, action[1:])
+                return
+            k = _skip(action, 1, 'column')
+            self.add_column(name, action[_skip(action, k, 'if', 'not', 'exists'):], source)
+        elif word == 'drop':
+            if _word(action[1]) == 'constraint':
+                table['checks'].pop(_name(action[_skip(action, 2, 'if', 'exists')]), None)
+                return
+            k = _skip(action, _skip(action, 1, 'column'), 'if', 'exists')
+            if k < len(action):
+                self.drop_column(name, _name(action[k]), source)
+        elif word == 'rename':
+            if _word(action[1]) == 'to':
+                new, _ = _table_name(action, 2)
+                self.tables[new] = self.tables.pop(name)
+                self.dropped_tables[name] = source
+                return
+            if _word(action[1]) == 'constraint':
+                return
+            k = _skip(action, 1, 'column')
+            old, new = _name(action[k]), _name(action[k + 2])
+            column = table['columns'].pop(old, None) or _new_column(source)
+            column['source'] = source
+            self.dropped_columns.setdefault(name, {})[old] = source
+            self.dropped_columns[name].pop(new, None)
+            table['columns'][new] = column
+        elif word == 'alter':
+            k = _skip(action, 1, 'column')
+            column = self.column(name, _name(action[k]), source)
+            rest = [_word(token) for token in action[k + 1:]]
+            if rest[:3] == ['set', 'data', 'type'] or rest[:1] == ['type']:
+                start = k + (4 if rest[0] == 'set' else 2)
+                end = start
+                while end < len(action) and _word(action[end]) not in ('using', 'collate'):
+                    end = _group(action, end) if action[end] == '(' else end + 1
+                column['type'] = _type(action[start:end])
+            elif rest[:3] == ['set', 'not', 'null']:
+                column['not_null'] = True
+            elif rest[:3] == ['drop', 'not', 'null']:
+                column['not_null'] = False
+            elif rest[:2] == ['set', 'default']:
+                column['default'] = _text(action[k + 3:])
+            elif rest[:2] == ['drop', 'default']:
+                column['default'] = None
+
+    def model(self):
+        return {'tables': self.tables, 'dropped_tables': self.dropped_tables, 'dropped_columns': self.dropped_columns}
+
+
+def _migrations(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.sql'))
+
+
+def parse(directory):
+    """Replay the .sql migrations in `directory` into a model (see the module docstring)."""
+    replay = _Replay()
+    for name in _migrations(directory):
+        with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+            for statement in split_statements(f):
+                tokens = _tokens(statement.text)
+                if not tokens or statement.kind not in ('CREATE', 'ALTER', 'DROP'):
+                    continue
+                getattr(replay, statement.kind.lower())(tokens, name)
+    return replay.model()
+
+
+def _cache_key(directory):
+    stats = [(name, os.stat(os.path.join(directory, name))) for name in _migrations(directory)]
+    return [MODEL_VERSION, os.path.abspath(directory)] + [[name, st.st_size, st.st_mtime_ns] for name, st in stats]
+
+
+def load(directory=DEFAULT_MIGRATIONS, cache=DEFAULT_CACHE):
+    """The model of the migrations in `directory`, from `cache` while they're unchanged (cache=None: always parse)."""
+    key = _cache_key(directory)
+    if cache is not None and os.path.exists(cache):
+        try:
+            with open(cache, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                return cached['model']
+        except (OSError, ValueError):
+            pass  # unreadable: parse and rewrite it
+    model = parse(directory)
+    if cache is not None:
+        tmp = cache + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'model': model}, f)
+        os.replace(tmp, cache)
+    return model
+
+
+def column_kind(column_type):
+    """How seedgen.encoders renders a column of `column_type`: 'jsonb', 'uuid[]' or 'scalar'."""
+    if column_type in ('json', 'jsonb'):
+        return 'jsonb'
+    if column_type in ('uuid[]', 'uuid array'):
+        return 'uuid[]'
+    return 'scalar'
+
+
+def load_expected(path=DEFAULT_EXPECTED):
+    """{table: {column: type}} from expected_schema.json at `path`, with the BUILT_IN tables added."""
+    with open(path, 'r', encoding='utf-8') as f:
+        tables = json.load(f)
+    expected = {table: dict(columns) for table, columns in BUILT_IN.items()}
+    for table, entry in tables.items():
+        if re.fullmatch(r'\w+', table):  # not 'user (built-in)', the platform's users (auth.users here)
+            expected[table] = {column['name']: column['pg_type'].lower() for column in entry['columns']}
+    return expected
+
+
+def problems(model, tables, expected=None):
+    """How the seeded `tables` disagree with `model` and `expected` (load_expected), as messages (empty when they don't).
+
+    Without `expected`, columns the model doesn't know aren't checked.
+    """
+    found = []
+    for table in tables:
+        kinds = COLUMN_KINDS.get(table, {})
+        found += [f"{table}.{column}: COLUMN_KINDS renders it as {kind}, but {table} has no such column"
+                  for column, kind in kinds.items() if column not in COLUMNS[table]]
+        found += [f"{table}.{column}: reserved word, so it must be in seedgen.tables.RESERVED to be quoted"
+                  for column in COLUMNS[table] if column in POSTGRES_RESERVED and column not in RESERVED]
+        if table in model['dropped_tables']:
+            found.append(f"{table}: generated, but {model['dropped_tables'][table]} drops it")
+            continue
+        columns = model['tables'].get(table, {}).get('columns', {})
+        dropped = model['dropped_columns'].get(table, {})
+        fallback = (expected or {}).get(table, {})
+        if expected is not None and table not in model['tables'] and table not in expected:
+            found.append(f"{table}: generated, but neither the migrations nor the expected schema have it")
+            continue
+        for name in COLUMNS[table]:
+            column = columns.get(name)
+            if column is None and name in dropped:
+                found.append(f"{table}.{name}: generated, but {dropped[name]} drops it")
+                continue
+            if column is not None and column['generated']:
+                found.append(f"{table}.{name}: generated, but {column['source']} makes it GENERATED (it can't be written)")
+            if column is not None and column['type'] is not None:
+                source, column_type = column['source'], column['type']
+            elif name in fallback:
+                source, column_type = 'the expected schema', fallback[name]
+            else:
+                if column is None and expected is not None:
+                    found.append(f"{table}.{name}: generated, but neither the migrations nor the expected schema have it")
+                continue
+            kind, rendered = column_kind(column_type), kinds.get(name, 'scalar')
+            if kind != rendered and not (rendered == 'jsonb' and column_type == 'text'):
+                found.append(f"{table}.{name}: {source} makes it {column_type}, but COLUMN_KINDS renders it as {rendered}")
+        for name, column in columns.items():
+            if name not in COLUMNS[table] and column['not_null'] and column['default'] is None and not column['generated']:
+                found.append(f"{table}.{name}: NOT NULL without a default ({column['source']}), but not generated")
+    return found
+
+
+def add_arguments(parser):
+    parser.add_argument('--migrations', help=f'Check the tables against the schema these migrations build '
+                                             f'(default: {DEFAULT_MIGRATIONS}, if it exists)')
+    parser.add_argument('--expected-schema', help=f'Check the columns the migrations don\'t define against this '
+                                                  f'data model (default: {DEFAULT_EXPECTED}, if it exists)')
+    parser.add_argument('--no-schema-check', action='store_true', help="Don't check the tables against the migrations")
+
+
+def check(args, tables):
+    """Check `tables` against the migrations and expected schema the parsed `args` name, and compile their row encoders.
+
+    Raises SchemaError on a mismatch. Without --migrations a tree with no
+    supabase/migrations isn't checked, and without --expected-schema one with
+    no expected_schema.json only against the migrations; --no-schema-check
+    skips the check.
+    """
+    for table in tables:
+        for encoding in ENCODINGS:
+            row_encoder(table, encoding)
+    if args.no_schema_check:
+        return
+    directory = args.migrations or DEFAULT_MIGRATIONS
+    if not os.path.isdir(directory):
+        if args.migrations:
+            raise SchemaError(directory, [f"{directory} is not a directory"])
+        return
+    path = args.expected_schema or DEFAULT_EXPECTED
+    if not os.path.isfile(path) and args.expected_schema:
+        raise SchemaError(path, [f"{path} is not a file"])
+    found = problems(load(directory), tables, load_expected(path) if os.path.isfile(path) else None)
+    if found:
+        raise SchemaError(directory, found)
@@ -0,0 +1,195 @@
+"""
+Streaming SQL statement splitter for seed files.
+
+split_statements() reads a SQL script line by line and yields one Statement
+per `;`-terminated statement, however large the file - only the current
+statement is held in memory. It knows enough SQL lexing to find the real
+statement ends:
+
+    'text' with '' escapes     E'text' with backslash escapes
+    "quoted identifiers"       $$dollar$$ and $tag$dollar$tag$ quoting
+    -- line comments           /* nested block comments */
+
+so semicolons inside jsonb literals, strings or comments don't split a
+statement. `COPY ... FROM stdin;` statements carry their data lines (up to
+the `\\.` terminator) as a lazy iterator, so COPY blocks of any size are
+streamed rather than buffered.
+
+Each Statement is classified by the table it writes to, parsed from the SQL
+itself (INSERT INTO / COPY / UPDATE / DELETE FROM / TRUNCATE), not from the
+comments around it. Comments and blank lines before a statement are part of
+its text, so a section header travels with the first statement under it.
+"""
+
+import gzip
+import io
+import re
+
+from seedgen.writer import compression_for
+
+_NORMAL = re.compile(r"""(?<![\w$])[Ee]'|'|"|--|/\*|\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$|;""")
+_ESCAPE_STRING = re.compile(r"\\.|'", re.DOTALL)
+_BLOCK_COMMENT = re.compile(r"/\*|\*/")
+
+_IDENT = r'(?:"(?:[^"]|"")+"|[A-Za-z_][\w$]*)'
+_IDENTS = re.compile(_IDENT)
+_SPACE = re.compile(r'(?:\s+|--[^\n]*(?:\n|$))*')
+_TARGET = re.compile(
+    r'(?P<kind>[A-Za-z]+)(?:\s+(?:INTO|FROM|TABLE|ONLY))*\s+'
+    rf'(?P<name>{_IDENT}(?:\s*\.\s*{_IDENT})?)', re.IGNORECASE)
+_KIND = re.compile(r'[A-Za-z]+')
+_COPY_FROM_STDIN = re.compile(r'\bFROM\s+STDIN\b', re.IGNORECASE)
+_TABLE_KINDS = {'INSERT', 'COPY', 'UPDATE', 'DELETE', 'TRUNCATE'}
+
+
+class Statement:
+    """One SQL statement with the comments before it.
+
+    kind   first keyword, upper-cased ('INSERT', 'COPY', 'BEGIN', ...), or None for trailing comments
+    table  the table it writes to (unquoted; schema-qualified unless in public), or None
+    data   for COPY FROM stdin: iterator over its data lines, including the `\\.` line
+    """
+
+    __slots__ = ('text', 'kind', 'table', 'data')
+
+    def __init__(self, text):
+        self.text = text
+        self.kind = self.table = None
+        self.data = ()
+        start = _skip_comments(text)
+        match = _KIND.match(text, start)
+        if match:
+            self.kind = match.group().upper()
+        if self.kind in _TABLE_KINDS:
+            match = _TARGET.match(text, start)
+            if match:
+                self.table = '.'.join(_unquote(ident) for ident in _IDENTS.findall(match.group('name')))
+                if self.table.startswith('public.'):
+                    self.table = self.table[len('public.'):]
+
+
+def _skip_comments(text):
+    """Where the SQL in `text` starts, after any whitespace and (nested) comments."""
+    pos = 0
+    while True:
+        pos = _SPACE.match(text, pos).end()
+        if not text.startswith('/*', pos):
+            return pos
+        depth = 0
+        for match in _BLOCK_COMMENT.finditer(text, pos):
+            depth += 1 if match.group() == '/*' else -1
+            if depth == 0:
+                pos = match.end()
+                break
+        else:
+            return len(text)
+
+
+def _unquote(ident):
+    if ident.startswith('"'):
+        return ident[1:-1].replace('""', '"')
+    return ident.lower()
+
+
+def _copy_data(lines):
+    for line in lines:
+        yield line
+        if line.rstrip('\r\n') == '\\.':
+            return
+
+
+def split_statements(lines):
+    """Yield a Statement for every statement in `lines` (an iterable of text lines, e.g. an open file)."""
+    lines = iter(lines)
+    parts = []
+    quote = None  # None, "'", 'E', '"', '/*' or a $tag$ - what we're inside of at the end of the last line
+    depth = 0  # block comment nesting
+    for line in lines:
+        pos = 0
+        end = len(line)
+        while pos < end:
+            if quote is None:
+                match = _NORMAL.search(line, pos)
+                if not match:
+                    break
+                token = match.group()
+                pos = match.end()
+                if token == ';':
+                    # The statement ends here; a rest of the line that is only whitespace goes with it
+                    rest = line[pos:]
+                    if rest.strip():
+                        parts.append(line[:pos])
+                        line, pos, end = rest, 0, len(rest)
+                    else:
+                        parts.append(line)
+                        line, pos, end = '', 0, 0
+                    statement = Statement(''.join(parts))
+                    parts = []
+                    if statement.kind == 'COPY' and _COPY_FROM_STDIN.search(statement.text):
+                        statement.data = _copy_data(lines)
+                        yield statement
+                        for _ in statement.data:  # drain whatever the caller didn't read
+                            pass
+                    else:
+                        yield statement
+                elif token == '--':
+                    break
+                elif token == '/*':
+                    quote, depth = '/*', 1
+                elif token in ("'", '"'):
+                    quote = token
+                elif token in ("E'", "e'"):
+                    quote = 'E'
+                else:
+                    quote = token  # $tag$
+            elif quote == "'" or quote == '"':
+                close = line.find(quote, pos)
+                if close < 0:
+                    break
+                pos = close + 1
+                if line.startswith(quote, pos):  # '' or "" escape
+                    pos += 1
+                else:
+                    quote = None
+            elif quote == 'E':
+                match = _ESCAPE_STRING.search(line, pos)
+                if not match:
+                    break
+                pos = match.end()
+                if match.group() == "'":
+                    if line.startswith("'", pos):
+                        pos += 1
+                    else:
+                        quote = None
+            elif quote == '/*':
+                match = _BLOCK_COMMENT.search(line, pos)
+                if not match:
+                    break
+                pos = match.end()
+                depth += 1 if match.group() == '/*' else -1
+                if depth == 0:
+                    quote = None
+            else:
+                close = line.find(quote, pos)
+                if close < 0:
+                    break
+                pos = close + len(quote)
+                quote = None
+        if line:
+            parts.append(line)
+    if parts:
+        yield Statement(''.join(parts))
+
+
+def open_sql(path):
+    """Open a plain, .gz or .zst SQL file for reading as text."""
+    compression = compression_for(path)
+    if compression == 'gzip':
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("Reading .zst needs the 'zstandard' package: pip install zstandard") from None
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
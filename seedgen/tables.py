@@ -0,0 +1,216 @@
+"""
+Column lists and foreign-key dependencies for the 16 seeded tables (and
+the two Supabase auth tables written for logins), in foreign-key load order.
+
+Generators yield rows as tuples in exactly this column order; the output
+formats in seedgen.formats render the column list once per table (or per
+batch) instead of once per row.
+"""
+
+# Postgres reserved words that appear as column names and must be quoted
+RESERVED = {'references'}
+
+COLUMNS = {
+    # Supabase auth, only written when logins are generated (see seedgen.auth)
+    'auth.users': (
+        'instance_id', 'id', 'aud', 'role', 'email', 'encrypted_password', 'email_confirmed_at',
+        'raw_app_meta_data', 'raw_user_meta_data', 'created_at', 'updated_at', 'confirmation_token',
+        'email_change', 'email_change_token_new', 'recovery_token',
+    ),
+    'auth.identities': (
+        'provider_id', 'user_id', 'identity_data', 'provider', 'last_sign_in_at', 'created_at', 'updated_at',
+    ),
+    'agencies': (
+        'id', 'name', 'created_by', 'registration_number', 'contact_email', 'contact_phone',
+        'subscription_tier', 'address', 'status', 'bank_details', 'dbs_check_expiry_alerts',
+        'mandatory_training_reminders', 'document_expiry_warnings', 'auto_approve_timesheets',
+        'sms_shift_confirmations', 'whatsapp_notifications', 'auto_generate_invoices',
+        'send_payment_reminders', 'email_notifications', 'sms_notifications', 'whatsapp_global_notifications',
+        'payment_terms_days', 'invoice_frequency',
+    ),
+    'profiles': (
+        'id', 'full_name', 'email', 'phone', 'user_type', 'agency_id', 'created_date', 'role',
+        'profile_photo_url',
+    ),
+    'staff': (
+        'id', 'agency_id', 'first_name', 'last_name', 'email', 'phone', 'role', 'employment_type', 'status',
+        'hourly_rate', 'created_by', 'whatsapp_pin', 'whatsapp_number_verified', 'date_of_birth',
+        'profile_photo_url', 'nmc_pin', 'medication_trained', 'medication_training_expiry',
+        'can_work_as_senior', 'role_hierarchy', 'employment_history', 'references', 'skills', 'gps_consent',
+        'last_known_location', 'date_joined', 'months_of_experience', 'address', 'emergency_contact',
+        'availability', 'rating', 'total_shifts_completed', 'gps_consent_date', 'created_date', 'updated_date',
+        'user_id',
+    ),
+    'clients': (
+        'id', 'agency_id', 'name', 'type', 'status', 'created_by', 'location_coordinates', 'geofence_enabled',
+        'contact_person', 'billing_email', 'address', 'cqc_rating', 'bed_capacity', 'preferred_staff',
+        'notes', 'total_bookings', 'internal_locations', 'payment_terms', 'contract_terms', 'rating',
+        'geofence_radius_meters', 'created_date', 'updated_date',
+    ),
+    'shifts': (
+        'id', 'agency_id', 'client_id', 'assigned_staff_id', 'date', 'start_time', 'end_time',
+        'duration_hours', 'role_required', 'pay_rate', 'charge_rate', 'break_duration_minutes', 'status',
+        'urgency', 'notes', 'created_by', 'work_location_within_site', 'shift_journey_log',
+        'financial_locked', 'recurring', 'requirements', 'booking_id', 'timesheet_received',
+        'marketplace_visible', 'admin_closure_required', 'created_date', 'updated_date',
+    ),
+    'bookings': (
+        'id', 'agency_id', 'shift_id', 'staff_id', 'client_id', 'status', 'booking_date', 'shift_date',
+        'confirmation_method', 'confirmed_by_staff_at', 'notes', 'created_date', 'updated_date',
+    ),
+    'timesheets': (
+        'id', 'agency_id', 'booking_id', 'staff_id', 'client_id', 'shift_date', 'work_location_within_site',
+        'clock_in_time', 'clock_out_time', 'total_hours', 'break_duration_minutes', 'status', 'pay_rate',
+        'charge_rate', 'staff_pay_amount', 'client_charge_amount', 'geofence_validated', 'location_verified',
+        'staff_signature', 'created_date', 'updated_date',
+        # Appended to every row by seedgen.geo.locate_timesheets (its GPS_COLUMNS)
+        'clock_in_location', 'clock_out_location', 'geofence_distance_meters', 'geofence_violation_reason',
+        'clock_out_geofence_validated', 'clock_out_geofence_distance_meters',
+    ),
+    'invoices': (
+        'id', 'agency_id', 'client_id', 'invoice_number', 'invoice_date', 'due_date', 'period_start',
+        'period_end', 'subtotal', 'vat_rate', 'vat_amount', 'total', 'balance_due', 'status', 'created_by',
+        'line_items', 'notes', 'reminder_sent_count', 'created_date', 'updated_date',
+    ),
+    'payslips': (
+        'id', 'agency_id', 'staff_id', 'payslip_number', 'period_start', 'period_end', 'payment_date',
+        'gross_pay', 'deductions', 'total_deductions', 'net_pay', 'status', 'created_by', 'pdf_url',
+        'bank_details', 'timesheets', 'created_date', 'updated_date',
+    ),
+    'compliance': (
+        'id', 'staff_id', 'agency_id', 'document_type', 'document_name', 'document_url', 'issue_date',
+        'expiry_date', 'status', 'created_by', 'issuing_authority', 'reference_number', 'reminder_30d_sent',
+        'reminder_14d_sent', 'created_date', 'updated_date',
+    ),
+    'groups': (
+        'id', 'agency_id', 'name', 'description', 'staff_members', 'created_date', 'updated_date',
+    ),
+    'admin_workflows': (
+        'id', 'agency_id', 'type', 'priority', 'title', 'status', 'created_by', 'related_entity', 'deadline',
+        'auto_created', 'escalation_count', 'created_date', 'updated_date',
+    ),
+    'change_logs': (
+        'id', 'agency_id', 'change_type', 'affected_entity_type', 'affected_entity_id', 'old_value',
+        'new_value', 'reason', 'changed_by_email', 'changed_at', 'risk_level', 'reviewed', 'created_date',
+        'updated_date',
+    ),
+    'operational_costs': (
+        'id', 'agency_id', 'cost_type', 'service_name', 'service_category', 'amount', 'paid_date', 'currency',
+        'status', 'created_by', 'billing_period', 'roi_impact', 'created_date', 'updated_date',
+    ),
+    'invoice_amendments': (
+        'id', 'agency_id', 'amendment_type', 'amendment_reason', 'original_invoice_id',
+        'amendment_version', 'original_total', 'amended_total', 'total_difference', 'status', 'created_by',
+        'changes_made', 'risk_level', 'created_date', 'updated_date',
+    ),
+    'notification_queue': (
+        'id', 'agency_id', 'notification_type', 'recipient_type', 'recipient_email', 'recipient_first_name',
+        'status', 'created_by', 'pending_items', 'item_count', 'created_date', 'updated_date',
+    ),
+}
+
+TABLES = list(COLUMNS)
+AUTH_TABLES = ('auth.users', 'auth.identities')
+
+# Columns that aren't plain scalars (text, numbers, booleans, dates), for seedgen.encoders
+COLUMN_KINDS = {
+    'auth.users': {'raw_app_meta_data': 'jsonb', 'raw_user_meta_data': 'jsonb'},
+    'auth.identities': {'identity_data': 'jsonb'},
+    'agencies': {'address': 'jsonb', 'bank_details': 'jsonb'},
+    'staff': {
+        'role_hierarchy': 'jsonb', 'employment_history': 'jsonb', 'references': 'jsonb', 'skills': 'jsonb',
+        'last_known_location': 'jsonb', 'address': 'jsonb', 'emergency_contact': 'jsonb', 'availability': 'jsonb',
+    },
+    'clients': {
+        'location_coordinates': 'jsonb', 'contact_person': 'jsonb', 'address': 'jsonb', 'preferred_staff': 'jsonb',
+        'internal_locations': 'jsonb', 'contract_terms': 'jsonb',
+    },
+    'shifts': {'shift_journey_log': 'jsonb', 'requirements': 'jsonb'},
+    'timesheets': {'clock_in_location': 'jsonb', 'clock_out_location': 'jsonb'},
+    'invoices': {'line_items': 'jsonb'},
+    'payslips': {'deductions': 'jsonb', 'bank_details': 'jsonb', 'timesheets': 'jsonb'},
+    'groups': {'staff_members': 'uuid[]'},
+    'admin_workflows': {'related_entity': 'jsonb'},
+    'invoice_amendments': {'changes_made': 'jsonb'},
+    'notification_queue': {'pending_items': 'jsonb'},
+}
+
+# Rows every scale unit adds to each table (with logins, profiles get 10 more: one per staff member)
+UNIT_ROWS = {
+    'auth.users': 14, 'auth.identities': 14, 'agencies': 2, 'profiles': 4, 'staff': 10, 'clients': 6,
+    'shifts': 15, 'bookings': 10, 'timesheets': 8, 'invoices': 3, 'payslips': 2, 'compliance': 12, 'groups': 2,
+    'admin_workflows': 3, 'change_logs': 5, 'operational_costs': 3, 'invoice_amendments': 1, 'notification_queue': 2,
+}
+STAFF_PROFILE_ROWS = 10
+
+# The tables each table's rows point at (and so must be generated first)
+DEPENDS = {
+    'auth.users': (),
+    'auth.identities': ('auth.users',),
+    'agencies': (),
+    'profiles': ('agencies', 'auth.users'),
+    'staff': ('agencies', 'auth.users'),
+    'clients': ('agencies', 'staff'),
+    'shifts': ('agencies', 'clients', 'staff'),
+    'bookings': ('agencies', 'shifts', 'staff', 'clients'),
+    'timesheets': ('agencies', 'bookings', 'staff', 'clients'),
+    'invoices': ('agencies', 'clients'),
+    'payslips': ('agencies', 'staff', 'timesheets'),
+    'compliance': ('staff', 'agencies'),
+    'groups': ('agencies', 'staff'),
+    'admin_workflows': ('agencies', 'shifts'),
+    'change_logs': ('agencies', 'shifts'),
+    'operational_costs': ('agencies',),
+    'invoice_amendments': ('agencies', 'invoices'),
+    'notification_queue': ('agencies', 'shifts'),
+}
+
+# Column-level foreign keys: table -> (column, referenced table) for every plain id column
+# (seedgen.verify also follows the id lists in clients.preferred_staff, payslips.timesheets,
+# groups.staff_members and the entity references in admin_workflows, change_logs and notification_queue)
+REFERENCES = {
+    'auth.identities': (('user_id', 'auth.users'),),
+    'profiles': (('id', 'auth.users'), ('agency_id', 'agencies')),
+    'staff': (('agency_id', 'agencies'), ('user_id', 'auth.users')),
+    'clients': (('agency_id', 'agencies'),),
+    'shifts': (('agency_id', 'agencies'), ('client_id', 'clients'), ('assigned_staff_id', 'staff'), ('booking_id', 'bookings')),
+    'bookings': (('agency_id', 'agencies'), ('shift_id', 'shifts'), ('staff_id', 'staff'), ('client_id', 'clients')),
+    'timesheets': (('agency_id', 'agencies'), ('booking_id', 'bookings'), ('staff_id', 'staff'), ('client_id', 'clients')),
+    'invoices': (('agency_id', 'agencies'), ('client_id', 'clients')),
+    'payslips': (('agency_id', 'agencies'), ('staff_id', 'staff')),
+    'compliance': (('staff_id', 'staff'), ('agency_id', 'agencies')),
+    'groups': (('agency_id', 'agencies'),),
+    'admin_workflows': (('agency_id', 'agencies'),),
+    'change_logs': (('agency_id', 'agencies'),),
+    'operational_costs': (('agency_id', 'agencies'),),
+    'invoice_amendments': (('agency_id', 'agencies'), ('original_invoice_id', 'invoices')),
+    'notification_queue': (('agency_id', 'agencies'),),
+}
+
+
+def with_dependencies(tables):
+    """`tables` plus everything they depend on, directly or not, in load order."""
+    needed, pending = set(), list(tables)
+    while pending:
+        table = pending.pop()
+        if table not in needed:
+            needed.add(table)
+            pending.extend(DEPENDS[table])
+    return [table for table in TABLES if table in needed]
+
+
+def expected_rows(tables, scale, logins=False):
+    """How many rows a run writes to `tables` at `scale`."""
+    rows = sum(UNIT_ROWS[table] for table in tables)
+    if logins and 'profiles' in tables:
+        rows += STAFF_PROFILE_ROWS
+    return rows * scale
+
+
+def quote_ident(name):
+    return f'"{name}"' if name in RESERVED else name
+
+
+def column_list(table):
+    """`col1, col2, ...` for `table`, quoting reserved words."""
+    return ', '.join(quote_ident(c) for c in COLUMNS[table])
@@ -0,0 +1,262 @@
+"""
+Optional NumPy backend: draw whole columns at once instead of row by row.
+
+The generators' --backend numpy path builds each table for a block of scale
+units from Columns draws - one NumPy call per column rather than one
+`random` call per value - and hands the columns to the output formats as a
+seedgen.encoders.Block, without building a row tuple per row: columns that
+are the same for every row or every unit are given once (Same, Repeat),
+and jsonb columns as JSON text put together from their value columns
+(json_objects) rather than a dict per row to serialize. Timestamps are
+integer second offsets from seedgen.rng.now() rendered with
+np.datetime_as_string, so no per-row datetime objects are created.
+Distributions match the pure-Python helpers in seedgen.common (inclusive
+integer ranges, uniform floats, uniform choices; tests/seedgen/
+test_vectorized.py compares the two backends' numeric columns); the values
+themselves differ, so a seeded numpy run is reproducible but not
+byte-identical to a seeded python run.
+
+Every method returns a plain list (Python ints, floats and strs), ready for
+the output formats. Methods ending in _array return NumPy arrays for column
+arithmetic, e.g. VAT on an array of subtotals; pass those to rounded().
+
+locate_timesheets() is seedgen.geo.locate_timesheets for a Block of
+timesheets: the same shares, ranges and geofence arithmetic, drawn a
+column at a time.
+"""
+
+import re
+import zlib
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from seedgen import geo, rng
+from seedgen.common import UK_CITIES, UK_STREETS, dumps
+from seedgen.encoders import Json
+
+POSTCODE_AREAS = ['TS', 'SR', 'NE']
+POSTCODE_LETTERS = 'ABDEFGHJLNPQRSTUWXYZ'
+_HEX_DIGITS = b'0123456789abcdef'
+# Where the 32 hex digits go in the 36-character UUID form
+_UUID_HEX_SLOTS = [i for i in range(36) if i not in (8, 13, 18, 23)]
+
+BACKENDS = ('python', 'numpy')
+
+# Scale units drawn per block; bounds the memory the numpy backend holds at once
+BLOCK_UNITS = 1000
+
+# Values whose JSON texts have no commas in them, and text that can't go into a JSON string as it is
+_JSON_SCALARS = {int, float, bool, type(None)}
+_JSON_ESCAPED = re.compile(r'["\\\x00-\x1f]')
+
+
+def available():
+    return np is not None
+
+
+def rounded(values, decimals):
+    """Round an array elementwise and return it as a list."""
+    return np.round(values, decimals).tolist()
+
+
+def json_objects(**fields):
+    """The JSON text of an object with these keys, in this order, for every row: what seedgen.common.dumps gives
+    for the dicts, without building them. A field is a list of values, one per row, or one value for every row;
+    at least one must be a list."""
+    pieces, text = [], '{'  # each row's text is the lists' values joined between the text that doesn't vary
+    for k, (key, values) in enumerate(fields.items()):
+        text += (',' if k else '') + dumps(key) + ':'
+        if not isinstance(values, list):
+            text += dumps(values)
+            continue
+        types = set(map(type, values))
+        if types == {str} and not _JSON_ESCAPED.search(''.join(values)):
+            pieces += [repeat(text + '"'), values]
+            text = '"'
+            continue
+        pieces += [repeat(text), _json_scalars(values) if types <= _JSON_SCALARS else map(dumps, values)]
+        text = ''
+    pieces.append(repeat(text + '}'))
+    return list(map(''.join, zip(*pieces)))
+
+
+def _json_scalars(values):
+    """dumps() of each of `values` (numbers, booleans or None), split out of one dumps() of them all."""
+    return dumps(values)[1:-1].split(',') if values else []
+
+
+def json_arrays(*items):
+    """The JSON text of an array of `items` for every row, each a list of JSON texts (one per row)."""
+    pieces = [repeat('[')]
+    for k, texts in enumerate(items):
+        pieces += [repeat(','), texts] if k else [texts]
+    return list(map(''.join, zip(*pieces, repeat(']'))))
+
+
+def unit_picks(values, per_unit, picks):
+    """values[k * per_unit + p] for every unit k and each p in `picks` (None for a pick of None), unit by unit:
+    `values` holds every unit's `per_unit` values end to end, and the column has len(picks) rows a unit."""
+    offsets = np.array([-1 if p is None else p for p in picks], dtype=np.int64)
+    index = np.arange(len(values) // per_unit, dtype=np.int64)[:, None] * per_unit + offsets
+    index[:, offsets < 0] = len(values)
+    return np.array(values + [None], dtype=object)[index.ravel()].tolist()
+
+
+def _render_distinct(values, render):
+    """render(array) for an array with few distinct values: render each one once, then look them up."""
+    distinct, positions = np.unique(values, return_inverse=True)
+    return np.array(render(distinct), dtype=object)[positions].tolist()
+
+
+class Columns:
+    """Column draws for `n` rows of `table`, starting at row-block `start`.
+
+    Seeded runs (seedgen.rng.configure) give each (table, start) block its own
+    NumPy stream, so a block's columns don't depend on the blocks before it.
+    """
+
+    def __init__(self, table, start, n):
+        if np is None:
+            raise RuntimeError("The numpy backend needs the 'numpy' package: pip install numpy")
+        seed, as_of = rng.settings()
+        entropy = None if seed is None else [seed % 2**64, zlib.crc32(table.encode()), start]
+        self.g = np.random.default_rng(entropy)
+        self.n = n
+        base = rng.now()
+        self._today = np.datetime64(base.date(), 'D')
+        self._now = np.datetime64(base.replace(microsecond=0), 's')
+        self._micros = f'.{base.microsecond:06d}' if base.microsecond else ''
+
+    # Numbers
+    def integers_array(self, low, high):
+        """Integers in [low, high], like random.randint."""
+        return self.g.integers(low, high, self.n, endpoint=True)
+
+    def integers(self, low, high):
+        return self.integers_array(low, high).tolist()
+
+    def uniform_array(self, low, high):
+        return self.g.uniform(low, high, self.n)
+
+    def uniform(self, low, high, decimals=None):
+        values = self.uniform_array(low, high)
+        return values.tolist() if decimals is None else rounded(values, decimals)
+
+    def choice(self, options):
+        picks = self.g.integers(0, len(options), self.n)
+        return [options[i] for i in picks.tolist()]
+
+    # Strings
+    def uuids(self):
+        """Random (version 4) UUID strings."""
+        raw = self.g.integers(0, 256, (self.n, 16), dtype=np.uint8)
+        raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+        raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+        nibbles = np.stack([raw >> 4, raw & 0x0F], axis=2).reshape(self.n, 32)
+        text = np.full((self.n, 36), ord('-'), dtype=np.uint8)
+        text[:, _UUID_HEX_SLOTS] = np.frombuffer(_HEX_DIGITS, dtype=np.uint8)[nibbles]
+        return text.view('S36').ravel().astype('U36').tolist()
+
+    def phones(self):
+        return ['+44%d' % number for number in self.integers(7000000000, 7999999999)]
+
+    def postcodes(self):
+        return [f'{area}{d1} {d2}{l1}{l2}' for area, d1, d2, l1, l2 in zip(
+            self.choice(POSTCODE_AREAS), self.integers(1, 9), self.integers(1, 9),
+            self.choice(POSTCODE_LETTERS), self.choice(POSTCODE_LETTERS))]
+
+    def addresses(self):
+        """seedgen.common.gen_address() as JSON text, for a Json column."""
+        return json_objects(line1=list(map('{} {}'.format, self.integers(1, 999), self.choice(UK_STREETS))),
+                            city=self.choice(UK_CITIES), postcode=self.postcodes(), country='UK')
+
+    # Dates and timestamps, as offsets from seedgen.rng.now()
+    # (offsets span a few hundred days or hours, so each distinct one is rendered once)
+    def dates(self, day_offsets):
+        return _render_distinct(np.asarray(day_offsets), lambda days:
+                                np.datetime_as_string(self._today + days.astype('timedelta64[D]'), unit='D').tolist())
+
+    def timestamps(self, second_offsets):
+        return _render_distinct(np.asarray(second_offsets), lambda seconds: [
+            stamp + self._micros for stamp in
+            np.datetime_as_string(self._now + seconds.astype('timedelta64[s]'), unit='s').tolist()])
+
+    def dates_ago(self, days):
+        return self.dates(-self.integers_array(0, days))
+
+    def dates_future(self, days):
+        return self.dates(self.integers_array(1, days))
+
+    def timestamps_ago(self, days):
+        return self.timestamps(-(self.integers_array(0, days) * 86400 + self.integers_array(0, 23) * 3600))
+
+    def timestamps_future(self, days):
+        return self.timestamps(self.integers_array(1, days) * 86400)
+
+
+def _distance(a_latitude, a_longitude, b_latitude, b_longitude):
+    """seedgen.geo.distance for arrays."""
+    a_latitude, b_latitude = np.radians(a_latitude), np.radians(b_latitude)
+    h = (np.sin((b_latitude - a_latitude) / 2) ** 2 +
+         np.cos(a_latitude) * np.cos(b_latitude) * np.sin(np.radians(b_longitude - a_longitude) / 2) ** 2)
+    return 2 * geo.EARTH_RADIUS * np.arctan2(np.sqrt(h), np.sqrt(1 - h))
+
+
+def locate_timesheets(block, geography, start):
+    """seedgen.geo.locate_timesheets for a Block of timesheets from row-block `start`."""
+    n = len(block)
+    if not n:
+        return block.replace(**{column: [] for column in geo.GPS_COLUMNS})
+    c = Columns('timesheet_locations', start, n)
+    if geography == 'newcastle':  # every client at the one site
+        latitude, longitude, radius = (np.full(n, value) for value in geo.client_site(None))
+    else:
+        clients = block.values('client_id')
+        sites = {client_id: k for k, client_id in enumerate(dict.fromkeys(clients))}
+        latitude, longitude, radius = (np.array(values)[np.fromiter(map(sites.__getitem__, clients), np.int64, n)]
+                                       for values in zip(*[geo.client_site(client_id, geography) for client_id in sites]))
+    behaviour = c.uniform_array(0, 1)
+    off_site = behaviour < geo.OFF_SITE_SHARE
+    stray = ~off_site & (behaviour < geo.OFF_SITE_SHARE + geo.STRAY_SHARE)
+    far = c.uniform_array(1.5, 20) * radius
+
+    def fixes(timestamps):
+        """(JSON text of one fix per row, whole metres from the site as an array)."""
+        metres = np.where(off_site, far * c.uniform_array(0.9, 1.1),
+                          np.where(stray, radius * c.uniform_array(0.8, 1.4), radius * 0.8 * np.sqrt(c.uniform_array(0, 1))))
+        bearing = 2 * np.pi * c.uniform_array(0, 1)
+        point_latitude = np.round(latitude + metres * np.cos(bearing) / geo.METRES_PER_DEGREE, 6)
+        point_longitude = np.round(longitude + metres * np.sin(bearing) /
+                                   (geo.METRES_PER_DEGREE * np.cos(np.radians(latitude))), 6)
+        accuracy = np.where(c.uniform_array(0, 1) < 0.9, c.uniform_array(3, 25), c.uniform_array(25, geo.MAX_ACCURACY))
+        away = np.round(_distance(latitude, longitude, point_latitude, point_longitude)).astype(np.int64)
+        return json_objects(latitude=point_latitude.tolist(), longitude=point_longitude.tolist(),
+                            accuracy=np.round(accuracy, 1).tolist(), timestamp=timestamps), away
+
+    clocked_in, clocked_out = block.values('clock_in_time'), block.values('clock_out_time')
+    (clock_in, in_away), (clock_out, out_away) = fixes(clocked_in), fixes(clocked_out)
+    fence = radius.tolist()
+    validated = verified = (in_away <= radius).tolist()
+    out_validated = (out_away <= radius).tolist()
+    in_away, out_away = in_away.tolist(), out_away.tolist()
+    reasons = [None] * n
+    for k in [k for k, inside in enumerate(validated) if not inside]:
+        reasons[k] = f"Staff was {in_away[k]}m away (limit: {fence[k]}m)"
+    if None in clocked_in or None in clocked_out:
+        # A timesheet not clocked in keeps its flags and gets no GPS columns; one not clocked out, no clock-out ones
+        validated, verified = block.values('geofence_validated')[:], block.values('location_verified')[:]
+        for k, (came, left) in enumerate(zip(clocked_in, clocked_out)):
+            if came is None:
+                clock_in[k] = in_away[k] = reasons[k] = None
+            else:
+                validated[k] = verified[k] = in_away[k] <= fence[k]
+            if came is None or left is None:
+                clock_out[k] = out_validated[k] = out_away[k] = None
+    return block.replace(geofence_validated=validated, location_verified=verified, clock_in_location=Json(clock_in),
+                         clock_out_location=Json(clock_out), geofence_distance_meters=in_away,
+                         geofence_violation_reason=reasons, clock_out_geofence_validated=out_validated,
+                         clock_out_geofence_distance_meters=out_away)
@@ -0,0 +1,496 @@
+"""
+Consistency checks for a generated seed dataset, in one streaming pass.
+
+    verifier = Verifier()
+    verifier.feed(sql_blocks(split_statements(open_sql(path))))
+    report = verifier.finish()
+
+The rows are read once, in file order, as (table, columns, rows) blocks -
+an INSERT statement, a COPY block or a CSV file (csv_blocks) - with every
+value as text, the way COPY writes it. Nothing is held per row except what
+a later row is checked against:
+
+    every table     a 64-bit hash of each id, for primary key uniqueness and
+                    the references to it
+    shifts          its client, date and assigned staff      (bookings)
+    bookings        its staff, client and shift date         (timesheets)
+    timesheets      its staff and pay                        (payslips)
+    clients         its site and geofence radius             (timesheets)
+    invoices        its total                                (amendments)
+
+IDs are kept as hashes and dates as day ordinals, never as the row's text,
+but every row has an id, so memory is still linear in rows: about 85 bytes
+an id, plus 190-240 bytes a shift, booking, timesheet or client. A dataset
+with 5 million shifts (about 30 million rows) needs around 5 GB. The hashes
+are Python's 64-bit string hash; a collision (around 1 in 10^6 at ten
+million keys) could only hide a dangling reference or a mismatch, or
+report a false duplicate.
+
+The files are in foreign-key order, so a reference is normally checked the
+moment it is read; one to a row not seen yet (shifts.booking_id) is kept
+and checked at the end. References to a table with no rows in the input at
+all (auth.users without --auth-users) are counted as unchecked rather than
+missing. A top-up delta references its base dataset, so feed the base
+first; read on its own, the delta's references to base rows fail.
+
+CHECKS lists what is checked; Verifier(skip=...) leaves some out.
+"""
+
+import csv
+import json
+import os
+import re
+from collections import Counter
+from datetime import date, datetime
+
+from seedgen import geo
+from seedgen.sqlsplit import open_sql
+from seedgen.tables import COLUMNS, REFERENCES, TABLES
+
+CHECKS = {
+    'unique': 'ids (and invoice and payslip numbers) are not repeated',
+    'references': 'every foreign key, id list and entity reference points at a row in the input',
+    'consistency': 'bookings agree with their shift (client, date and assigned staff) and timesheets with their '
+                   'booking (staff, client, date)',
+    'shift_hours': 'shift duration_hours = end_time - start_time',
+    'timesheet_hours': 'timesheet total_hours = clock-out - clock-in - break',
+    'timesheet_pay': 'staff_pay_amount = total_hours x pay_rate, client_charge_amount = total_hours x charge_rate',
+    'margin': 'charge_rate >= pay_rate on shifts and timesheets',
+    'invoice_totals': 'vat_amount = subtotal x vat_rate, total = subtotal + vat_amount, 0 <= balance_due <= total, '
+                      'line item amounts = quantity x rate and add up to the subtotal',
+    'payslip_totals': 'total_deductions = the deductions\' tax + national_insurance + pension + other, '
+                      'net_pay = gross_pay - total_deductions, gross_pay = its timesheets\' pay, all the payslip\'s '
+                      'staff member\'s',
+    'amendment_totals': 'total_difference = amended_total - original_total, original_total = the invoice\'s total',
+    'periods': 'period_start <= period_end (invoices, payslips), due_date >= invoice_date',
+    'geofence': 'timesheets\' clock-in and clock-out distances and geofence flags agree with the client\'s site and radius',
+}
+
+MAX_EXAMPLES = 5
+CENT = 0.01 + 1e-9
+TENTH = 0.05 + 1e-9  # hours are rounded to 0.1
+METRE = 1.0
+
+# Entity types in admin_workflows.related_entity, change_logs and notification_queue.pending_items
+ENTITY_TABLES = {'shift': 'shifts', 'booking': 'bookings', 'timesheet': 'timesheets', 'invoice': 'invoices',
+                 'staff': 'staff', 'client': 'clients', 'agency': 'agencies'}
+
+_INSERT = re.compile(r'INSERT\s+INTO\s+\S+\s*\((?P<columns>[^)]*)\)\s*VALUES\s*', re.IGNORECASE)
+_COPY = re.compile(r'COPY\s+\S+\s*\((?P<columns>[^)]*)\)\s*FROM\s+STDIN', re.IGNORECASE)
+_VALUE = re.compile(r"""\s*(?:'(?P<text>(?:[^']+|'')*)'(?:::\w+(?:\[\])?)?|(?P<null>NULL)|(?P<bool>true|false)"""
+                    r"""|ARRAY\[(?P<array>[^\]]*)\](?:::\w+(?:\[\])?)?|(?P<number>[-+\w.]+))\s*(?P<end>[,)])""",
+                    re.IGNORECASE)
+_COPY_UNESCAPE = re.compile(r'\\(.)')
+_COPY_ESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', '\\': '\\'}
+_STATEMENT_KINDS = {'BEGIN', 'START', 'COMMIT', 'END', 'ROLLBACK', 'SET', None}
+
+
+class VerifyError(Exception):
+    """The input can't be read as seed data."""
+
+
+def _columns(text):
+    return tuple(column.strip().strip('"') for column in text.split(','))
+
+
+def _insert_rows(text, pos):
+    """The rows of an INSERT's VALUES list from `pos` on, each a list of COPY-style text values."""
+    while True:
+        pos = text.find('(', pos)
+        if pos < 0:
+            return
+        pos += 1
+        row = []
+        while True:
+            match = _VALUE.match(text, pos)
+            if match is None:
+                raise VerifyError(f"can't read the INSERT value at {text[pos:pos + 60]!r}")
+            value, null, boolean, array, number, end = match.group('text', 'null', 'bool', 'array', 'number', 'end')
+            if value is not None:
+                row.append(value.replace("''", "'") if "''" in value else value)
+            elif null is not None:
+                row.append(None)
+            elif boolean is not None:
+                row.append('t' if boolean.lower() == 'true' else 'f')
+            elif array is not None:
+                row.append('{' + ','.join(item.strip().strip("'") for item in array.split(',') if item.strip()) + '}')
+            else:
+                row.append(number)
+            pos = match.end()
+            if end == ')':
+                break
+        yield row
+
+
+def _copy_value(value):
+    if value == '\\N':
+        return None
+    if '\\' in value:
+        return _COPY_UNESCAPE.sub(lambda match: _COPY_ESCAPES.get(match.group(1), match.group(1)), value)
+    return value
+
+
+def _copy_rows(lines):
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line == '\\.':
+            return
+        # Without a backslash there is no \N or escape to undo
+        yield [_copy_value(value) for value in line.split('\t')] if '\\' in line else line.split('\t')
+
+
+def sql_blocks(statements, unverified=None):
+    """(table, columns, rows) for each INSERT and COPY in `statements` (from seedgen.sqlsplit).
+
+    Other statements that change rows (UPDATE, DELETE, ...) are counted per
+    kind in `unverified`; transaction control, SET and comments are skipped.
+    """
+    for statement in statements:
+        if statement.kind == 'INSERT':
+            match = _INSERT.search(statement.text)
+            if match is None:
+                raise VerifyError(f"can't read the columns of {statement.text[:80]!r}")
+            yield statement.table, _columns(match.group('columns')), _insert_rows(statement.text, match.end())
+        elif statement.kind == 'COPY' and statement.data:
+            match = _COPY.search(statement.text)
+            if match is None:
+                raise VerifyError(f"can't read the columns of {statement.text[:80]!r}")
+            yield statement.table, _columns(match.group('columns')), _copy_rows(statement.data)
+        elif statement.kind not in _STATEMENT_KINDS and unverified is not None:
+            unverified[statement.kind] += 1
+
+
+def csv_blocks(directory):
+    """(table, columns, rows) for each table CSV in `directory` (as written by --format csv), in foreign-key order."""
+    for table in TABLES:
+        for extension in ('.csv', '.csv.gz', '.csv.zst'):
+            path = os.path.join(directory, table + extension)
+            if os.path.exists(path):
+                with open_sql(path) as f:
+                    yield table, COLUMNS[table], ([value or None for value in row] for row in csv.reader(f))
+                break
+
+
+def _number(value):
+    return None if value is None else float(value)
+
+
+def _timestamp(value):
+    return datetime.fromisoformat(value)
+
+
+def _day(value):
+    """A date (or the date of a timestamp) as its ordinal, None for NULL."""
+    return None if value is None else date.fromisoformat(value[:10]).toordinal()
+
+
+def _hours_between(start, end):
+    """Hours from `start` to `end`: timestamps, or HH:MM[:SS] times (an end before the start is the next day)."""
+    if 'T' in start or ' ' in start.strip():
+        return (_timestamp(end) - _timestamp(start)).total_seconds() / 3600
+    seconds = [sum(float(part) * 60 ** (2 - k) for k, part in enumerate(value.split(':'))) for value in (start, end)]
+    return ((seconds[1] - seconds[0]) % 86400) / 3600
+
+
+def _date_text(day):
+    return None if day is None else date.fromordinal(day).isoformat()
+
+
+def _ids(value):
+    """The ids in a jsonb list or uuid[] value."""
+    if value is None:
+        return []
+    if value.startswith('{'):
+        return [item for item in value[1:-1].split(',') if item and item != 'NULL']
+    return [item for item in json.loads(value) if item is not None]
+
+
+class Verifier:
+    """Checks (table, columns, rows) blocks as they stream past; finish() gives the Report."""
+
+    def __init__(self, skip=(), max_examples=MAX_EXAMPLES):
+        unknown = set(skip) - set(CHECKS)
+        if unknown:
+            raise ValueError(f"Unknown check(s) {', '.join(sorted(unknown))} (expected some of {', '.join(CHECKS)})")
+        self.enabled = set(CHECKS) - set(skip)
+        self.max_examples = max_examples
+        self.rows = Counter()
+        self.failures = Counter()
+        self.examples = {check: [] for check in CHECKS}
+        self.keys = {table: set() for table in TABLES}
+        self.numbers = {'invoices': set(), 'payslips': set()}
+        self.pending = []  # (target table, key hash, table, row id, column, value) of references to rows not seen yet
+        self.unchecked = Counter()  # target table -> references to a table with no rows in the input
+        self.shifts, self.bookings, self.timesheets, self.clients, self.invoices = {}, {}, {}, {}, {}
+        self._handlers = {}
+
+    def fail(self, check, table, row_id, message):
+        self.failures[check] += 1
+        if len(self.examples[check]) < self.max_examples:
+            self.examples[check].append(f"{table} {row_id}: {message}" if row_id is not None else f"{table}: {message}")
+
+    def feed(self, blocks):
+        for table, columns, rows in blocks:
+            if table not in COLUMNS:
+                raise VerifyError(f"rows for unknown table {table!r}")
+            handle = self._handlers.get((table, columns))
+            if handle is None:
+                handle = self._handlers[table, columns] = self._handler(table, columns)
+            count = 0
+            for values in rows:
+                if len(values) != len(columns):
+                    raise VerifyError(f"{table}: a row has {len(values)} values for {len(columns)} columns")
+                handle(dict(zip(columns, values)))
+                count += 1
+            self.rows[table] += count
+
+    def _handler(self, table, columns):
+        """The function that checks one `table` row (a column -> text dict)."""
+        check_row = getattr(self, '_' + table.replace('.', '_'), None)
+        keys = self.keys[table] if 'id' in columns else None
+        references = [(column, target) for column, target in REFERENCES.get(table, ()) if column in columns]
+        unique, referenced = 'unique' in self.enabled, 'references' in self.enabled
+
+        def handle(row):
+            if keys is not None:
+                key = hash(row['id'])
+                if key in keys:
+                    if unique:
+                        self.fail('unique', table, row['id'], 'repeated id')
+                else:
+                    keys.add(key)
+            if referenced:
+                for column, target in references:
+                    value = row[column]
+                    if value is not None:
+                        self.reference(target, value, table, row, column)
+            if check_row is not None:
+                check_row(row)
+        return handle
+
+    def reference(self, target, value, table, row, column):
+        """Check that `value` is an id in `target`, now or (for rows still to come) at the end."""
+        key = hash(value)
+        if key not in self.keys[target]:
+            self.pending.append((target, key, table, row.get('id'), column, value))
+
+    def references(self, target, values, table, row, column):
+        if 'references' in self.enabled:
+            for value in values:
+                self.reference(target, value, table, row, column)
+
+    def entity(self, entity_type, entity_id, table, row, column):
+        target = ENTITY_TABLES.get(entity_type)
+        if target is not None and entity_id is not None:
+            self.references(target, [entity_id], table, row, column)
+
+    def check(self, check, condition, table, row, message):
+        """Record `message` against `row` if `check` is enabled and `condition` is false."""
+        if not condition and check in self.enabled:
+            self.fail(check, table, row.get('id'), message)
+
+    # Per-table checks: each gets the row as a column -> text dict (NULL is None)
+
+    def _clients(self, row):
+        if 'location_coordinates' in row and row['location_coordinates'] is not None:
+            site = json.loads(row['location_coordinates'])
+            radius = _number(row.get('geofence_radius_meters'))
+            self.clients[hash(row['id'])] = (site.get('latitude'), site.get('longitude'), radius)
+        if 'preferred_staff' in row:
+            self.references('staff', _ids(row['preferred_staff']), 'clients', row, 'preferred_staff')
+
+    def _shifts(self, row):
+        staff = row['assigned_staff_id']
+        self.shifts[hash(row['id'])] = (hash(row['client_id']), _day(row['date']), None if staff is None else hash(staff))
+        if row['duration_hours'] is not None and row['start_time'] and row['end_time']:
+            hours = _hours_between(row['start_time'], row['end_time'])
+            self.check('shift_hours', abs(float(row['duration_hours']) - hours) <= TENTH, 'shifts', row,
+                       f"duration_hours {row['duration_hours']}, but {row['start_time']} to {row['end_time']} is {hours:g}h")
+        self._margin('shifts', row)
+
+    def _bookings(self, row):
+        day = _day(row['shift_date'])
+        self.bookings[hash(row['id'])] = (hash((row['staff_id'], row['client_id'])), day)
+        shift = self.shifts.get(hash(row['shift_id']))
+        if shift is not None:
+            client, shift_day, staff = shift
+            self.check('consistency', client == hash(row['client_id']), 'bookings', row,
+                       f"client {row['client_id']} isn't its shift's")
+            self.check('consistency', shift_day == day, 'bookings', row,
+                       f"shift_date {row['shift_date']}, but its shift is on {_date_text(shift_day)}")
+            self.check('consistency', staff is None or staff == hash(row['staff_id']), 'bookings', row,
+                       f"staff {row['staff_id']}, but its shift is assigned to someone else")
+
+    def _timesheets(self, row):
+        hours, pay_rate, charge_rate = (_number(row[column]) for column in ('total_hours', 'pay_rate', 'charge_rate'))
+        pay = _number(row['staff_pay_amount'])
+        self.timesheets[hash(row['id'])] = (hash(row['staff_id']), pay)
+        booking = self.bookings.get(hash(row['booking_id']))
+        if booking is not None:
+            staff_and_client, booking_day = booking
+            self.check('consistency', staff_and_client == hash((row['staff_id'], row['client_id'])), 'timesheets', row,
+                       "staff or client isn't its booking's")
+            self.check('consistency', booking_day == _day(row['shift_date']), 'timesheets', row,
+                       f"shift_date {row['shift_date']}, but its booking's is {_date_text(booking_day)}")
+        if hours is not None and row['clock_in_time'] and row['clock_out_time']:
+            worked = _hours_between(row['clock_in_time'], row['clock_out_time']) - float(row['break_duration_minutes'] or 0) / 60
+            self.check('timesheet_hours', abs(hours - worked) <= TENTH, 'timesheets', row,
+                       f"total_hours {hours:g}, but clocked {row['clock_in_time']} to {row['clock_out_time']} "
+                       f"less the break is {worked:.2f}h")
+        if hours is not None and pay_rate is not None and pay is not None:
+            self.check('timesheet_pay', abs(pay - hours * pay_rate) <= CENT, 'timesheets', row,
+                       f"staff_pay_amount {pay:g} isn't {hours:g}h x {pay_rate:g}")
+        charge = _number(row['client_charge_amount'])
+        if hours is not None and charge_rate is not None and charge is not None:
+            self.check('timesheet_pay', abs(charge - hours * charge_rate) <= CENT, 'timesheets', row,
+                       f"client_charge_amount {charge:g} isn't {hours:g}h x {charge_rate:g}")
+        self._margin('timesheets', row)
+        self._geofence(row)
+
+    def _margin(self, table, row):
+        pay_rate, charge_rate = _number(row['pay_rate']), _number(row['charge_rate'])
+        if pay_rate is not None and charge_rate is not None:
+            self.check('margin', charge_rate >= pay_rate, table, row, f"charge_rate {charge_rate:g} < pay_rate {pay_rate:g}")
+
+    def _geofence(self, row):
+        """The clock-in and clock-out fixes of a timesheet against its client's site, in the whole metres
+        the geofence-validator function records."""
+        site = self.clients.get(hash(row['client_id']))
+        if site is None or None in site or 'geofence' not in self.enabled:
+            return
+        latitude, longitude, radius = site
+        for event, location, distance, validated in (
+                ('clock-in', 'clock_in_location', 'geofence_distance_meters', 'geofence_validated'),
+                ('clock-out', 'clock_out_location', 'clock_out_geofence_distance_meters', 'clock_out_geofence_validated')):
+            if row.get(location) is None or row.get(distance) is None:
+                continue
+            fix = json.loads(row[location])
+            away = geo.distance(latitude, longitude, fix['latitude'], fix['longitude'])
+            recorded = float(row[distance])
+            self.check('geofence', abs(away - recorded) <= METRE, 'timesheets', row,
+                       f"{event} {distance} {row[distance]}, but the fix is {away:.1f}m from the site")
+            if row.get(validated) is not None:
+                self.check('geofence', (row[validated] == 't') == (recorded <= radius), 'timesheets', row,
+                           f"{event} {validated} {row[validated]} at {row[distance]}m of a {radius:g}m fence")
+
+    def _invoices(self, row):
+        self._number_once('invoices', row, 'invoice_number')
+        subtotal, vat_rate, vat, total, balance = (_number(row[column]) for column in
+                                                   ('subtotal', 'vat_rate', 'vat_amount', 'total', 'balance_due'))
+        self.invoices[hash(row['id'])] = total
+        if subtotal is not None and vat_rate is not None and vat is not None:
+            self.check('invoice_totals', abs(vat - subtotal * vat_rate) <= CENT, 'invoices', row,
+                       f"vat_amount {vat:g} isn't {subtotal:g} x {vat_rate:g}")
+        if subtotal is not None and vat is not None and total is not None:
+            self.check('invoice_totals', abs(total - subtotal - vat) <= CENT, 'invoices', row,
+                       f"total {total:g} isn't subtotal {subtotal:g} + vat {vat:g}")
+        if balance is not None and total is not None:
+            self.check('invoice_totals', -CENT <= balance <= total + CENT, 'invoices', row,
+                       f"balance_due {balance:g} outside 0..total {total:g}")
+        if row['line_items'] is not None and subtotal is not None:
+            items = json.loads(row['line_items'])
+            for item in items:
+                if None not in (item.get('quantity'), item.get('rate'), item.get('amount')):
+                    self.check('invoice_totals', abs(item['amount'] - item['quantity'] * item['rate']) <= CENT, 'invoices', row,
+                               f"line item amount {item['amount']:.2f} isn't {item['quantity']} x {item['rate']:.2f}")
+            amounts = sum(item.get('amount') or 0 for item in items)
+            self.check('invoice_totals', abs(amounts - subtotal) <= CENT * max(len(items), 1), 'invoices', row,
+                       f"line items add up to {amounts:.2f}, subtotal is {subtotal:g}")
+        self._period('invoices', row)
+        if row['invoice_date'] and row['due_date']:
+            self.check('periods', row['due_date'] >= row['invoice_date'], 'invoices', row,
+                       f"due_date {row['due_date']} before invoice_date {row['invoice_date']}")
+
+    def _period(self, table, row):
+        if row['period_start'] and row['period_end']:
+            self.check('periods', row['period_start'] <= row['period_end'], table, row,
+                       f"period_start {row['period_start']} after period_end {row['period_end']}")
+
+    def _number_once(self, table, row, column):
+        if row[column] is not None and 'unique' in self.enabled:
+            key = hash(row[column])
+            if key in self.numbers[table]:
+                self.fail('unique', table, row['id'], f"repeated {column} {row[column]}")
+            self.numbers[table].add(key)
+
+    def _payslips(self, row):
+        self._number_once('payslips', row, 'payslip_number')
+        gross, deductions, net = (_number(row[column]) for column in ('gross_pay', 'total_deductions', 'net_pay'))
+        if row['deductions'] is not None and deductions is not None:
+            parts = json.loads(row['deductions'])
+            itemised = sum(parts.get(part) or 0 for part in ('tax', 'national_insurance', 'pension', 'other'))
+            self.check('payslip_totals', abs(deductions - itemised) <= CENT, 'payslips', row,
+                       f"total_deductions {deductions:g} isn't its deductions' {itemised:.2f}")
+        if None not in (gross, deductions, net):
+            self.check('payslip_totals', abs(net - gross + deductions) <= CENT, 'payslips', row,
+                       f"net_pay {net:g} isn't gross_pay {gross:g} - total_deductions {deductions:g}")
+        timesheet_ids = _ids(row['timesheets'])
+        self.references('timesheets', timesheet_ids, 'payslips', row, 'timesheets')
+        timesheets = [self.timesheets.get(hash(timesheet_id)) for timesheet_id in timesheet_ids]
+        if timesheets and None not in timesheets:
+            staff = hash(row['staff_id'])
+            self.check('payslip_totals', all(staff_id == staff for staff_id, _ in timesheets), 'payslips', row,
+                       f"pays for another staff member's timesheets")
+            if gross is not None and None not in [pay for _, pay in timesheets]:
+                paid = sum(pay for _, pay in timesheets)
+                self.check('payslip_totals', abs(gross - paid) <= CENT * len(timesheets), 'payslips', row,
+                           f"gross_pay {gross:g}, but its {len(timesheets)} timesheet(s) pay {paid:.2f}")
+        self._period('payslips', row)
+
+    def _groups(self, row):
+        self.references('staff', _ids(row['staff_members']), 'groups', row, 'staff_members')
+
+    def _admin_workflows(self, row):
+        if row['related_entity'] is not None:
+            entity = json.loads(row['related_entity'])
+            self.entity(entity.get('entity_type'), entity.get('entity_id'), 'admin_workflows', row, 'related_entity')
+
+    def _change_logs(self, row):
+        self.entity(row['affected_entity_type'], row['affected_entity_id'], 'change_logs', row, 'affected_entity_id')
+
+    def _notification_queue(self, row):
+        for item in json.loads(row['pending_items'] or '[]'):
+            self.entity(item.get('type'), item.get('id'), 'notification_queue', row, 'pending_items')
+
+    def _invoice_amendments(self, row):
+        original, amended, difference = (_number(row[column]) for column in ('original_total', 'amended_total', 'total_difference'))
+        if None not in (original, amended, difference):
+            self.check('amendment_totals', abs(difference - (amended - original)) <= CENT, 'invoice_amendments', row,
+                       f"total_difference {difference:g} isn't {amended:g} - {original:g}")
+        total = self.invoices.get(hash(row['original_invoice_id']))
+        if total is not None and original is not None:
+            self.check('amendment_totals', abs(original - total) <= CENT, 'invoice_amendments', row,
+                       f"original_total {original:g}, but the invoice's total is {total:g}")
+
+    def finish(self):
+        """Resolve the references to rows that came later, and return the Report."""
+        for target, key, table, row_id, column, value in self.pending:
+            if not self.rows[target]:
+                self.unchecked[target] += 1
+            elif key not in self.keys[target]:
+                self.fail('references', table, row_id, f"{column} {value}: no such {target} row")
+        self.pending = []
+        return Report(self.rows, self.failures, self.examples, self.unchecked, self.enabled)
+
+
+class Report:
+    """What a Verifier found: rows read per table, failures and examples per check, unchecked references."""
+
+    def __init__(self, rows, failures, examples, unchecked, enabled):
+        self.rows, self.failures, self.examples, self.unchecked, self.enabled = rows, failures, examples, unchecked, enabled
+
+    @property
+    def ok(self):
+        return not self.failures
+
+    def lines(self):
+        for check, description in CHECKS.items():
+            if check not in self.enabled:
+                yield f"[SKIP] {check}"
+                continue
+            failures = self.failures[check]
+            yield f"[{'FAIL' if failures else 'OK'}] {check}: " + (f"{failures} failure(s) - {description}" if failures else description)
+            for example in self.examples[check]:
+                yield f"         {example}"
+        for target, count in self.unchecked.items():
+            yield f"[WARN] {count} reference(s) to {target} not checked: it has no rows in the input"
@@ -0,0 +1,167 @@
+"""
+Workload profiles: how the second stage spreads shifts over clients, staff
+and time.
+
+    uniform     the original layout: each unit's 15 shifts go round-robin over
+                its own 6 clients and 10 staff, all 08:00-20:00 (12h), on
+                days drawn evenly from the horizon
+    production  the shapes production queries suffer from:
+                * clients are Zipf-ranked across the shard (--shard-units),
+                  so a handful of care homes get thousands of shifts, and
+                  the shift's agency is its client's agency
+                * staff are Zipf-ranked within that agency, so its top staff
+                  work hundreds of shifts
+                * day / night / early / late patterns, with Friday and
+                  weekend peaks
+                * status follows the date (past shifts completed or
+                  cancelled, future ones open, assigned or confirmed)
+                * URGENT_SHARE of shifts are urgent, unfilled marketplace
+                  shifts starting within the next 24 hours
+                Bookings and timesheets follow their shift's client, staff,
+                date and times instead of cycling through the unit.
+
+The horizon (--horizon BACK:AHEAD, default 14:7) is the range of shift dates
+in days either side of seedgen.rng.now(), for both profiles.
+
+A workload also says where the care homes are (--geography, see
+seedgen.geo), and so where timesheets are clocked in and out from.
+
+A production shift is planned from SHIFT_DRAWS uniform numbers, so the
+python backend (random.random()) and the numpy backend (a column of
+uniforms per draw) share the same plan() code.
+"""
+
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import timedelta
+from itertools import accumulate
+
+from seedgen.geo import GEOGRAPHIES
+from seedgen.rng import now
+
+WORKLOADS = ('uniform', 'production')
+DEFAULT_HORIZON = (14, 7)
+
+ZIPF_EXPONENT = 1.1
+URGENT_SHARE = 0.08
+# name, start hour, hours, share
+SHIFT_PATTERNS = [('day', 8, 12, 0.45), ('night', 20, 12, 0.30), ('early', 7, 8, 0.15), ('late', 14, 8, 0.10)]
+# Monday..Sunday: Friday and weekend shifts are the hard ones to fill
+WEEKDAY_WEIGHTS = (1.0, 1.0, 1.0, 1.0, 1.2, 1.6, 1.6)
+STAFFED_STATUSES = {'assigned', 'confirmed', 'completed', 'in_progress'}
+# A booking follows its shift; unlisted shift statuses give 'confirmed'
+BOOKING_STATUSES = {'open': 'pending', 'completed': 'completed', 'cancelled': 'cancelled'}
+
+# Per-unit layout of the manifest IDs (see complete_seed_generator.new_units)
+CLIENTS_PER_AGENCY = 3
+STAFF_PER_AGENCY = 5
+
+SHIFT_DRAWS = 8
+
+Shift = namedtuple('Shift', 'agency_id client_id staff_id status urgency day start_hour hours pattern marketplace created_hours '
+                            'pay_rate charge_rate', defaults=(None, None))
+
+
+def parse_horizon(text):
+    """'BACK:AHEAD' (or just 'BACK') days -> (back, ahead)."""
+    back, _, ahead = text.partition(':')
+    try:
+        horizon = (int(back), int(ahead) if ahead else DEFAULT_HORIZON[1])
+    except ValueError:
+        raise ValueError(f"expected BACK:AHEAD days, e.g. '90:30', not {text!r}") from None
+    if min(horizon) < 0:
+        raise ValueError(f'horizon days must be >= 0, not {text!r}')
+    return horizon
+
+
+def format_horizon(horizon):
+    return f'{horizon[0]}:{horizon[1]}'
+
+
+class Zipf:
+    """Ranks 0..n-1 with P(rank k) proportional to 1 / (k + 1) ** s, picked by a uniform draw."""
+
+    def __init__(self, n, s=ZIPF_EXPONENT):
+        self.cdf = list(accumulate(1 / (k + 1) ** s for k in range(n)))
+
+    def rank(self, r):
+        return min(bisect_right(self.cdf, r * self.cdf[-1]), len(self.cdf) - 1)
+
+
+class Workload:
+    """A workload profile, horizon and geography; picklable, so it can be handed to shard workers."""
+
+    def __init__(self, profile='uniform', horizon=DEFAULT_HORIZON, geography='newcastle'):
+        if profile not in WORKLOADS:
+            raise ValueError(f"Unknown workload '{profile}' (expected one of {', '.join(WORKLOADS)})")
+        if geography not in GEOGRAPHIES:
+            raise ValueError(f"Unknown geography '{geography}' (expected one of {', '.join(GEOGRAPHIES)})")
+        self.profile = profile
+        self.horizon = tuple(horizon)
+        self.geography = geography
+
+    @property
+    def skewed(self):
+        return self.profile == 'production'
+
+    def region(self, agencies, staff, clients):
+        """The shift plan for a shard whose units hold these IDs, or None for the uniform profile."""
+        return Region(self, agencies, staff, clients) if self.skewed else None
+
+
+class Region:
+    """One shard's clients and staff with their popularity ranks, and the shift dates on offer."""
+
+    def __init__(self, workload, agencies, staff, clients):
+        self.agencies, self.staff, self.clients = agencies, staff, clients
+        self._agency_slots = {agency_id: k for k, agency_id in enumerate(agencies)}
+        self.client_ranks = Zipf(len(clients))
+        self.staff_ranks = Zipf(STAFF_PER_AGENCY)
+        back, ahead = workload.horizon
+        today = now()
+        self.days = list(range(-back, ahead + 1))
+        self.day_cdf = list(accumulate(WEEKDAY_WEIGHTS[(today + timedelta(days=day)).weekday()] for day in self.days))
+        self.pattern_cdf = list(accumulate(share for *_, share in SHIFT_PATTERNS))
+
+    def _pick(self, cdf, r):
+        return min(bisect_right(cdf, r * cdf[-1]), len(cdf) - 1)
+
+    def plan(self, draws):
+        """Plan one shift from SHIFT_DRAWS uniform draws in [0, 1). Like every date here, `day` and
+        `start_hour` count from seedgen.rng.now() (midnight on seeded runs)."""
+        r_urgent, r_day, r_pattern, r_status, r_client, r_staff, r_hour, r_created = draws
+        k = self.client_ranks.rank(r_client)
+        agency = k // CLIENTS_PER_AGENCY
+        agency_id, client_id = self.agencies[agency], self.clients[k]
+        name, start_hour, hours, _ = SHIFT_PATTERNS[self._pick(self.pattern_cdf, r_pattern)]
+
+        if r_urgent < URGENT_SHARE:
+            # Marketplace burst: unfilled, starting some time in the next 24 hours, posted in the last 6
+            return Shift(agency_id, client_id, None, 'open', 'urgent', 0, 1 + int(r_hour * 23), hours, name, True,
+                         -int(r_created * 6))
+
+        day = self.days[self._pick(self.day_cdf, r_day)]
+        if day < 0:
+            status = 'cancelled' if r_status < 0.08 else 'completed'
+        elif day == 0:
+            status = 'in_progress' if r_status < 0.5 else 'confirmed'
+        else:
+            status = 'open' if r_status < 0.25 else 'assigned' if r_status < 0.55 else 'confirmed'
+        staff_id = None
+        if status in STAFFED_STATUSES:
+            staff_id = self.staff[agency * STAFF_PER_AGENCY + self.staff_ranks.rank(r_staff)]
+        # Posted 1-30 days before it starts, and not in the future
+        created_hours = min(day * 24 + start_hour - 24 - int(r_created * 24 * 29), 0)
+        return Shift(agency_id, client_id, staff_id, status, 'urgent' if status == 'open' and day <= 2 else 'normal',
+                     day, start_hour, hours, name, status == 'open', created_hours)
+
+    def staff_for(self, shift, r):
+        """The shift's staff member, or (for an unstaffed shift) one of its agency's, by rank."""
+        if shift.staff_id is not None:
+            return shift.staff_id
+        return self.staff[self._agency_slots[shift.agency_id] * STAFF_PER_AGENCY + self.staff_ranks.rank(r)]
+
+
+def timesheet_status(shift):
+    """Approved once the shift is over, submitted on the day, a draft before."""
+    return 'approved' if shift.day < 0 else 'submitted' if shift.day == 0 else 'draft'
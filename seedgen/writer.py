@@ -0,0 +1,114 @@
+"""
+Buffered, optionally compressed output stream for generated seed SQL.
+
+Generators hand statements to SeedWriter one at a time; the writer batches
+them into ~1 MB chunks before encoding, and flushes to the OS after every
+section so a downstream loader can start reading while generation is still
+running. Memory use is bounded by the buffer size, not by the row count.
+"""
+
+import gzip
+import os
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+
+def compression_for(path):
+    """Guess the compression from the file extension (.gz / .zst)."""
+    if path.endswith('.gz'): return 'gzip'
+    if path.endswith('.zst'): return 'zstd'
+    return 'none'
+
+
+class SeedWriter:
+    """Write generated SQL to `path`, plain, gzip or zstd.
+
+    `append=True` adds to an existing file. For compressed output this starts
+    a new gzip member / zstd frame, which standard decompressors read back as
+    one continuous stream.
+    """
+
+    def __init__(self, path, append=False, compression='auto', buffer_size=DEFAULT_BUFFER_SIZE):
+        if compression == 'auto':
+            compression = compression_for(path)
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}' (expected one of {', '.join(COMPRESSIONS)})")
+
+        self.path = path
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.chars_written = 0
+        self.statements_written = 0
+        self._pending = []
+        self._pending_size = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._raw = open(path, 'ab' if append else 'wb')
+        if compression == 'gzip':
+            self._stream = gzip.GzipFile(filename='', fileobj=self._raw, mode='wb', compresslevel=6, mtime=0)
+        elif compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                self._raw.close()
+                raise RuntimeError("zstd output needs the 'zstandard' package: pip install zstandard")
+            self._zstd_flush_mode = zstandard.FLUSH_BLOCK
+            self._stream = zstandard.ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+
+    def write(self, text):
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self.buffer_size:
+            self._drain()
+
+    def line(self, text=''):
+        self.write(text + '\n')
+
+    def section(self, header, statements):
+        """Write a `-- ...` header (str or list of lines), every statement, then a blank line."""
+        for header_line in ([header] if isinstance(header, str) else header):
+            self.line(header_line)
+        count = 0
+        for statement in statements:
+            self.line(statement)
+            count += 1
+        self.line()
+        self.statements_written += count
+        self.flush()
+        return count
+
+    def _drain(self):
+        if not self._pending:
+            return
+        chunk = ''.join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        self.chars_written += len(chunk)
+        self._stream.write(chunk.encode('utf-8'))
+
+    def flush(self):
+        self._drain()
+        if self.compression == 'zstd':
+            self._stream.flush(self._zstd_flush_mode)
+        else:
+            self._stream.flush()
+        self._raw.flush()
+
+    def close(self):
+        if self._raw.closed:
+            return
+        self._drain()
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,47 @@
+"""
+Shared helpers for the seed-data tooling tests (the generators, seedgen/ and
+scripts/find_refs.py). Run them from the repository root:
+
+    python -m pytest tests/seedgen
+
+The generator scripts are run as the command line runs them, in a
+subprocess from the repository root, with every output and manifest in the
+test's tmp_path.
+"""
+
+import csv
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+# The generators import seedgen from the root; find_billing_refs.py imports find_refs from scripts/
+for path in (ROOT, ROOT / 'scripts'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from seedgen.tables import COLUMNS  # noqa: E402
+
+
+def run(script, *args):
+    """Run one of the root scripts with `args`, failing the test (with its output) if it exits non-zero."""
+    result = subprocess.run([sys.executable, script, *map(str, args)], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, f'{script} {" ".join(map(str, args))}\n{result.stdout}\n{result.stderr}'
+    return result.stdout
+
+
+@pytest.fixture
+def run_script():
+    """run(), for a test."""
+    return run
+
+
+def read_csv(directory, table):
+    """A csv output directory's rows for `table`, as dicts by column name (an empty list if it wrote none)."""
+    path = Path(directory) / f'{table}.csv'
+    if not path.exists():
+        return []
+    with open(path, newline='', encoding='utf-8') as f:
+        return [dict(zip(COLUMNS[table], row)) for row in csv.reader(f)]
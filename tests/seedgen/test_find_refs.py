@@ -0,0 +1,85 @@
+"""scripts/find_refs.py: the Aho-Corasick matcher and where its hits are reported."""
+
+import pytest
+
+from find_refs import Automaton, _locate, scan
+
+
+def found(patterns, text):
+    automaton = Automaton(patterns)
+    return [(start, patterns[index]) for start, index in automaton.find(text.encode())]
+
+
+def locate(patterns, text, whole_words=True):
+    data = text.encode()
+    return [(line, column, patterns[index]) for line, column, index in _locate(data, Automaton(patterns), whole_words)]
+
+
+def test_overlapping_and_nested_patterns():
+    # every occurrence, in order of where it ends
+    assert found(['he', 'she', 'his', 'hers'], 'ushers') == [(1, 'she'), (2, 'he'), (2, 'hers')]
+    assert found(['he', 'she', 'his', 'hers'], 'hishershe') == [(0, 'his'), (2, 'she'), (3, 'he'), (3, 'hers'),
+                                                             (6, 'she'), (7, 'he')]
+
+
+def test_a_pattern_that_is_a_prefix_of_another():
+    assert found(['a', 'aa', 'aaa'], 'aaa') == [(0, 'a'), (0, 'aa'), (1, 'a'), (0, 'aaa'), (1, 'aa'), (2, 'a')]
+
+
+def test_repeated_and_duplicate_patterns():
+    automaton = Automaton(['ab', 'ab'])
+    assert sorted(automaton.find(b'abab')) == [(0, 0), (0, 1), (2, 0), (2, 1)]
+
+
+def test_whole_words():
+    assert locate(['he', 'she', 'hers'], 'she sells; hers, he\n') == [(1, 1, 'she'), (1, 12, 'hers'), (1, 18, 'he')]
+    assert locate(['he', 'she', 'hers'], 'ushers') == []
+    assert locate(['he', 'she', 'hers'], 'ushers', whole_words=False) == [(1, 2, 'she'), (1, 3, 'he'), (1, 3, 'hers')]
+
+
+@pytest.mark.parametrize('text, hit', [
+    ('amount', True),
+    ('x.amount()', True),
+    ('$amount', False),       # $ is part of an identifier in JS
+    ('amount$', False),
+    ('amount_due', False),
+    ('total_amount', False),
+    ('amount2', False),
+    ('"amount"', True),
+])
+def test_word_boundaries(text, hit):
+    assert bool(locate(['amount'], text)) == hit
+
+
+def test_patterns_with_a_dollar():
+    assert locate(['$store', 'store'], 'this.$store.get(store)') == [(1, 6, '$store'), (1, 17, 'store')]
+
+
+def test_hits_at_the_start_and_the_end_of_the_file():
+    assert locate(['foo'], 'foo') == [(1, 1, 'foo')]
+    assert locate(['foo', 'bar'], 'foo = 1;\nx = bar') == [(1, 1, 'foo'), (2, 5, 'bar')]
+
+
+def test_lines_and_columns():
+    text = 'const a = 1;\n\n  let b = a + a;\r\n\tb\n'
+    assert locate(['a', 'b'], text) == [(1, 7, 'a'), (3, 7, 'b'), (3, 11, 'a'), (3, 15, 'a'), (4, 2, 'b')]
+
+
+def test_columns_count_characters_not_bytes():
+    # é is 2 bytes, € 3 and the emoji 4: columns count them as one each (price is at byte 23)
+    assert locate(['price'], "label = 'é€ 🙂'; price\nnaïve price") == [(1, 17, 'price'), (2, 7, 'price')]
+
+
+def test_files(tmp_path):
+    empty = tmp_path / 'empty.js'
+    empty.write_bytes(b'')
+    one = tmp_path / 'one.js'
+    one.write_text("// 'café'\nexport const billing_email = x;", encoding='utf-8')
+    patterns = ['billing_email', 'email']
+    assert list(scan(patterns, [str(empty), str(one)])) == [(str(empty), []), (str(one), [(2, 14, 0)])]
+    assert list(scan(patterns, [str(one)], whole_words=False)) == [(str(one), [(2, 14, 0), (2, 22, 1)])]
+
+
+def test_a_missing_file_is_skipped_with_a_warning(tmp_path, capsys):
+    assert list(scan(['x'], [str(tmp_path / 'gone.js')])) == [(str(tmp_path / 'gone.js'), [])]
+    assert 'gone.js' in capsys.readouterr().err
@@ -0,0 +1,111 @@
+"""scripts/find_refs.py's token index: answers match a scan (--no-index) however the files change between runs."""
+
+import os
+
+import pytest
+
+from find_refs import Index, references, scan
+
+PATTERNS = ['billing_email', 'email', 'invoice', 'status', 'x$']
+FILES = {
+    'a.js': "const billing_email = invoice.email;\nif (status) send(billing_email);\n",
+    'b.ts': "// no hits here\nexport default 1;\n",
+    'c.jsx': "<Invoice status={invoice.status} email={user_email} x$={1} />\n",
+}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'src'
+    root.mkdir()
+    for name, text in FILES.items():
+        write(root / name, text)
+    return root
+
+
+def write(path, text, tick=[1_700_000_000 * 10**9]):
+    # A distinct mtime for every write, as separate runs would see them
+    path.write_text(text, encoding='utf-8')
+    tick[0] += 10**9
+    os.utime(path, ns=(tick[0], tick[0]))
+
+
+def paths_in(root):
+    return sorted(str(path) for path in root.iterdir())
+
+
+def assert_index_matches_scan(root, index):
+    paths = paths_in(root)
+    for whole_words in (True, False):
+        scanned = list(scan(PATTERNS, paths, whole_words=whole_words))
+        assert any(hits for _, hits in scanned)
+        assert list(references(PATTERNS, paths, whole_words=whole_words, index=str(index))) == scanned
+
+
+def refresh(root, index):
+    cache = Index(str(index))
+    stale = cache.refresh(paths_in(root))
+    cache.save()
+    return stale
+
+
+def test_fresh_index(tree, tmp_path):
+    assert_index_matches_scan(tree, tmp_path / 'index')
+    assert refresh(tree, tmp_path / 'index') == 0
+
+
+def test_edited_file(tree, tmp_path):
+    index = tmp_path / 'index'
+    assert_index_matches_scan(tree, index)
+    write(tree / 'a.js', "let status = 1;\n\n    const email = billing_email || invoice;\n")
+    write(tree / 'b.ts', "// no hits here\nexport default status;\n")
+    assert_index_matches_scan(tree, index)
+
+
+def test_edit_that_keeps_the_size(tree, tmp_path):
+    index = tmp_path / 'index'
+    assert_index_matches_scan(tree, index)
+    text = FILES['a.js'].replace('status', 'statu$')
+    assert len(text) == len(FILES['a.js'])
+    write(tree / 'a.js', text)
+    assert_index_matches_scan(tree, index)
+
+
+def test_touched_file_with_the_same_content(tree, tmp_path):
+    index = tmp_path / 'index'
+    assert_index_matches_scan(tree, index)
+    write(tree / 'c.jsx', FILES['c.jsx'])
+    # read again to check its SHA-1, which is unchanged, so its tokens are kept; then it's up to date
+    assert refresh(tree, index) == 1
+    assert refresh(tree, index) == 0
+    assert_index_matches_scan(tree, index)
+
+
+def test_deleted_file(tree, tmp_path):
+    index = tmp_path / 'index'
+    assert_index_matches_scan(tree, index)
+    (tree / 'a.js').unlink()
+    assert_index_matches_scan(tree, index)
+    assert str(tree / 'a.js') not in Index(str(index)).files
+
+
+def test_new_file(tree, tmp_path):
+    index = tmp_path / 'index'
+    assert_index_matches_scan(tree, index)
+    write(tree / 'd.tsx', "export const invoice_email = billing_email;\n")
+    write(tree / 'e.js', "")
+    assert_index_matches_scan(tree, index)
+
+
+def test_replaced_by_a_file_of_another_name(tree, tmp_path):
+    index = tmp_path / 'index'
+    assert_index_matches_scan(tree, index)
+    os.rename(tree / 'a.js', tree / 'z.js')
+    write(tree / 'a.js', "status\n")
+    assert_index_matches_scan(tree, index)
+
+
+def test_unreadable_index_starts_afresh(tree, tmp_path):
+    index = tmp_path / 'index'
+    index.write_bytes(b'not a pickle')
+    assert_index_matches_scan(tree, index)
@@ -0,0 +1,167 @@
+"""seedgen.sqlsplit: where statements end, what they write to, and COPY data."""
+
+import gzip
+import io
+
+import pytest
+
+from seedgen.sqlsplit import open_sql, split_statements
+
+
+def split(sql):
+    return list(split_statements(io.StringIO(sql)))
+
+
+def texts(sql):
+    return [statement.text for statement in split(sql)]
+
+
+def test_plain_statements_and_the_rest_of_the_line():
+    sql = "INSERT INTO a VALUES (1);\nINSERT INTO b VALUES (2); DELETE FROM c;  \n"
+    assert texts(sql) == ["INSERT INTO a VALUES (1);\n", "INSERT INTO b VALUES (2);", " DELETE FROM c;  \n"]
+    assert [statement.table for statement in split(sql)] == ['a', 'b', 'c']
+
+
+def test_the_text_is_kept_whole():
+    sql = "-- header\nBEGIN;\nINSERT INTO a VALUES ('x;y');\nCOMMIT;\n-- trailing\n"
+    assert ''.join(texts(sql)) == sql
+
+
+@pytest.mark.parametrize('literal', [
+    "'a;b'",
+    "'it''s; fine'",
+    "''';'''",
+    "'line one;\nline two;'",
+])
+def test_semicolons_in_quoted_strings(literal):
+    sql = f"INSERT INTO a VALUES ({literal});\nINSERT INTO b VALUES (1);\n"
+    assert texts(sql) == [f"INSERT INTO a VALUES ({literal});\n", "INSERT INTO b VALUES (1);\n"]
+
+
+@pytest.mark.parametrize('literal', [
+    r"E'a\';b'",
+    r"e'a\\'||';'",
+    r"E'tab\t; quote '' ;'",
+    "E'first;\\\nsecond;'",
+])
+def test_semicolons_in_escape_strings(literal):
+    sql = f"INSERT INTO a VALUES ({literal});\nINSERT INTO b VALUES (1);\n"
+    assert texts(sql) == [f"INSERT INTO a VALUES ({literal});\n", "INSERT INTO b VALUES (1);\n"]
+
+
+def test_e_inside_a_word_is_not_an_escape_string():
+    # the quote after "type" opens a plain string, where \' doesn't escape
+    sql = "INSERT INTO a VALUES (type'a\\');\nINSERT INTO b VALUES (1);\n"
+    assert len(split(sql)) == 2
+
+
+def test_semicolons_in_quoted_identifiers():
+    sql = 'INSERT INTO "odd;name" ("a;b", "say ""hi"";") VALUES (1);\nINSERT INTO b VALUES (2);\n'
+    statements = split(sql)
+    assert len(statements) == 2
+    assert statements[0].table == 'odd;name'
+
+
+@pytest.mark.parametrize('body', [
+    "$$ BEGIN x := 1; END; $$",
+    "$fn$ SELECT ';'; $$ not the end; $fn$",
+    "$a$ $b$ ; $b$ ; $a$",
+    "$body$\n  UPDATE t SET x = 1;\n  RETURN;\n$body$",
+])
+def test_semicolons_in_dollar_quoting(body):
+    sql = f"CREATE FUNCTION f() RETURNS void AS {body} LANGUAGE plpgsql;\nINSERT INTO b VALUES (1);\n"
+    statements = split(sql)
+    assert [statement.kind for statement in statements] == ['CREATE', 'INSERT']
+    assert body in statements[0].text
+
+
+def test_dollar_in_an_identifier_is_not_a_quote():
+    sql = "INSERT INTO a (col$1) VALUES (1);\nINSERT INTO b VALUES (2);\n"
+    assert len(split(sql)) == 2
+
+
+def test_semicolons_in_comments():
+    sql = ("-- a line comment; with 'a quote\n"
+           "INSERT INTO a VALUES (1); -- trailing; comment\n"
+           "/* block; /* nested; */ still; in */ INSERT INTO b VALUES (2);\n"
+           "/* over\n several; /* nested\n */ lines; */\n"
+           "INSERT INTO c VALUES (3);\n")
+    statements = split(sql)
+    assert [statement.table for statement in statements] == ['a', 'b', 'c']
+    # a comment after a line's last ; starts the next statement's text
+    assert statements[1].text == " -- trailing; comment\n/* block; /* nested; */ still; in */ INSERT INTO b VALUES (2);\n"
+
+
+def test_comments_before_a_statement_go_with_it():
+    statements = split("-- Section: staff\n/* note */\nINSERT INTO staff VALUES (1);\n")
+    assert len(statements) == 1
+    assert statements[0].kind == 'INSERT'
+    assert statements[0].table == 'staff'
+    assert statements[0].text.startswith('-- Section: staff\n')
+
+
+def test_trailing_comments_are_a_statement_without_a_kind():
+    statements = split("INSERT INTO a VALUES (1);\n-- the end\n")
+    assert statements[-1].kind is None
+    assert statements[-1].text == '-- the end\n'
+
+
+@pytest.mark.parametrize('sql, table', [
+    ('INSERT INTO public.staff VALUES (1);', 'staff'),
+    ('INSERT INTO auth.users VALUES (1);', 'auth.users'),
+    ('insert into "Mixed"."Case Name" values (1);', 'Mixed.Case Name'),
+    ('COPY Staff (id) FROM stdin;\n\\.\n', 'staff'),
+    ('UPDATE ONLY shifts SET x = 1;', 'shifts'),
+    ('DELETE FROM public . bookings;', 'bookings'),
+    ('TRUNCATE TABLE ONLY invoices CASCADE;', 'invoices'),
+    ('SELECT 1;', None),
+])
+def test_the_table_written_to(sql, table):
+    assert split(sql)[0].table == table
+
+
+def test_copy_data_is_not_split():
+    sql = ("COPY staff (id, note) FROM stdin;\n"
+           "1\thas; a semicolon and a ' quote\n"
+           "2\t$$ and /* not a comment\n"
+           "\\.\n"
+           "INSERT INTO a VALUES (1);\n")
+    statements = list(split_statements(io.StringIO(sql)))
+    assert [statement.kind for statement in statements] == ['COPY', 'INSERT']
+
+
+def test_copy_data_is_read_lazily_and_drained_if_unread():
+    lines = ["COPY staff (id) FROM stdin;\n", "1\n", "2\n", "\\.\n", "INSERT INTO a VALUES (1);\n",
+             "COPY b (id) FROM stdin;\n", "3\n", "\\.\n"]
+    statements = split_statements(iter(lines))
+    copy = next(statements)
+    assert copy.table == 'staff'
+    assert list(copy.data) == ["1\n", "2\n", "\\.\n"]
+    assert next(statements).table == 'a'
+    skipped = next(statements)  # its data is never read
+    assert skipped.table == 'b'
+    assert list(statements) == []
+
+
+def test_copy_to_stdout_has_no_data():
+    statements = split("COPY staff TO stdout;\nINSERT INTO a VALUES (1);\n")
+    assert statements[0].data == ()
+    assert statements[1].table == 'a'
+
+
+def test_statements_across_read_buffer_boundaries(tmp_path):
+    # Long multi-line statements read through a tiny buffer, so every quote, comment and ; lands on a boundary somewhere
+    statement = ("INSERT INTO a (note, doc) VALUES\n"
+                 "  ('x;''y', E'\\'; z'),\n"
+                 "  ($q$ ; $q$, '{\"k\": \"v;w\"}') /* c; /* d; */ */;\n")
+    sql = statement * 50 + "COPY b (id) FROM stdin;\n" + "".join(f"{n}\tv;{n}\n" for n in range(200)) + "\\.\n" + statement
+    raw = io.BufferedReader(io.BytesIO(sql.encode()), buffer_size=7)
+    with io.TextIOWrapper(raw, encoding='utf-8') as f:
+        statements = [(s.kind, s.table, sum(1 for _ in s.data)) for s in split_statements(f)]
+    assert statements == [('INSERT', 'a', 0)] * 50 + [('COPY', 'b', 201), ('INSERT', 'a', 0)]
+
+    path = tmp_path / 'seed.sql.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(sql)
+    with open_sql(str(path)) as f:
+        assert ''.join(s.text + ''.join(s.data) for s in split_statements(f)) == sql
@@ -0,0 +1,46 @@
+"""topup_seed_data.py on datasets from the two-script workflow (seed_data_generator.py, then complete_seed_generator.py)."""
+
+import json
+
+from conftest import read_csv
+
+
+def two_script_dataset(run_script, tmp_path, *stage1_args):
+    manifest = tmp_path / 'manifest'
+    run_script('seed_data_generator.py', '--seed', 5, '--format', 'csv', '--output', tmp_path / 'seed',
+               '--manifest', manifest, *stage1_args)
+    run_script('complete_seed_generator.py', '--format', 'csv', '--output', tmp_path / 'seed', '--manifest', manifest)
+    return manifest
+
+
+def test_two_script_manifest_records_the_run_settings(run_script, tmp_path):
+    manifest = two_script_dataset(run_script, tmp_path, '--auth-users', '--scale', 2, '--shard-units', 1)
+    meta = json.loads((manifest / 'meta.json').read_text())
+    assert meta['auth_users'] is True
+    assert meta['seed'] == 5
+    for key in ('scale', 'shard_units', 'backend', 'workload', 'horizon', 'as_of'):
+        assert key in meta, key
+
+
+def test_topup_staff_get_logins_when_the_dataset_has_them(run_script, tmp_path):
+    manifest = two_script_dataset(run_script, tmp_path, '--auth-users')
+    run_script('topup_seed_data.py', '--staff', 3, '--format', 'csv', '--output', tmp_path / 'topup', '--manifest', manifest)
+
+    staff = read_csv(tmp_path / 'topup', 'staff')
+    users = {row['id']: row for row in read_csv(tmp_path / 'topup', 'auth.users')}
+    identities = {row['user_id'] for row in read_csv(tmp_path / 'topup', 'auth.identities')}
+    profiles = {row['id'] for row in read_csv(tmp_path / 'topup', 'profiles')}
+    assert len(staff) == 3
+    for member in staff:
+        assert member['user_id'] in users
+        assert users[member['user_id']]['email'] == member['email']
+        assert member['user_id'] in identities
+        assert member['user_id'] in profiles
+
+
+def test_topup_staff_get_no_logins_when_the_dataset_has_none(run_script, tmp_path):
+    manifest = two_script_dataset(run_script, tmp_path)
+    run_script('topup_seed_data.py', '--staff', 3, '--format', 'csv', '--output', tmp_path / 'topup', '--manifest', manifest)
+
+    assert len(read_csv(tmp_path / 'topup', 'staff')) == 3
+    assert read_csv(tmp_path / 'topup', 'auth.users') == []
@@ -0,0 +1,99 @@
+"""The numpy backend (seedgen.vectorized, the batch_* generators): its Blocks render to the text the row
+encoders give, and its columns are drawn from the same distributions as the python backend's."""
+
+import json
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from conftest import read_csv, run  # noqa: E402
+from seedgen.common import dumps  # noqa: E402
+from seedgen.encoders import Block, Json, Repeat, Same, block_encoder, constant, row_encoder  # noqa: E402
+from seedgen.vectorized import json_arrays, json_objects  # noqa: E402
+
+SCALE = 200
+
+
+def test_json_objects_match_dumps():
+    # a list is a column, a value of one row each; anything else is every row's
+    fields = {'name': ['plain', 'say "hi"', 'back\\slash\n'], 'rate': [1, 2.5, -0.0], 'flag': [True, False, None],
+              'nested': [{'a': [1]}, None, 'x'], 'country': 'UK', 'source': {'kind': 'seed'}}
+    rows = [{key: value[k] if isinstance(value, list) else value for key, value in fields.items()} for k in range(3)]
+    assert json_objects(**fields) == [dumps(row) for row in rows]
+    assert [json.loads(text) for text in json_arrays(json_objects(n=[1, 2]), ['{}', '[]'])] == [[{'n': 1}, {}],
+                                                                                              [{'n': 2}, []]]
+
+
+@pytest.mark.parametrize('encoding', ['sql', 'copy', 'csv'])
+def test_a_block_renders_as_its_rows_do(encoding):
+    shared = constant({'line1': "O'Brien House", 'city': 'Leeds'})
+    block = Block('agencies', 4, {
+        'id': [f'00000000-0000-4000-8000-00000000000{n}' for n in range(4)],
+        'name': ["O'Brien Care", 'Tab\tand "quote"', 'back\\slash', 'plain'],
+        'created_by': Same(None), 'registration_number': ['GB1', None, 'GB3', None],
+        'contact_email': Repeat(['a@x.com', 'b@x.com']), 'contact_phone': Same('+44'), 'subscription_tier': Same('pro'),
+        'address': Same(shared), 'status': Repeat(['active', None]),
+        'bank_details': Json([dumps({'sort_code': '20-00-00'}), None, '{"a":"b\\\\c"}', dumps({'x': "it's"})]),
+        'dbs_check_expiry_alerts': [True, False, None, True], 'mandatory_training_reminders': Same(True),
+        'document_expiry_warnings': Same(False), 'auto_approve_timesheets': Repeat([True, False]),
+        'sms_shift_confirmations': Same(True), 'whatsapp_notifications': Same(True), 'auto_generate_invoices': Same(True),
+        'send_payment_reminders': Same(True), 'email_notifications': Same(True), 'sms_notifications': Same(True),
+        'whatsapp_global_notifications': Same(True), 'payment_terms_days': [30, 14, 0, -1],
+        'invoice_frequency': [0.5, 0.5, 0.5, 0.0],
+    })
+    assert block_encoder('agencies', encoding)(block) == list(map(row_encoder('agencies', encoding), block))
+
+
+def test_a_block_with_a_short_column_is_refused():
+    block = Block('profiles', 2, {'id': ['a', 'b'], 'full_name': ['x'], 'email': Same(None), 'phone': Same(None),
+                                  'user_type': Same(None), 'agency_id': Same(None), 'created_date': Same(None),
+                                  'role': Same(None), 'profile_photo_url': Repeat(['p', 'q', 'r'])})
+    with pytest.raises(ValueError, match='full_name has 1 values'):
+        block_encoder('profiles', 'copy')(block)
+
+
+@pytest.fixture(scope='module')
+def datasets(tmp_path_factory):
+    """The same seeded run on each backend, as csv."""
+    out = {}
+    for backend in ('python', 'numpy'):
+        directory = tmp_path_factory.mktemp(backend)
+        run('generate_seed_data.py', '--scale', SCALE, '--seed', 11, '--format', 'csv', '--backend', backend,
+            '--output', directory / 'csv', '--manifest', directory / 'ids')
+        out[backend] = directory / 'csv'
+    return out
+
+
+def numbers(directory, table, column):
+    values = [row[column] for row in read_csv(directory, table) if row[column] != '']
+    if values and values[0].count('-') == 2:  # a date
+        return np.array([date.fromisoformat(value[:10]).toordinal() for value in values], dtype=float)
+    return np.array(values, dtype=float)
+
+
+def ks_statistic(a, b):
+    """The two-sample Kolmogorov-Smirnov statistic: the largest gap between the two empirical CDFs."""
+    a, b = np.sort(a), np.sort(b)
+    points = np.concatenate([a, b])
+    return np.max(np.abs(np.searchsorted(a, points, 'right') / len(a) - np.searchsorted(b, points, 'right') / len(b)))
+
+
+@pytest.mark.parametrize('table, column', [
+    ('staff', 'hourly_rate'), ('staff', 'rating'), ('staff', 'months_of_experience'), ('staff', 'total_shifts_completed'),
+    ('staff', 'date_of_birth'),
+    ('clients', 'bed_capacity'), ('clients', 'total_bookings'), ('clients', 'rating'),
+    ('shifts', 'pay_rate'), ('shifts', 'charge_rate'), ('shifts', 'duration_hours'), ('shifts', 'date'),
+    ('timesheets', 'total_hours'), ('timesheets', 'staff_pay_amount'), ('timesheets', 'geofence_distance_meters'),
+    ('invoices', 'subtotal'), ('invoices', 'total'), ('payslips', 'gross_pay'), ('payslips', 'net_pay'),
+    ('compliance', 'expiry_date'),
+])
+def test_numeric_columns_are_drawn_alike(datasets, table, column):
+    python, numpy = numbers(datasets['python'], table, column), numbers(datasets['numpy'], table, column)
+    assert len(python) > 100 and len(numpy) > 100
+    # Means within 4 standard errors, and a KS test at the 0.1% level, which checks the spread too (a stdev
+    # swings too far on the long tail of geofence distances to compare on its own)
+    standard_error = np.sqrt(python.var() / len(python) + numpy.var() / len(numpy))
+    assert abs(python.mean() - numpy.mean()) <= 4 * standard_error + 1e-9, (python.mean(), numpy.mean())
+    assert ks_statistic(python, numpy) < 1.95 * np.sqrt((len(python) + len(numpy)) / (len(python) * len(numpy)))
@@ -0,0 +1,180 @@
+"""seedgen.verify on small hand-made datasets: a consistent one passes, and each planted violation is reported."""
+
+import copy
+import csv
+import io
+import json
+
+import pytest
+
+from seedgen.sqlsplit import split_statements
+from seedgen.tables import COLUMNS
+from seedgen.verify import CHECKS, Verifier, csv_blocks, sql_blocks
+
+AGENCY, CLIENT, STAFF, OTHER_STAFF = (f'00000000-0000-4000-8000-00000000000{n}' for n in range(1, 5))
+SHIFT, BOOKING, TIMESHEET, INVOICE, PAYSLIP = (f'00000000-0000-4000-8000-00000000001{n}' for n in range(1, 6))
+MISSING = '00000000-0000-4000-8000-0000000000ff'
+
+
+def dataset():
+    """One of everything, in foreign-key order, every check passing. Columns not given are NULL."""
+    site = {'latitude': 54.97, 'longitude': -1.61}
+    return [
+        ('agencies', [{'id': AGENCY, 'name': "O'Brien Care"}]),
+        ('staff', [{'id': STAFF, 'agency_id': AGENCY}, {'id': OTHER_STAFF, 'agency_id': AGENCY}]),
+        ('clients', [{'id': CLIENT, 'agency_id': AGENCY, 'location_coordinates': json.dumps(site),
+                      'geofence_radius_meters': '100', 'preferred_staff': json.dumps([STAFF])}]),
+        ('shifts', [{'id': SHIFT, 'agency_id': AGENCY, 'client_id': CLIENT, 'assigned_staff_id': STAFF,
+                     'date': '2025-11-03', 'start_time': '08:00', 'end_time': '20:00', 'duration_hours': '12',
+                     'pay_rate': '15', 'charge_rate': '22', 'booking_id': BOOKING}]),
+        ('bookings', [{'id': BOOKING, 'agency_id': AGENCY, 'shift_id': SHIFT, 'staff_id': STAFF, 'client_id': CLIENT,
+                       'shift_date': '2025-11-03'}]),
+        ('timesheets', [{'id': TIMESHEET, 'agency_id': AGENCY, 'booking_id': BOOKING, 'staff_id': STAFF,
+                         'client_id': CLIENT, 'shift_date': '2025-11-03', 'clock_in_time': '2025-11-03T08:00:00',
+                         'clock_out_time': '2025-11-03T20:00:00', 'break_duration_minutes': '30', 'total_hours': '11.5',
+                         'pay_rate': '15', 'charge_rate': '22', 'staff_pay_amount': '172.5',
+                         'client_charge_amount': '253', 'clock_in_location': json.dumps(site),
+                         'geofence_distance_meters': '0', 'geofence_validated': 't'}]),
+        ('invoices', [{'id': INVOICE, 'agency_id': AGENCY, 'client_id': CLIENT, 'invoice_number': 'INV-1',
+                       'invoice_date': '2025-11-10', 'due_date': '2025-12-10', 'period_start': '2025-11-03',
+                       'period_end': '2025-11-09', 'subtotal': '253', 'vat_rate': '0.2', 'vat_amount': '50.6',
+                       'total': '303.6', 'balance_due': '303.6',
+                       'line_items': json.dumps([{'description': "Day's care", 'quantity': 11.5, 'rate': 22,
+                                                  'amount': 253}])}]),
+        ('payslips', [{'id': PAYSLIP, 'agency_id': AGENCY, 'staff_id': STAFF, 'payslip_number': 'PAY-1',
+                       'period_start': '2025-11-03', 'period_end': '2025-11-09', 'gross_pay': '172.5',
+                       'deductions': json.dumps({'tax': 10, 'national_insurance': 5.5, 'pension': 0, 'other': 0}),
+                       'total_deductions': '15.5', 'net_pay': '157', 'timesheets': json.dumps([TIMESHEET])}]),
+    ]
+
+
+def planted(table, index=0, **changes):
+    """The dataset with `changes` made to one `table` row (with duplicate=True, to a copy of it added after it)."""
+    tables = copy.deepcopy(dataset())
+    rows = dict(tables)[table]
+    if changes.pop('duplicate', False):
+        rows.insert(index + 1, dict(rows[index], **changes))
+    else:
+        rows[index].update(changes)
+    return tables
+
+
+def insert_sql(tables):
+    def literal(value):
+        return 'NULL' if value is None else "'" + value.replace("'", "''") + "'"
+    lines = []
+    for table, rows in tables:
+        columns = COLUMNS[table]
+        values = ',\n'.join('(' + ', '.join(literal(row.get(column)) for column in columns) + ')' for row in rows)
+        lines.append(f'INSERT INTO {table} ({", ".join(columns)}) VALUES\n{values};\n')
+    return ''.join(lines)
+
+
+def copy_sql(tables):
+    def text(value):
+        return '\\N' if value is None else value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+    lines = []
+    for table, rows in tables:
+        columns = COLUMNS[table]
+        lines.append(f'COPY {table} ({", ".join(columns)}) FROM stdin;\n')
+        lines += ['\t'.join(text(row.get(column)) for column in columns) + '\n' for row in rows]
+        lines.append('\\.\n')
+    return ''.join(lines)
+
+
+def csv_dir(tables, directory):
+    for table, rows in tables:
+        with open(directory / f'{table}.csv', 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows([row.get(column) or '' for column in COLUMNS[table]] for row in rows)
+    return directory
+
+
+def verify(tables, form):
+    verifier = Verifier()
+    sql = insert_sql(tables) if form == 'insert' else copy_sql(tables)
+    verifier.feed(sql_blocks(split_statements(io.StringIO(sql))))
+    return verifier.finish()
+
+
+@pytest.fixture(params=['insert', 'copy'])
+def form(request):
+    return request.param
+
+
+def test_the_dataset_passes(form):
+    report = verify(dataset(), form)
+    assert report.ok, list(report.lines())
+    assert report.rows['staff'] == 2
+    assert report.rows['payslips'] == 1
+
+
+def test_the_dataset_passes_as_csv(tmp_path):
+    verifier = Verifier()
+    verifier.feed(csv_blocks(str(csv_dir(dataset(), tmp_path))))
+    report = verifier.finish()
+    assert report.ok, list(report.lines())
+
+
+# Each case plants one violation; `also` are the other checks it knocks on to (a timesheet's pay is its payslip's too)
+@pytest.mark.parametrize('tables, check, message, also', [
+    # a booking pointing at a shift that isn't there
+    (planted('bookings', shift_id=MISSING), 'references', f'bookings {BOOKING}: shift_id {MISSING}: no such shifts row', ()),
+    # a reference to a row that comes later (shifts.booking_id), to one that never does
+    (planted('shifts', booking_id=MISSING), 'references', f'shifts {SHIFT}: booking_id {MISSING}: no such bookings row', ()),
+    (planted('payslips', timesheets=json.dumps([TIMESHEET, MISSING])), 'references', f'timesheets {MISSING}: no such', ()),
+    # the same primary key twice
+    (planted('staff', index=1, id=STAFF), 'unique', f'staff {STAFF}: repeated id', ()),
+    (planted('invoices', duplicate=True, id=MISSING), 'unique', 'repeated invoice_number INV-1', ()),
+    # pay that isn't hours x rate
+    (planted('timesheets', staff_pay_amount='180'), 'timesheet_pay', "staff_pay_amount 180 isn't 11.5h x 15",
+     ['payslip_totals']),
+    (planted('timesheets', client_charge_amount='250'), 'timesheet_pay', "client_charge_amount 250 isn't 11.5h x 22", ()),
+    # line items that don't add up to the subtotal
+    (planted('invoices', line_items=json.dumps([{'quantity': 11.5, 'rate': 22, 'amount': 253},
+                                                {'quantity': 1, 'rate': 10, 'amount': 10}])),
+     'invoice_totals', 'line items add up to 263.00, subtotal is 253', ()),
+    (planted('invoices', line_items=json.dumps([{'quantity': 11.5, 'rate': 22, 'amount': 250}])),
+     'invoice_totals', "line item amount 250.00 isn't 11.5 x 22.00", ()),
+    (planted('invoices', total='300'), 'invoice_totals', "total 300 isn't subtotal 253 + vat 50.6", ()),
+    # a booking or timesheet that disagrees with its shift or booking
+    (planted('bookings', shift_date='2025-11-04'), 'consistency', 'shift_date 2025-11-04, but its shift is on 2025-11-03', ()),
+    (planted('bookings', staff_id=OTHER_STAFF), 'consistency', 'but its shift is assigned to someone else', ()),
+    (planted('timesheets', shift_date='2025-11-02'), 'consistency', "but its booking's is 2025-11-03", ()),
+    # hours, margins and periods
+    (planted('shifts', duration_hours='10'), 'shift_hours', 'duration_hours 10', ()),
+    (planted('timesheets', total_hours='12', staff_pay_amount='180', client_charge_amount='264'),
+     'timesheet_hours', 'total_hours 12, but clocked', ['payslip_totals']),
+    (planted('shifts', charge_rate='14'), 'margin', 'charge_rate 14 < pay_rate 15', ()),
+    (planted('payslips', period_end='2025-11-01'), 'periods', 'period_start 2025-11-03 after period_end 2025-11-01', ()),
+    # payslips: deductions, net pay, and the timesheets paid
+    (planted('payslips', total_deductions='15'), 'payslip_totals', "total_deductions 15 isn't its deductions' 15.50", ()),
+    (planted('payslips', gross_pay='180', net_pay='164.5'), 'payslip_totals',
+     'gross_pay 180, but its 1 timesheet(s) pay 172.50', ()),
+    (planted('payslips', staff_id=OTHER_STAFF), 'payslip_totals', "pays for another staff member's timesheets", ()),
+    # a clock-in fix the timesheet says is 250m out, but is at the site
+    (planted('timesheets', geofence_distance_meters='250', geofence_validated='f'), 'geofence',
+     'geofence_distance_meters 250, but the fix is 0.0m from the site', ()),
+])
+def test_a_planted_violation_is_reported(tables, check, message, also, form):
+    report = verify(tables, form)
+    assert set(report.failures) == {check, *also}, list(report.lines())
+    assert any(message in example for example in report.examples[check]), report.examples[check]
+    assert not report.ok
+
+
+def test_every_check_is_planted_above():
+    planted_checks = {'references', 'unique', 'timesheet_pay', 'invoice_totals', 'consistency', 'shift_hours',
+                      'timesheet_hours', 'margin', 'payslip_totals', 'periods', 'geofence'}
+    assert set(CHECKS) - planted_checks == {'amendment_totals'}  # no amendments in the dataset
+
+
+def test_skipped_checks_are_not_reported(form):
+    verifier = Verifier(skip=['timesheet_pay'])
+    verifier.feed(sql_blocks(split_statements(io.StringIO(insert_sql(planted('timesheets', client_charge_amount='250'))))))
+    assert verifier.finish().ok
+
+
+def test_references_to_a_table_missing_from_the_input_are_unchecked(form):
+    report = verify(planted('staff', user_id=MISSING), form)
+    assert report.ok
+    assert report.unchecked['auth.users'] == 1
@@ -0,0 +1,272 @@
+"""
+Seed data top-up - grow an already seeded (and loaded) dataset in place
+Reads the ID manifest the generators left behind and writes only the new
+rows, pointing at the agencies, staff and clients that are already there
+
+Usage:
+    python topup_seed_data.py --days 30                   # the next 30 days of shifts, bookings and timesheets
+    python topup_seed_data.py --days 30 --invoices        # ... and the invoice run for those 30 days
+    python topup_seed_data.py --staff 1000                # 1000 more staff, round-robin over the agencies
+    python topup_seed_data.py --days 7 --staff 50 --format copy --workers 4
+    python insert_seed_data.py --input supabase/seed_topup.sql --database-url postgresql://...  # load the delta
+
+Each run writes a fresh delta (default supabase/seed_topup.sql) and records
+in the manifest's meta what it added, so the next run carries on from
+there and never repeats an ID:
+
+    --days N    shifts for the N days after the last covered one (the
+                seeded horizon's end, or the previous top-up's), with their
+                bookings and timesheets. They come in the second stage's
+                units of 15 shifts, 10 bookings and 8 timesheets, with as
+                many units as keep the original density (scale units per
+                BACK+AHEAD+1 days). Each top-up unit takes the agencies,
+                staff and clients of an existing unit, continuing round from
+                where the last top-up stopped, and the dataset's workload
+                profile spreads them as it did the original shifts. Dates
+                count from the first new day, so the shifts are all ahead of
+                it. The new timesheets are clocked in and out around the
+                dataset's --geography.
+    --invoices  with --days: each top-up unit's 3 invoices, dated as of the
+                end of the new days, so they bill that period
+    --staff N   staff spread round-robin over the existing agencies, with
+                logins and staff profiles if the dataset has them
+                (--auth-users), placed by the dataset's --geography. Their
+                IDs go in the manifest's topup_staff list. The unit layout
+                the other tables follow stays as it was, so top-up shifts
+                don't pick them.
+
+Every top-up run gets its own seed, derived from the dataset's seed and the
+run number, so a seeded dataset grows reproducibly: the same sequence of
+top-ups gives the same rows. The dataset must have been generated with
+--seed (which records the date it was generated as of), or --from must say
+where the new days start.
+"""
+
+import argparse
+import hashlib
+import sys
+from datetime import datetime, timedelta
+
+from complete_seed_generator import write_units
+from seed_data_generator import STAFF_ROLES, staff_row, with_logins
+from seedgen import auth, geo, instrument, rng, schema, vectorized
+from seedgen.formats import FORMATS, open_output
+from seedgen.manifest import open_manifest
+from seedgen.parallel import DEFAULT_SHARD_UNITS, merge_shards, run_shards, shard_path, unit_shards
+from seedgen.rng import gen_uuid, seed_entity
+from seedgen.tables import AUTH_TABLES, COLUMNS, TABLES, UNIT_ROWS
+from seedgen.vectorized import BACKENDS
+from seedgen.workload import DEFAULT_HORIZON, WORKLOADS, Workload, format_horizon, parse_horizon
+from seedgen.writer import COMPRESSIONS
+
+DEFAULT_MANIFEST = 'SEED_DATA_MANIFEST.ids'
+DEFAULT_OUTPUT = {'csv': 'supabase/seed_topup_csv'}
+DEFAULT_SQL_OUTPUT = 'supabase/seed_topup.sql'
+TOPUP_STAFF = 'topup_staff'  # manifest list of the staff --staff added
+
+DAY_TABLES = ['shifts', 'bookings', 'timesheets']
+
+
+def topup_seed(seed, run):
+    """The seed for top-up run `run` of a dataset seeded with `seed` (None stays None)."""
+    if seed is None:
+        return None
+    return int.from_bytes(hashlib.sha256(f'{seed}/topup/{run}'.encode()).digest()[:8], 'big')
+
+
+def day_units(scale, days, horizon):
+    """Top-up units for `days` more days at the density of `scale` units over the horizon."""
+    return max(1, round(scale * days / (horizon[0] + horizon[1] + 1)))
+
+
+def generate_units_shard(job):
+    """Process-pool worker: write one shard of top-up units; return the row counts."""
+    totals = {table: 0 for table in TABLES}
+    out = open_output(job['format'], job['path'], append=job['append'], compression=job['compress'], spool=True,
+                      batch_size=job['batch_size'], transactions=job['transactions'])
+    with open_manifest(job['manifest']) as ids:
+        write_units(out, ids, job['start'], job['stop'], job['stop'], totals, job['backend'], job['tables'],
+                    workload=job['workload'])
+    out.close()
+    return totals
+
+
+def write_unit_phase(args, tables, start, stop, workload, totals):
+    """Write `tables` for top-up units [start, stop) to the output, sharded across the workers like the generators."""
+    shards = [(start + a, start + b) for a, b in unit_shards(stop - start, args.shard_units)]
+    direct = args.workers == 1 or len(shards) == 1
+    jobs = [{'format': args.format, 'path': args.output if direct else shard_path(args.format, args.output, n),
+             'append': direct, 'compress': args.compress, 'batch_size': args.batch_size,
+             'transactions': args.transactions, 'manifest': args.manifest, 'backend': args.backend,
+             'workload': workload, 'tables': tables, 'start': shard_start, 'stop': shard_stop}
+            for n, (shard_start, shard_stop) in enumerate(shards)]
+    for shard_totals in run_shards(generate_units_shard, jobs, args.workers):
+        for table, count in shard_totals.items():
+            totals[table] += count
+    if not direct:
+        merge_shards(args.format, args.output, [job['path'] for job in jobs])
+        print(f"Merged {len(jobs)} shards from {args.workers} workers")
+
+
+def topup_staff_rows(agencies, first, count):
+    """(agency index, staff row) for top-up staff members [first, first + count), round-robin over `agencies`."""
+    for n in range(first, first + count):
+        agency_index, slot = n % len(agencies), n // len(agencies)
+        seed_entity('staff', n)
+        yield agency_index, staff_row(gen_uuid(), agencies[agency_index], slot, STAFF_ROLES[slot % len(STAFF_ROLES)])
+
+
+def write_staff(out, agencies, first, count, password_hash, totals, geography='newcastle'):
+    """Write `count` top-up staff (and their logins with a `password_hash`); return their IDs."""
+    drawn = list(topup_staff_rows(agencies, first, count))
+    staff = list(geo.place_staff([row for _, row in drawn], COLUMNS['staff'], geography))
+    sections = []
+    if password_hash is not None:
+        at = COLUMNS['staff'].index('email')
+        emails = [auth.topup_staff_email(row[at], agency_index, first + k) for k, (agency_index, row) in enumerate(drawn)]
+        logins, profiles, staff = with_logins([], staff, emails=emails)
+        sections += [('auth.users', f"-- AUTH USERS ({count} staff logins)", auth.user_rows(logins, password_hash)),
+                     ('auth.identities', f"-- AUTH IDENTITIES ({count} email logins)", auth.identity_rows(logins)),
+                     ('profiles', f"-- PROFILES ({count} staff users)", profiles)]
+    sections.append(('staff', f"-- STAFF ({count} more, round-robin over {len(agencies)} agencies)", staff))
+    for table, header, rows in sections:
+        totals[table] += out.section(header, table, rows)
+    return [row[0] for row in staff]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Add shifts, invoices or staff to an existing seeded dataset')
+    parser.add_argument('--days', type=int, default=0, help='Add shifts, bookings and timesheets for the next N days')
+    parser.add_argument('--invoices', action='store_true', help='--days: also invoice the clients for those days')
+    parser.add_argument('--staff', type=int, default=0, help='Add N staff across the existing agencies')
+    parser.add_argument('--from', dest='start', type=datetime.fromisoformat,
+                        help="First new day (default: the day after the last covered one; needed if the dataset wasn't seeded)")
+    parser.add_argument('--format', choices=FORMATS, default='insert', help='Output format (default: insert)')
+    parser.add_argument('--output', help=f'SQL output file (.gz/.zst compress), or directory for csv '
+                                         f'(default: {DEFAULT_SQL_OUTPUT}, {DEFAULT_OUTPUT["csv"]})')
+    parser.add_argument('--batch-size', type=int, default=1, help='insert format: rows per INSERT statement (default: 1)')
+    parser.add_argument('--transactions', action='store_true', help='insert format: wrap each INSERT batch in BEGIN/COMMIT')
+    parser.add_argument('--compress', choices=('auto',) + COMPRESSIONS, default='auto', help='Output compression (default: from extension)')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST,
+                        help=f'ID manifest of the dataset to grow: binary store directory, or a .json file (default: {DEFAULT_MANIFEST})')
+    parser.add_argument('--workers', type=int, default=1, help='Generate top-up units across N processes (default: 1)')
+    parser.add_argument('--shard-units', type=int, help=f"Top-up units per shard (default: the manifest's, else {DEFAULT_SHARD_UNITS})")
+    parser.add_argument('--backend', choices=BACKENDS, help="python, or numpy to draw whole columns at once (default: the manifest's)")
+    parser.add_argument('--workload', choices=WORKLOADS, help="How the new shifts spread (default: the manifest's, else uniform)")
+    parser.add_argument('--auth-users', action='store_true',
+                        help="--staff: also add logins (default: if the dataset has them)")
+    parser.add_argument('--password', default=auth.DEFAULT_PASSWORD,
+                        help=f'Logins: the password they get (default: {auth.DEFAULT_PASSWORD}; others need bcrypt)')
+    schema.add_arguments(parser)
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+    if args.days < 0 or args.staff < 0:
+        parser.error('--days and --staff must be >= 0')
+    if not (args.days or args.staff):
+        parser.error('nothing to add: give --days and/or --staff')
+    if args.invoices and not args.days:
+        parser.error('--invoices bills the days added, so it needs --days')
+    if args.batch_size < 1:
+        parser.error('--batch-size must be >= 1')
+    if args.workers < 1:
+        parser.error('--workers must be >= 1')
+
+    with open_manifest(args.manifest) as manifest:
+        meta = dict(manifest.meta)
+        agencies = list(manifest['agencies'])
+        try:
+            first_staff = len(manifest[TOPUP_STAFF])
+        except KeyError:
+            first_staff = 0
+    if not agencies:
+        parser.error(f'{args.manifest} has no agencies - generate the dataset first')
+    scale = meta.get('scale') or len(agencies) // 2
+    horizon = parse_horizon(meta.get('horizon', format_horizon(DEFAULT_HORIZON)))
+    args.shard_units = args.shard_units or meta.get('shard_units') or DEFAULT_SHARD_UNITS
+    args.backend = args.backend or meta.get('backend') or 'python'
+    args.workload = args.workload or meta.get('workload') or 'uniform'
+    args.auth_users = args.auth_users or meta.get('auth_users', False)
+    args.output = args.output or DEFAULT_OUTPUT.get(args.format, DEFAULT_SQL_OUTPUT)
+    if args.shard_units < 1:
+        parser.error('--shard-units must be >= 1')
+    if args.backend == 'numpy' and not vectorized.available():
+        parser.error("--backend numpy needs the 'numpy' package: pip install numpy")
+    if args.auth_users and args.password != auth.DEFAULT_PASSWORD and not auth.available():
+        parser.error("--password needs the 'bcrypt' package: pip install bcrypt")
+
+    # Where the new days start: the day after the last covered one
+    start = args.start
+    if start is None and meta.get('shifts_until'):
+        start = datetime.fromisoformat(meta['shifts_until']) + timedelta(days=1)
+    if start is None and meta.get('as_of'):
+        start = datetime.fromisoformat(meta['as_of']).replace(hour=0, minute=0, second=0, microsecond=0) + \
+            timedelta(days=horizon[1] + 1)
+    if args.days and start is None:
+        parser.error(f"{args.manifest} doesn't say when the dataset was generated (no --seed); give --from")
+
+    run = meta.get('topup_runs', 0) + 1
+    seed = topup_seed(meta.get('seed'), run)
+    first_unit = meta.get('next_unit', scale)
+    units = day_units(scale, args.days, horizon) if args.days else 0
+    geography = meta.get('geography', 'newcastle')
+    write = [table for table in TABLES if (args.auth_users and args.staff) or table not in AUTH_TABLES]
+    try:
+        schema.check(args, write)
+    except schema.SchemaError as error:
+        sys.exit(f"\n[FAIL] {error}")
+    expected = args.staff * (4 if args.auth_users else 1) + units * sum(UNIT_ROWS[table] for table in DAY_TABLES)
+    instrument.start(args, expected + (units * UNIT_ROWS['invoices'] if args.invoices else 0))
+    password_hash = auth.password_hash(args.password) if args.auth_users and args.staff else None
+
+    rng.configure(seed, start)
+    out = open_output(args.format, args.output, compression=args.compress, batch_size=args.batch_size,
+                      transactions=args.transactions)
+    out.line(f"-- SEED DATA TOP-UP #{run} for {args.manifest}")
+    if args.days:
+        end = start + timedelta(days=args.days - 1)
+        out.line(f"-- +{args.days} days of shifts ({start.date()} to {end.date()}): {units} units"
+                 + (", with their invoices" if args.invoices else ''))
+    if args.staff:
+        out.line(f"-- +{args.staff} staff across {len(agencies)} agencies")
+    if seed is not None:
+        out.line(f"-- Seed: {meta['seed']} (top-up run {run})")
+    if password_hash is not None:
+        for header_line in auth.header_lines(args.password):
+            out.line(header_line)
+    out.line("-- Load it on top of the dataset it was made for; its rows point at the rows already there")
+    out.line("-- Run this in Supabase SQL Editor\n" if args.format == 'insert' else "-- Run this with psql -f\n")
+
+    totals = {table: 0 for table in TABLES}
+    staff_ids = []
+    if args.staff:
+        staff_ids = write_staff(out, agencies, first_staff, args.staff, password_hash, totals, geography)
+    out.close()
+
+    if args.days:
+        stop = first_unit + units
+        write_unit_phase(args, DAY_TABLES, first_unit, stop, Workload(args.workload, (0, args.days - 1), geography), totals)
+        if args.invoices:
+            rng.configure(seed, start + timedelta(days=args.days))
+            write_unit_phase(args, ['invoices'], first_unit, stop, Workload(), totals)
+        # Later top-ups carry on from here
+        meta.update(shifts_until=end.date().isoformat(), next_unit=stop)
+
+    with open_manifest(args.manifest, 'a') as manifest:
+        if staff_ids:
+            manifest[TOPUP_STAFF].extend(staff_ids)
+        manifest.meta.update(meta, topup_runs=run)
+
+    instrument.finish()
+    print(f"\n[OK] Seed data top-up #{run}:")
+    for table in write:
+        if totals[table]:
+            print(f"  - {table.replace('_', ' ').title()}: {totals[table]}")
+    print(f"\nTotal: {sum(totals.values())} records")
+    if args.days:
+        print(f"Shifts now run to {end.date()}")
+    print(f"\n[OK] Saved to: {args.output}")
+    print(f"[OK] Updated: {args.manifest}")
+
+
+if __name__ == '__main__':
+    main()
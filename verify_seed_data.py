@@ -0,0 +1,91 @@
+"""
+Verify a generated seed dataset before it is loaded (or gated on in CI)
+Streams the SQL (insert or copy format, plain, .gz or .zst) or csv
+directory once and checks referential integrity and the financial sums
+
+Usage:
+    python verify_seed_data.py                                        # supabase/seed_data.sql
+    python verify_seed_data.py --input supabase/seed_data.sql.zst
+    python verify_seed_data.py --input supabase/seed_csv              # a --format csv directory
+    python verify_seed_data.py --input supabase/seed_data.sql --input supabase/seed_topup.sql  # with a top-up
+    python verify_seed_data.py --skip invoice_totals,payslip_totals   # gate on the rest
+    python verify_seed_data.py --list                                 # what each check checks
+
+The inputs are read in the order given, as one dataset, so a top-up delta
+is checked against the dataset it was made for. Memory grows with the
+number of ids, not rows (seedgen.verify). Exits 1 if any check fails, 0 if
+all pass (references to a table with no rows in the input at all are
+reported but don't fail).
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+from seedgen.sqlsplit import open_sql, split_statements
+from seedgen.verify import CHECKS, MAX_EXAMPLES, Verifier, VerifyError, csv_blocks, sql_blocks
+
+DEFAULT_INPUT = 'supabase/seed_data.sql'
+
+
+def blocks(path, unverified):
+    if os.path.isdir(path):
+        yield from csv_blocks(path)
+        return
+    with open_sql(path) as f:
+        yield from sql_blocks(split_statements(f), unverified)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check a generated seed dataset for dangling references and inconsistent sums')
+    parser.add_argument('--input', action='append',
+                        help=f'Seed SQL file (plain, .gz or .zst) or csv directory; repeat to read several as one dataset '
+                             f'(default: {DEFAULT_INPUT})')
+    parser.add_argument('--skip', default='', help='Comma-separated checks to leave out (see --list)')
+    parser.add_argument('--max-examples', type=int, default=MAX_EXAMPLES,
+                        help=f'Failing rows to show per check (default: {MAX_EXAMPLES})')
+    parser.add_argument('--list', action='store_true', help='List the checks and exit')
+    args = parser.parse_args()
+    if args.list:
+        for check, description in CHECKS.items():
+            print(f"{check:18} {description}")
+        return
+    if args.max_examples < 0:
+        parser.error('--max-examples must be >= 0')
+    args.input = args.input or [DEFAULT_INPUT]
+    for path in args.input:
+        if not os.path.exists(path):
+            parser.error(f'--input: no such file or directory: {path}')
+    try:
+        verifier = Verifier(skip=[check.strip() for check in args.skip.split(',') if check.strip()],
+                            max_examples=args.max_examples)
+    except ValueError as error:
+        parser.error(f'--skip: {error}')
+
+    unverified = Counter()
+    started = time.perf_counter()
+    for path in args.input:
+        print(f"Reading {path}...")
+        try:
+            verifier.feed(blocks(path, unverified))
+        except VerifyError as error:
+            sys.exit(f"\n[FAIL] {path}: {error}")
+    report = verifier.finish()
+    seconds = time.perf_counter() - started
+
+    rows = sum(report.rows.values())
+    print(f"\nRead {rows} rows from {len(report.rows)} tables in {seconds:.2f}s ({rows / seconds if seconds else 0:,.0f} rows/sec)\n")
+    for kind, count in unverified.items():
+        print(f"[WARN] {count} {kind} statement(s) not verified: only INSERT and COPY rows are")
+    for line in report.lines():
+        print(line)
+    if not report.ok:
+        sys.stdout.flush()  # keep the summary after the report when both go to one CI log
+        sys.exit(f"\n[FAIL] {sum(report.failures.values())} failure(s) in {len(report.failures)} check(s)")
+    print("\n[OK] Seed data is consistent")
+
+
+if __name__ == '__main__':
+    main()